@@ -492,6 +492,55 @@ class WorkbenchConfig:
             "use_workbench_permissions": False,
             "show_shutdown_script_output": False,
             "show_bootstrap_script_output": False,
+            "media_upload_scheduling": False,
+            "media_upload_lanes": 4,
+            "media_upload_size_buckets": [10485760, 1073741824],
+            "media_upload_estimated_bytes_per_second": 20971520,
+            "media_upload_batch_size": 100,
+            "media_upload_batch_bytes": 10737418240,
+            "paged_content_page_threads": 1,
+            "export_threads": 1,
+            "export_reorder_buffer_factor": 4,
+            "view_items_per_page": None,
+            "view_prefetch_pages": 2,
+            "term_cache_size": 10000,
+            "term_cache_prefetch_vocabularies": [],
+            "export_file_download_threads": 1,
+            "export_file_skip_existing": True,
+            "export_file_skip_existing_algorithm": None,
+            "export_output_format": "csv",
+            "export_parquet_row_group_size": 10000,
+            "metrics_file_path": None,
+            "metrics_slow_row_threshold": None,
+            "adaptive_concurrency": False,
+            "adaptive_concurrency_min": 1,
+            "adaptive_concurrency_max": 16,
+            "adaptive_concurrency_latency_factor": 3,
+            "rate_limit_reads_per_second": None,
+            "rate_limit_writes_per_second": None,
+            "rate_limit_burst": 1,
+            "rate_limit_db_path": None,
+            "preprocessor_mode": "per_value",
+            "preprocessor_batch_size": 100,
+            "preprocessor_processes": 1,
+            "entity_post_task_scripts_async": False,
+            "entity_post_task_script_workers": 2,
+            "entity_post_task_script_queue_size": 1000,
+            "entity_post_task_script_batch_size": 1,
+            "warm_url_alias_cache": False,
+            "url_alias_cache_warm_up_threads": 4,
+            "csv_row_index": False,
+            "create_terms_threads": 1,
+            "bulk_create_terms": False,
+            "bulk_create_terms_threads": 4,
+            "lookup_cache_db_path": None,
+            "lookup_cache_ttl_term_names": 86400,
+            "lookup_cache_ttl_term_uris": 604800,
+            "lookup_cache_ttl_url_aliases": 3600,
+            "http_cache_eviction_interval": 60,
+            "http_cache_eviction_requests": 1000,
+            "http_cache_max_entries": 10000,
+            "http_cache_max_bytes": 104857600,
         }
 
     # Tests validity and existence of configuration file path.
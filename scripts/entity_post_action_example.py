@@ -16,13 +16,25 @@ logging.basicConfig(
 )
 
 workbench_config_file_path = sys.argv[1]
-http_response_code = sys.argv[2]
-http_response_body = sys.argv[3]
-entity = json.loads(http_response_body)
 
-if http_response_code == "201":
-    # Execute code if entity was successfully created.
-    print("Success")
+
+def process_entity(http_response_code, http_response_body):
+    entity = json.loads(http_response_body)
+
+    if http_response_code == "201":
+        # Execute code if entity was successfully created.
+        print("Success")
+    else:
+        # Execute code if entity was not successfully created.
+        print("Failure")
+
+
+# With "entity_post_task_scripts_async: true" and an "entity_post_task_script_batch_size"
+# greater than 1, Workbench passes "--jsonl" instead of a single entity and writes one JSON
+# object per entity to stdin.
+if sys.argv[2] == "--jsonl":
+    for line in sys.stdin:
+        entity_data = json.loads(line)
+        process_entity(entity_data["http_response_code"], entity_data["entity"])
 else:
-    # Execute code if entity was not successfully created.
-    print("Failure")
+    process_entity(sys.argv[2], sys.argv[3])
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+"""Sample field preprocessor script for "preprocessor_mode: persistent". Does the same thing
+as samplepreprocessor.py (converts values to upper case), but Workbench starts it once per
+task and sends it values as JSON lines on stdin, instead of starting it once per value.
+
+Workbench runs the script with the arguments "subdelimiter --jsonl config_file_path". Each line
+of input is a JSON object with "id" and "value" keys; for each one, the script must print a
+JSON object with the same "id" and the preprocessed "value" (or an "error" key if it could not
+preprocess the value), and flush stdout.
+"""
+
+import sys
+import json
+
+subdelimiter = sys.argv[1].strip()
+
+for line in sys.stdin:
+    request = json.loads(line)
+    try:
+        subvalues = request["value"].strip().split(subdelimiter)
+        response = {
+            "id": request["id"],
+            "value": subdelimiter.join(subvalue.upper() for subvalue in subvalues),
+        }
+    except Exception as e:
+        response = {"id": request["id"], "error": str(e)}
+    print(json.dumps(response), flush=True)
@@ -0,0 +1,16 @@
+"""Sample field preprocessor plugin. Does the same thing as samplepreprocessor.py (converts
+values to upper case), but runs inside Workbench's process (or in a pool of processes if
+"preprocessor_processes" is greater than 1) instead of being started once per value.
+
+Register it in your configuration file with the "python:" prefix:
+
+preprocessors:
+ - field_description: python:/path/to/scripts/samplepreprocessor_plugin.py
+"""
+
+
+def preprocess(value, subdelimiter, config_file_path):
+    """Return the preprocessed version of value. Raise an exception if the value can't be
+    preprocessed; Workbench logs the exception and uses the original value."""
+    subvalues = value.strip().split(subdelimiter)
+    return subdelimiter.join(subvalue.upper() for subvalue in subvalues)
@@ -22,6 +22,7 @@ setup(
         "typing-extensions>=4.14.0",
         "rich",
     ],
+    extras_require={"parquet": ["pyarrow"]},
     python_requires=">=3.9",
     py_modules=[],
 )
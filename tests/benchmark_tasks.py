@@ -0,0 +1,246 @@
+"""Throughput benchmarks for Workbench tasks, run against the mock Drupal in mock_drupal_server.py.
+
+For each requested row count, this script starts a fresh mock Drupal, generates input data, and runs
+each task with the workbench script in a subprocess, in this order: create, update, add_media,
+export_csv, create_terms, delete. For each task it reports rows per second, HTTP requests per row,
+and the median and 95th percentile latency of the requests as measured by the server.
+
+Usage:
+
+    python tests/benchmark_tasks.py --rows 1000 10000 100000
+    python tests/benchmark_tasks.py --rows 1000 --tasks create export_csv --latency 0.02 --output results.json
+    python tests/benchmark_tasks.py --rows 1000 --setting export_threads=8 --setting progress_bar=false
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from ruamel.yaml import YAML
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from mock_drupal_server import MockDrupalServer
+
+all_tasks = ["create", "update", "add_media", "export_csv", "create_terms", "delete"]
+workbench_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "workbench"
+)
+
+
+def write_input_data(input_dir, task, num_rows, num_files=10):
+    """Write the input CSV for a task and return its filename. Node IDs are 1..num_rows since
+    the create task runs first against an empty mock Drupal."""
+    if task in ["create", "add_media"]:
+        for i in range(num_files):
+            with open(os.path.join(input_dir, f"file{i}.jpg"), "wb") as f:
+                f.write(os.urandom(1024 * (i + 1)))
+
+    rows = []
+    if task == "create":
+        fieldnames = [
+            "id",
+            "file",
+            "title",
+            "field_model",
+            "field_description",
+            "field_subject",
+            "field_identifier",
+            "field_edtf_date_created",
+        ]
+        for i in range(1, num_rows + 1):
+            rows.append(
+                {
+                    "id": str(i),
+                    "file": f"file{i % num_files}.jpg",
+                    "title": f"Benchmark node {i}",
+                    "field_model": "Image",
+                    "field_description": f"Description of node {i}.",
+                    "field_subject": f"subject:Subject {i % 100}|subject:Subject {(i + 1) % 100}",
+                    "field_identifier": f"bench-{i}|alt-{i}",
+                    "field_edtf_date_created": f"{1900 + i % 100}-01-01",
+                }
+            )
+    elif task == "update":
+        fieldnames = ["node_id", "field_description"]
+        rows = [
+            {"node_id": str(i), "field_description": f"Updated description {i}."}
+            for i in range(1, num_rows + 1)
+        ]
+    elif task == "add_media":
+        fieldnames = ["node_id", "file"]
+        rows = [
+            {"node_id": str(i), "file": f"file{i % num_files}.jpg"}
+            for i in range(1, num_rows + 1)
+        ]
+    elif task in ["export_csv", "delete"]:
+        fieldnames = ["node_id"]
+        rows = [{"node_id": str(i)} for i in range(1, num_rows + 1)]
+    elif task == "create_terms":
+        fieldnames = ["term_name"]
+        rows = [{"term_name": f"Benchmark term {i}"} for i in range(1, num_rows + 1)]
+
+    input_csv = f"{task}.csv"
+    with open(os.path.join(input_dir, input_csv), "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return input_csv
+
+
+def write_config(work_dir, server, task, input_csv, settings):
+    config = {
+        "task": task,
+        "host": server.url,
+        "username": "admin",
+        "password": "password",
+        "input_dir": os.path.join(work_dir, "input"),
+        "input_csv": input_csv,
+        "media_type": "image",
+        "vocab_id": "subject",
+        "allow_adding_terms": True,
+        "secure_ssl_only": False,
+        "log_file_path": os.path.join(work_dir, f"{task}.log"),
+        "temp_dir": os.path.join(work_dir, "tmp"),
+        "csv_id_to_node_id_map_path": os.path.join(
+            work_dir, "csv_id_to_node_id_map.db"
+        ),
+        "export_csv_file_path": os.path.join(work_dir, "export.csv"),
+        "rollback_dir": work_dir,
+        "rollback_config_file_path": os.path.join(work_dir, "rollback.yml"),
+    }
+    config.update(settings)
+    config_path = os.path.join(work_dir, f"{task}.yml")
+    with open(config_path, "w") as config_file:
+        YAML().dump(config, config_file)
+    return config_path
+
+
+def run_task(work_dir, server, task, num_rows, settings):
+    """Run a task and return its results, computed from the requests the mock Drupal received."""
+    input_csv = write_input_data(os.path.join(work_dir, "input"), task, num_rows)
+    config_path = write_config(work_dir, server, task, input_csv, settings)
+
+    with server.drupal.lock:
+        server.drupal.request_log.clear()
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, workbench_path, "--config", config_path],
+        cwd=os.path.dirname(workbench_path),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+    )
+    elapsed = time.perf_counter() - start
+
+    with server.drupal.lock:
+        request_log = list(server.drupal.request_log)
+    durations = sorted(duration for method, template, status, duration in request_log)
+    return {
+        "task": task,
+        "rows": num_rows,
+        "exit_code": result.returncode,
+        "seconds": elapsed,
+        "rows_per_second": num_rows / elapsed,
+        "requests": len(request_log),
+        "requests_per_row": len(request_log) / num_rows,
+        "errors": len([entry for entry in request_log if entry[2] >= 400]),
+        "p50_latency": durations[int(0.50 * (len(durations) - 1))] if durations else 0,
+        "p95_latency": durations[int(0.95 * (len(durations) - 1))] if durations else 0,
+        "output": result.stdout.decode("utf-8", errors="replace")[-2000:],
+    }
+
+
+def run_benchmarks(
+    row_counts,
+    tasks,
+    settings,
+    latency=0.0,
+    latency_jitter=0.0,
+    error_rate=0.0,
+    keep=False,
+):
+    results = []
+    for num_rows in row_counts:
+        work_dir = tempfile.mkdtemp(prefix=f"workbench_benchmark_{num_rows}_")
+        os.makedirs(os.path.join(work_dir, "input"))
+        server = MockDrupalServer(
+            latency=latency, latency_jitter=latency_jitter, error_rate=error_rate
+        ).start()
+        try:
+            for task in [task for task in all_tasks if task in tasks]:
+                result = run_task(work_dir, server, task, num_rows, settings)
+                results.append(result)
+                print_result(result)
+        finally:
+            server.stop()
+            if not keep:
+                shutil.rmtree(work_dir)
+    return results
+
+
+def print_result(result):
+    status = (
+        "" if result["exit_code"] == 0 else f"  (exited with {result['exit_code']})"
+    )
+    print(
+        f"{result['task']:<14}{result['rows']:>8} rows  {result['rows_per_second']:>9.1f} rows/s  "
+        f"{result['requests_per_row']:>6.2f} requests/row  p50 {result['p50_latency'] * 1000:>7.2f} ms  "
+        f"p95 {result['p95_latency'] * 1000:>7.2f} ms{status}"
+    )
+
+
+def parse_setting(setting):
+    """Parse a "name=value" command-line setting, with the value parsed as YAML (so "8" is an int)."""
+    name, value = setting.split("=", 1)
+    return name, YAML(typ="safe").load(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--tasks", nargs="+", default=all_tasks, choices=all_tasks)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Mean seconds added to each response.",
+    )
+    parser.add_argument("--latency_jitter", type=float, default=0.0)
+    parser.add_argument(
+        "--error_rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests that get a 503 response.",
+    )
+    parser.add_argument(
+        "--setting",
+        action="append",
+        default=[],
+        help='Workbench setting to add to every task\'s config, as "name=value".',
+    )
+    parser.add_argument("--output", help="Path to write the results to as JSON.")
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the generated input data, configs, and logs.",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.rows,
+        args.tasks,
+        dict(parse_setting(setting) for setting in args.setting),
+        args.latency,
+        args.latency_jitter,
+        args.error_rate,
+        args.keep,
+    )
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
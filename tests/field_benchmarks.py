@@ -0,0 +1,286 @@
+"""pytest-benchmark microbenchmarks for the field handlers in workbench_fields.py. Do not require a live Drupal.
+
+Each handler's create(), update() (in "append" and "replace" modes), and serialize() methods are
+benchmarked with synthetic field definitions and CSV values, using single-valued cells and cells
+with a realistic spread of subdelimited values. A "wide row" benchmark runs create() on every
+cell of a 120-column row. Each benchmark also records, in its extra_info, the peak memory and
+number of memory blocks allocated by one call, as measured by tracemalloc.
+
+To save a baseline and compare a later commit against it:
+
+    pytest tests/field_benchmarks.py --benchmark-autosave
+    pytest tests/field_benchmarks.py --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+
+import collections
+import copy
+import os
+import random
+import sys
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import workbench_fields
+import workbench_utils
+
+config = {
+    "task": "create",
+    "host": "https://islandora.dev",
+    "subdelimiter": "|",
+    "id_field": "id",
+    "text_format_id": "basic_html",
+    "field_text_format_ids": {},
+    "columns_with_term_names": [],
+    "update_mode": "append",
+    "export_csv_term_mode": "name",
+    "term_cache_size": 10000,
+}
+
+# Number of subdelimited values in "multi" cells, weighted toward few values like real metadata.
+multi_value_counts = [1, 1, 1, 2, 2, 3, 4, 6, 10, 25]
+
+
+def make_string_value(rng, i):
+    return f"Value {i} " + " ".join(
+        rng.choice(["alpha", "beta", "gamma", "delta"]) for _ in range(5)
+    )
+
+
+def make_string_json(value):
+    return {"value": value}
+
+
+# For each handler: its field definition, a function that generates one CSV subvalue, and a
+# function that converts a subvalue into the JSON Drupal stores for it.
+handlers = {
+    "SimpleField": (
+        workbench_fields.SimpleField,
+        {"field_type": "string", "formatted_text": False, "max_length": 255},
+        make_string_value,
+        make_string_json,
+    ),
+    "TypedRelationField": (
+        workbench_fields.TypedRelationField,
+        {
+            "field_type": "typed_relation",
+            "target_type": "taxonomy_term",
+            "vocabularies": ["person"],
+        },
+        lambda rng, i: f"relators:{rng.choice(['aut', 'cre', 'pht'])}:{rng.randint(1, 500)}",
+        lambda value: {
+            "rel_type": value.rsplit(":", 1)[0],
+            "target_id": int(value.rsplit(":", 1)[1]),
+            "target_type": "taxonomy_term",
+        },
+    ),
+    "LinkField": (
+        workbench_fields.LinkField,
+        {"field_type": "link"},
+        lambda rng, i: f"https://example.com/items/{i}/{rng.randint(1, 10**6)}%%Example link {i}",
+        lambda value: {"uri": value.split("%%")[0], "title": value.split("%%")[1]},
+    ),
+    "GeolocationField": (
+        workbench_fields.GeolocationField,
+        {"field_type": "geolocation"},
+        lambda rng, i: f"{rng.uniform(-90, 90):.5f},{rng.uniform(-180, 180):.5f}",
+        lambda value: {"lat": value.split(",")[0], "lng": value.split(",")[1]},
+    ),
+    "AuthorityLinkField": (
+        workbench_fields.AuthorityLinkField,
+        {
+            "field_type": "authority_link",
+            "authority_sources": ["viaf", "lcsh", "other"],
+        },
+        lambda rng, i: f"{rng.choice(['viaf', 'lcsh'])}%%http://viaf.org/viaf/{rng.randint(1, 10**8)}%%Authority {i}",
+        lambda value: dict(zip(["source", "uri", "title"], value.split("%%"))),
+    ),
+    "EntityReferenceField": (
+        workbench_fields.EntityReferenceField,
+        {
+            "field_type": "entity_reference",
+            "target_type": "taxonomy_term",
+            "vocabularies": ["subject"],
+        },
+        lambda rng, i: str(rng.randint(1, 500)),
+        lambda value: {"target_id": int(value), "target_type": "taxonomy_term"},
+    ),
+    "MediaTrackField": (
+        workbench_fields.MediaTrackField,
+        {
+            "field_type": "media_track",
+            "authority_sources": [
+                "subtitles",
+                "captions",
+                "descriptions",
+                "chapters",
+                "metadata",
+            ],
+        },
+        lambda rng, i: f"Track {i}:{rng.choice(['subtitles', 'captions'])}:en:tracks/track{i}.vtt",
+        lambda value: dict(
+            zip(["label", "kind", "srclang"], value.split(":")[:3]),
+            url="https://example.com/sites/default/files/" + value.split(":")[3],
+        ),
+    ),
+}
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seeded_term_cache():
+    """Seed the term cache so serializing taxonomy references in "name" mode makes no requests."""
+    for tid in range(1, 501):
+        workbench_utils.cache_term_data(
+            config, tid, {"vid": "subject", "name": f"Term {tid}", "uri": None}
+        )
+    yield
+    workbench_utils.term_data_cache.clear()
+
+
+def make_cell(handler_name, distribution, seed=0):
+    """Get a CSV cell for a handler, and the list of its subvalues."""
+    rng = random.Random(f"{handler_name}-{distribution}-{seed}")
+    handler_class, definition, make_value, make_json = handlers[handler_name]
+    num_values = 1 if distribution == "single" else rng.choice(multi_value_counts)
+    values = [make_value(rng, i) for i in range(num_values)]
+    return config["subdelimiter"].join(values), values
+
+
+def make_field_definitions(handler_name, distribution):
+    handler_class, definition, make_value, make_json = handlers[handler_name]
+    definition = dict(definition, cardinality=1 if distribution == "single" else -1)
+    return {"field_foo": definition}
+
+
+def record_allocations(benchmark, function, *args):
+    """Record the memory allocated by one call to function in the benchmark's extra_info."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        function(*args)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    new_blocks = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.count_diff > 0
+    )
+    benchmark.extra_info["peak_bytes"] = peak
+    benchmark.extra_info["allocated_blocks"] = new_blocks
+
+
+def new_entity():
+    return {
+        "type": [{"target_id": "islandora_object", "target_type": "node_type"}],
+        "title": [{"value": "Benchmark node"}],
+        "status": [{"value": 1}],
+    }
+
+
+def new_row(cell):
+    row = collections.OrderedDict()
+    row["id"] = "bench_001"
+    row["node_id"] = "1"
+    row["field_foo"] = cell
+    return row
+
+
+@pytest.mark.parametrize("distribution", ["single", "multi"])
+@pytest.mark.parametrize("handler_name", list(handlers.keys()))
+def test_create(benchmark, handler_name, distribution):
+    field = handlers[handler_name][0]()
+    field_definitions = make_field_definitions(handler_name, distribution)
+    cell, values = make_cell(handler_name, distribution)
+    task_config = dict(config, task="create")
+
+    def setup():
+        # create() may modify the row, so each round gets a fresh one.
+        return (
+            task_config,
+            field_definitions,
+            new_entity(),
+            new_row(cell),
+            "field_foo",
+        ), {}
+
+    record_allocations(benchmark, field.create, *setup()[0])
+    entity = benchmark.pedantic(field.create, setup=setup, rounds=2000)
+    assert "field_foo" in entity
+
+
+@pytest.mark.parametrize("update_mode", ["append", "replace"])
+@pytest.mark.parametrize("distribution", ["single", "multi"])
+@pytest.mark.parametrize("handler_name", list(handlers.keys()))
+def test_update(benchmark, handler_name, distribution, update_mode):
+    handler_class, definition, make_value, make_json = handlers[handler_name]
+    field = handler_class()
+    field_definitions = make_field_definitions(handler_name, distribution)
+    cell, values = make_cell(handler_name, distribution)
+    existing_cell, existing_values = make_cell(handler_name, distribution, seed=1)
+    existing_field_values = [make_json(value) for value in existing_values]
+    task_config = dict(config, task="update", update_mode=update_mode)
+
+    def setup():
+        entity = new_entity()
+        entity["field_foo"] = copy.deepcopy(existing_field_values)
+        return (
+            task_config,
+            field_definitions,
+            entity,
+            new_row(cell),
+            "field_foo",
+            copy.deepcopy(existing_field_values),
+        ), {}
+
+    record_allocations(benchmark, field.update, *setup()[0])
+    entity = benchmark.pedantic(field.update, setup=setup, rounds=2000)
+    assert "field_foo" in entity
+
+
+@pytest.mark.parametrize("distribution", ["single", "multi"])
+@pytest.mark.parametrize("handler_name", list(handlers.keys()))
+def test_serialize(benchmark, handler_name, distribution):
+    handler_class, definition, make_value, make_json = handlers[handler_name]
+    field = handler_class()
+    field_definitions = make_field_definitions(handler_name, distribution)
+    cell, values = make_cell(handler_name, distribution)
+    field_data = [make_json(value) for value in values]
+    args = (config, field_definitions, "field_foo", field_data)
+
+    record_allocations(benchmark, field.serialize, *args)
+    benchmark(field.serialize, *args)
+
+
+def test_create_wide_row(benchmark):
+    """create() on every cell of a 120-column row with multivalued cells, as in a large ingest CSV."""
+    field_definitions = dict()
+    row = collections.OrderedDict(id="bench_001")
+    fields = dict()
+    handler_names = list(handlers.keys())
+    for column in range(120):
+        handler_name = handler_names[column % len(handler_names)]
+        field_name = f"field_{column:03d}"
+        field_definitions[field_name] = make_field_definitions(handler_name, "multi")[
+            "field_foo"
+        ]
+        row[field_name], values = make_cell(handler_name, "multi", seed=column)
+        fields[field_name] = handlers[handler_name][0]()
+
+    def create_row(row):
+        entity = new_entity()
+        for field_name, field in fields.items():
+            entity = field.create(config, field_definitions, entity, row, field_name)
+        return entity
+
+    def setup():
+        return (collections.OrderedDict(row),), {}
+
+    record_allocations(benchmark, create_row, *setup()[0])
+    entity = benchmark.pedantic(create_row, setup=setup, rounds=200)
+    assert len(entity) == 123
@@ -0,0 +1,795 @@
+"""A local stand-in for the Drupal/Islandora REST endpoints that Workbench uses, for
+running Workbench end to end (e.g. in benchmarks) without a live Islandora.
+
+Entities are kept in memory. The server can add latency to every response and
+return errors for a fraction of requests, and it records the method, endpoint
+template, status, and duration of every request so that callers can get
+per-endpoint statistics from /_mock/stats.
+
+Usage:
+
+    python tests/mock_drupal_server.py --port 8000 --latency 0.02 --error_rate 0.01
+
+or, in Python:
+
+    server = MockDrupalServer(latency=0.02)
+    server.start()
+    # Use server.url as the "host" setting in a Workbench config file.
+    server.stop()
+"""
+
+import argparse
+import hashlib
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+
+# Node fields on the islandora_object content type, as (field type, cardinality, target type, vocabularies).
+node_fields = {
+    "field_model": ("entity_reference", 1, "taxonomy_term", ["islandora_models"]),
+    "field_member_of": ("entity_reference", -1, "node", []),
+    "field_description": ("string_long", 1, None, []),
+    "field_identifier": ("string", -1, None, []),
+    "field_subject": ("entity_reference", -1, "taxonomy_term", ["subject"]),
+    "field_linked_agent": ("typed_relation", -1, "taxonomy_term", ["person"]),
+    "field_edtf_date_created": ("edtf", -1, None, []),
+    "field_weight": ("integer", 1, None, []),
+}
+
+media_fields = {
+    "image": {
+        "field_media_image": ("image", 1, "file", []),
+        "field_media_of": ("entity_reference", 1, "node", []),
+        "field_media_use": (
+            "entity_reference",
+            -1,
+            "taxonomy_term",
+            ["islandora_media_use"],
+        ),
+    },
+    "file": {
+        "field_media_file": ("file", 1, "file", []),
+        "field_media_of": ("entity_reference", 1, "node", []),
+        "field_media_use": (
+            "entity_reference",
+            -1,
+            "taxonomy_term",
+            ["islandora_media_use"],
+        ),
+    },
+    "document": {
+        "field_media_document": ("file", 1, "file", []),
+        "field_media_of": ("entity_reference", 1, "node", []),
+        "field_media_use": (
+            "entity_reference",
+            -1,
+            "taxonomy_term",
+            ["islandora_media_use"],
+        ),
+    },
+}
+
+term_fields = {
+    "field_external_uri": ("link", 1, None, []),
+}
+
+# Terms that exist before any task runs, as (vocabulary ID, name, URI).
+default_terms = [
+    ("islandora_models", "Image", "http://purl.org/coar/resource_type/c_c513"),
+    ("islandora_models", "Binary", "http://purl.org/coar/resource_type/c_1843"),
+    ("islandora_models", "Paged Content", "https://schema.org/Book"),
+    ("islandora_models", "Page", "http://id.loc.gov/ontologies/bibframe/part"),
+    ("islandora_models", "Collection", "http://purl.org/dc/dcmitype/Collection"),
+    ("islandora_media_use", "Original File", "http://pcdm.org/use#OriginalFile"),
+    ("islandora_media_use", "Service File", "http://pcdm.org/use#ServiceFile"),
+    ("islandora_media_use", "Thumbnail Image", "http://pcdm.org/use#ThumbnailImage"),
+    ("islandora_media_use", "Extracted Text", "http://pcdm.org/use#ExtractedText"),
+    ("islandora_media_use", "Transcript", "http://pcdm.org/use#Transcript"),
+]
+
+vocabularies = ["islandora_models", "islandora_media_use", "subject", "person", "genre"]
+
+
+class MockDrupal:
+    """In-memory entity storage shared by all request handler threads."""
+
+    def __init__(
+        self, latency=0.0, latency_jitter=0.0, error_rate=0.0, error_status=503
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.ids = {"node": 0, "media": 0, "file": 0, "taxonomy_term": 0}
+            self.nodes = dict()
+            self.media = dict()
+            self.files = dict()
+            self.file_contents = dict()
+            self.files_by_uuid = dict()
+            self.files_by_name = dict()
+            self.terms = dict()
+            self.request_log = []
+        for vocab_id, name, uri in default_terms:
+            self.add_term(vocab_id, name, uri)
+
+    def next_id(self, entity_type):
+        with self.lock:
+            self.ids[entity_type] += 1
+            return self.ids[entity_type]
+
+    def add_term(self, vocab_id, name, uri=None, parent=None):
+        tid = self.next_id("taxonomy_term")
+        term = {
+            "tid": [{"value": tid}],
+            "uuid": [{"value": str(uuid.uuid4())}],
+            "vid": [{"target_id": vocab_id, "target_type": "taxonomy_vocabulary"}],
+            "name": [{"value": name}],
+            "parent": [{"target_id": parent}],
+        }
+        if uri is not None:
+            term["field_external_uri"] = [{"uri": uri, "title": None, "options": []}]
+        self.terms[tid] = term
+        return term
+
+    def log_request(self, method, template, status, duration):
+        with self.lock:
+            self.request_log.append((method, template, status, duration))
+
+    def get_stats(self):
+        """Get the number of requests and their latency percentiles, by method and endpoint template."""
+        with self.lock:
+            request_log = list(self.request_log)
+        endpoints = dict()
+        for method, template, status, duration in request_log:
+            endpoints.setdefault(f"{method} {template}", []).append((status, duration))
+        stats = {"requests": len(request_log), "endpoints": dict()}
+        for endpoint, requests in endpoints.items():
+            durations = sorted(duration for status, duration in requests)
+            stats["endpoints"][endpoint] = {
+                "count": len(requests),
+                "errors": len(
+                    [status for status, duration in requests if status >= 400]
+                ),
+                "p50": durations[int(0.50 * (len(durations) - 1))],
+                "p95": durations[int(0.95 * (len(durations) - 1))],
+            }
+        return stats
+
+
+class MockDrupalRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Routes requests to the handle_* methods below. Each route is a (method, pattern, handler
+    name, endpoint template) tuple; the template is what requests are grouped by in /_mock/stats.
+    """
+
+    protocol_version = "HTTP/1.1"
+    routes = [
+        (
+            "GET",
+            r"/islandora_workbench_integration/version",
+            "get_version",
+            "/islandora_workbench_integration/version",
+        ),
+        (
+            "GET",
+            r"/islandora_workbench_integration/core_version",
+            "get_core_version",
+            "/islandora_workbench_integration/core_version",
+        ),
+        (
+            "GET",
+            r"/islandora_workbench_integration/file_hash",
+            "get_file_hash",
+            "/islandora_workbench_integration/file_hash",
+        ),
+        (
+            "GET",
+            r"/entity/entity_form_display/(\w+)\.(\w+)\.default",
+            "get_form_display",
+            "/entity/entity_form_display/{id}",
+        ),
+        (
+            "GET",
+            r"/entity/field_config/(\w+)\.(\w+)\.(\w+)",
+            "get_field_config",
+            "/entity/field_config/{id}",
+        ),
+        (
+            "GET",
+            r"/entity/field_storage_config/(\w+)\.(\w+)",
+            "get_field_storage",
+            "/entity/field_storage_config/{id}",
+        ),
+        (
+            "GET",
+            r"/entity/taxonomy_vocabulary/(\w+)",
+            "get_vocabulary",
+            "/entity/taxonomy_vocabulary/{id}",
+        ),
+        (
+            "GET",
+            r"/entity/media_type/(\w+)",
+            "get_media_type",
+            "/entity/media_type/{id}",
+        ),
+        ("GET", r"/entity/node_type/(\w+)", "get_node_type", "/entity/node_type/{id}"),
+        ("POST", r"/node", "post_node", "/node"),
+        ("GET", r"/node/(\d+)/media", "get_node_media", "/node/{id}/media"),
+        ("GET", r"/node/(\d+)", "get_node", "/node/{id}"),
+        ("HEAD", r"/node/(\d+)", "get_node", "/node/{id}"),
+        ("PATCH", r"/node/(\d+)", "patch_node", "/node/{id}"),
+        ("DELETE", r"/node/(\d+)", "delete_node", "/node/{id}"),
+        (
+            "POST",
+            r"/file/upload/media/(\w+)/(\w+)",
+            "post_file",
+            "/file/upload/media/{type}/{field}",
+        ),
+        ("POST", r"/entity/media", "post_media", "/entity/media"),
+        ("GET", r"/media/(\d+)(?:/edit)?", "get_media", "/media/{id}"),
+        ("HEAD", r"/media/(\d+)(?:/edit)?", "get_media", "/media/{id}"),
+        ("PATCH", r"/media/(\d+)(?:/edit)?", "patch_media", "/media/{id}"),
+        ("DELETE", r"/media/(\d+)(?:/edit)?", "delete_media", "/media/{id}"),
+        ("GET", r"/entity/file/(\d+)", "get_file", "/entity/file/{id}"),
+        ("DELETE", r"/entity/file/(\d+)", "delete_file", "/entity/file/{id}"),
+        (
+            "GET",
+            r"/sites/default/files/(.+)",
+            "download_file",
+            "/sites/default/files/{name}",
+        ),
+        (
+            "HEAD",
+            r"/sites/default/files/(.+)",
+            "download_file",
+            "/sites/default/files/{name}",
+        ),
+        ("POST", r"/taxonomy/term", "post_term", "/taxonomy/term"),
+        ("GET", r"/taxonomy/term/(\d+)", "get_term", "/taxonomy/term/{id}"),
+        ("HEAD", r"/taxonomy/term/(\d+)", "get_term", "/taxonomy/term/{id}"),
+        ("PATCH", r"/taxonomy/term/(\d+)", "patch_term", "/taxonomy/term/{id}"),
+        (
+            "GET",
+            r"/term_from_term_name",
+            "get_term_from_term_name",
+            "/term_from_term_name",
+        ),
+        ("GET", r"/term_from_uri", "get_term_from_uri", "/term_from_uri"),
+        (
+            "GET",
+            r"/term_from_authority_link",
+            "get_term_from_uri",
+            "/term_from_authority_link",
+        ),
+        (
+            "GET",
+            r"/jsonapi/taxonomy_term/(\w+)",
+            "get_jsonapi_terms",
+            "/jsonapi/taxonomy_term/{vid}",
+        ),
+        ("GET", r"/mock_view", "get_view", "/mock_view"),
+        ("GET", r"/_mock/stats", "get_mock_stats", None),
+        ("POST", r"/_mock/reset", "post_mock_reset", None),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except (ConnectionResetError, BrokenPipeError):
+            # Clients closing keep-alive connections when they exit.
+            self.close_connection = True
+
+    @property
+    def drupal(self):
+        return self.server.drupal
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_HEAD(self):
+        self.route("HEAD")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def do_PATCH(self):
+        self.route("PATCH")
+
+    def do_DELETE(self):
+        self.route("DELETE")
+
+    def route(self, method):
+        start = time.perf_counter()
+        parsed_url = urllib.parse.urlparse(self.path)
+        self.query = urllib.parse.parse_qs(parsed_url.query)
+        length = int(self.headers.get("Content-Length", 0))
+        self.body = self.rfile.read(length) if length > 0 else b""
+
+        for route_method, pattern, handler_name, template in self.routes:
+            if route_method != method:
+                continue
+            match = re.fullmatch(pattern, parsed_url.path)
+            if match is None:
+                continue
+            if template is not None:
+                self.simulate_network()
+                if (
+                    self.drupal.error_rate > 0
+                    and random.random() < self.drupal.error_rate
+                ):
+                    status = self.send_json(
+                        self.drupal.error_status, {"message": "Injected error."}
+                    )
+                    self.drupal.log_request(
+                        method, template, status, time.perf_counter() - start
+                    )
+                    return
+            status = getattr(self, "handle_" + handler_name)(*match.groups())
+            if template is not None:
+                self.drupal.log_request(
+                    method, template, status, time.perf_counter() - start
+                )
+            return
+
+        self.drupal.log_request(
+            method, parsed_url.path, 404, time.perf_counter() - start
+        )
+        self.send_json(404, {"message": f"No route for {method} {parsed_url.path}"})
+
+    def simulate_network(self):
+        if self.drupal.latency > 0 or self.drupal.latency_jitter > 0:
+            time.sleep(
+                max(0, random.gauss(self.drupal.latency, self.drupal.latency_jitter))
+            )
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+        return status
+
+    def send_empty(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return status
+
+    def get_json_body(self):
+        return json.loads(self.body.decode("utf-8")) if self.body else {}
+
+    def url(self, path):
+        return f"http://{self.headers['Host']}{path}"
+
+    # Integration module and configuration endpoints.
+
+    def handle_get_version(self):
+        return self.send_json(200, {"integration_module_version": "1.3.0"})
+
+    def handle_get_core_version(self):
+        return self.send_json(200, {"core_version": "10.3.6"})
+
+    def handle_get_file_hash(self):
+        fid = self.drupal.files_by_uuid.get(self.query.get("file_uuid", [""])[0])
+        algorithm = self.query.get("algorithm", ["md5"])[0]
+        if fid is None:
+            return self.send_json(404, [])
+        checksum = hashlib.new(algorithm, self.drupal.file_contents[fid]).hexdigest()
+        return self.send_json(200, [{"checksum": checksum}])
+
+    def get_bundle_fields(self, entity_type, bundle):
+        if entity_type == "node" and bundle == "islandora_object":
+            return node_fields
+        if entity_type == "media" and bundle in media_fields:
+            return media_fields[bundle]
+        if entity_type == "taxonomy_term" and bundle in vocabularies:
+            return term_fields
+        return None
+
+    def handle_get_form_display(self, entity_type, bundle):
+        fields = self.get_bundle_fields(entity_type, bundle)
+        if fields is None:
+            return self.send_json(404, {"message": "Not found."})
+        dependencies = [f"field.field.{entity_type}.{bundle}.{name}" for name in fields]
+        return self.send_json(200, {"dependencies": {"config": dependencies}})
+
+    def handle_get_field_config(self, entity_type, bundle, field_name):
+        fields = self.get_bundle_fields(entity_type, bundle)
+        if fields is None or field_name not in fields:
+            return self.send_json(404, {"message": "Not found."})
+        field_type, cardinality, target_type, field_vocabularies = fields[field_name]
+        settings = {"handler": "default:" + target_type if target_type else None}
+        if field_vocabularies:
+            settings["handler_settings"] = {
+                "target_bundles": {vocab: vocab for vocab in field_vocabularies}
+            }
+        if field_type == "typed_relation":
+            settings["rel_types"] = {
+                "relators:aut": "Author",
+                "relators:cre": "Creator",
+            }
+        return self.send_json(
+            200,
+            {
+                "entity_type": entity_type,
+                "bundle": bundle,
+                "field_name": field_name,
+                "field_type": field_type,
+                "label": field_name.replace("field_", "").replace("_", " ").title(),
+                "required": False,
+                "dependencies": {
+                    "config": [
+                        f"taxonomy.vocabulary.{vocab}" for vocab in field_vocabularies
+                    ]
+                },
+                "settings": settings,
+            },
+        )
+
+    def handle_get_field_storage(self, entity_type, field_name):
+        for bundle_fields in [node_fields, term_fields] + list(media_fields.values()):
+            if field_name in bundle_fields:
+                field_type, cardinality, target_type, field_vocabularies = (
+                    bundle_fields[field_name]
+                )
+                settings = {}
+                if target_type is not None:
+                    settings["target_type"] = target_type
+                if field_type == "string":
+                    settings["max_length"] = 255
+                return self.send_json(
+                    200,
+                    {
+                        "entity_type": entity_type,
+                        "field_name": field_name,
+                        "type": field_type,
+                        "cardinality": cardinality,
+                        "settings": settings,
+                    },
+                )
+        return self.send_json(404, {"message": "Not found."})
+
+    def handle_get_vocabulary(self, vocab_id):
+        if vocab_id not in vocabularies:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_json(200, {"vid": vocab_id, "name": vocab_id})
+
+    def handle_get_node_type(self, content_type):
+        if content_type != "islandora_object":
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_json(
+            200,
+            {"type": content_type, "name": "Repository Item", "new_revision": False},
+        )
+
+    def handle_get_media_type(self, media_type):
+        if media_type not in media_fields:
+            return self.send_json(404, {"message": "Not found."})
+        source_field = [
+            name
+            for name in media_fields[media_type]
+            if name not in ["field_media_of", "field_media_use"]
+        ][0]
+        return self.send_json(
+            200,
+            {"id": media_type, "source_configuration": {"source_field": source_field}},
+        )
+
+    # Nodes.
+
+    def handle_post_node(self):
+        node = self.get_json_body()
+        nid = self.drupal.next_id("node")
+        node["nid"] = [{"value": nid}]
+        node["uuid"] = [{"value": str(uuid.uuid4())}]
+        node["uid"] = [{"target_id": 1}]
+        now = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+        node["created"] = [{"value": now}]
+        node["changed"] = [{"value": now}]
+        node["langcode"] = [{"value": "en"}]
+        node.setdefault("path", [{"alias": None}])
+        self.drupal.nodes[nid] = node
+        return self.send_json(201, node, {"Location": self.url(f"/node/{nid}")})
+
+    def handle_get_node(self, nid):
+        if int(nid) not in self.drupal.nodes:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_json(200, self.drupal.nodes[int(nid)])
+
+    def handle_patch_node(self, nid):
+        if int(nid) not in self.drupal.nodes:
+            return self.send_json(404, {"message": "Not found."})
+        node = self.drupal.nodes[int(nid)]
+        for field_name, value in self.get_json_body().items():
+            if field_name not in ["nid", "uuid", "type"]:
+                node[field_name] = value
+        return self.send_json(200, node)
+
+    def handle_delete_node(self, nid):
+        if self.drupal.nodes.pop(int(nid), None) is None:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_empty(204)
+
+    def handle_get_node_media(self, nid):
+        media_list = [
+            media
+            for media in list(self.drupal.media.values())
+            if media.get("field_media_of", [{}])[0].get("target_id")
+            in [int(nid), str(nid)]
+        ]
+        return self.send_json(200, media_list)
+
+    # Files and media.
+
+    def handle_post_file(self, media_type, field_name):
+        fid = self.drupal.next_id("file")
+        filename = re.sub(
+            r'^.*filename="(.*)"$',
+            r"\1",
+            self.headers.get("Content-Disposition", "file"),
+        )
+        file_uuid = str(uuid.uuid4())
+        file = {
+            "fid": [{"value": fid}],
+            "uuid": [{"value": file_uuid}],
+            "filename": [{"value": filename}],
+            "uri": [
+                {
+                    "value": f"public://{fid}-{filename}",
+                    "url": f"/sites/default/files/{fid}-{filename}",
+                }
+            ],
+            "filesize": [{"value": len(self.body)}],
+        }
+        with self.drupal.lock:
+            self.drupal.files[fid] = file
+            self.drupal.file_contents[fid] = self.body
+            self.drupal.files_by_uuid[file_uuid] = fid
+            self.drupal.files_by_name[f"{fid}-{filename}"] = fid
+        return self.send_json(201, file)
+
+    def handle_post_media(self):
+        media = self.get_json_body()
+        mid = self.drupal.next_id("media")
+        media["mid"] = [{"value": mid}]
+        media["uuid"] = [{"value": str(uuid.uuid4())}]
+        for field_name, value in media.items():
+            if field_name in [
+                "field_media_image",
+                "field_media_file",
+                "field_media_document",
+            ]:
+                for file_reference in value:
+                    file = self.drupal.files.get(int(file_reference["target_id"]))
+                    if file is not None:
+                        file_reference["target_uuid"] = file["uuid"][0]["value"]
+                        file_reference["url"] = self.url(file["uri"][0]["url"])
+        self.drupal.media[mid] = media
+        return self.send_json(201, media, {"Location": self.url(f"/media/{mid}")})
+
+    def handle_get_media(self, mid):
+        if int(mid) not in self.drupal.media:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_json(200, self.drupal.media[int(mid)])
+
+    def handle_patch_media(self, mid):
+        if int(mid) not in self.drupal.media:
+            return self.send_json(404, {"message": "Not found."})
+        self.drupal.media[int(mid)].update(self.get_json_body())
+        return self.send_json(200, self.drupal.media[int(mid)])
+
+    def handle_delete_media(self, mid):
+        if self.drupal.media.pop(int(mid), None) is None:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_empty(204)
+
+    def handle_get_file(self, fid):
+        if int(fid) not in self.drupal.files:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_json(200, self.drupal.files[int(fid)])
+
+    def handle_delete_file(self, fid):
+        if self.drupal.files.pop(int(fid), None) is None:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_empty(204)
+
+    def handle_download_file(self, name):
+        fid = self.drupal.files_by_name.get(urllib.parse.unquote(name))
+        if fid is None:
+            return self.send_json(404, {"message": "Not found."})
+        content = self.drupal.file_contents[fid]
+        status = 200
+        range_match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if range_match is not None:
+            status = 206
+            content = content[int(range_match.group(1)) :]
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+        return status
+
+    # Taxonomy terms.
+
+    def handle_post_term(self):
+        term_json = self.get_json_body()
+        parent = term_json.get("parent", [{}])[0].get("target_id")
+        uri = None
+        if (
+            "field_external_uri" in term_json
+            and len(term_json["field_external_uri"]) > 0
+        ):
+            uri = term_json["field_external_uri"][0]["uri"]
+        term = self.drupal.add_term(
+            term_json["vid"][0]["target_id"], term_json["name"][0]["value"], uri, parent
+        )
+        return self.send_json(
+            201,
+            term,
+            {"Location": self.url(f"/taxonomy/term/{term['tid'][0]['value']}")},
+        )
+
+    def handle_get_term(self, tid):
+        if int(tid) not in self.drupal.terms:
+            return self.send_json(404, {"message": "Not found."})
+        return self.send_json(200, self.drupal.terms[int(tid)])
+
+    def handle_patch_term(self, tid):
+        if int(tid) not in self.drupal.terms:
+            return self.send_json(404, {"message": "Not found."})
+        self.drupal.terms[int(tid)].update(self.get_json_body())
+        return self.send_json(200, self.drupal.terms[int(tid)])
+
+    def handle_get_term_from_term_name(self):
+        vocab_id = self.query.get("vocab", [""])[0].strip()
+        name = self.query.get("name", [""])[0].strip().lower()
+        matches = [
+            term
+            for term in list(self.drupal.terms.values())
+            if term["vid"][0]["target_id"] == vocab_id
+            and term["name"][0]["value"].strip().lower() == name
+        ]
+        return self.send_json(200, matches)
+
+    def handle_get_term_from_uri(self):
+        uri = self.query.get("uri", self.query.get("authority_link", [""]))[0]
+        matches = [
+            term
+            for term in list(self.drupal.terms.values())
+            if term.get("field_external_uri", [{}])[0].get("uri") == uri
+        ]
+        return self.send_json(200, matches)
+
+    def handle_get_jsonapi_terms(self, vocab_id):
+        offset = int(self.query.get("page[offset]", ["0"])[0])
+        terms = [
+            term
+            for term in list(self.drupal.terms.values())
+            if term["vid"][0]["target_id"] == vocab_id
+        ]
+        page = terms[offset : offset + 50]
+        body = {
+            "data": [
+                {
+                    "attributes": {
+                        "drupal_internal__tid": term["tid"][0]["value"],
+                        "name": term["name"][0]["value"],
+                        "field_external_uri": term.get("field_external_uri", [None])[0],
+                    }
+                }
+                for term in page
+            ],
+            "links": {},
+        }
+        if offset + 50 < len(terms):
+            body["links"]["next"] = {
+                "href": self.url(
+                    f"/jsonapi/taxonomy_term/{vocab_id}?page[offset]={offset + 50}"
+                )
+            }
+        return self.send_json(200, body)
+
+    # Views.
+
+    def handle_get_view(self):
+        page = int(self.query.get("page", ["0"])[0])
+        items_per_page = int(self.query.get("items_per_page", ["10"])[0])
+        nids = sorted(self.drupal.nodes.keys())
+        page_nids = nids[page * items_per_page : (page + 1) * items_per_page]
+        return self.send_json(
+            200,
+            [self.drupal.nodes[nid] for nid in page_nids if nid in self.drupal.nodes],
+        )
+
+    # Control endpoints, not counted in stats.
+
+    def handle_get_mock_stats(self):
+        return self.send_json(200, self.drupal.get_stats())
+
+    def handle_post_mock_reset(self):
+        self.drupal.reset()
+        return self.send_json(200, {})
+
+
+class MockDrupalServer:
+    """Runs a MockDrupal on a ThreadingHTTPServer in a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0, **options):
+        self.drupal = MockDrupal(**options)
+        self.httpd = http.server.ThreadingHTTPServer(
+            (host, port), MockDrupalRequestHandler
+        )
+        self.httpd.daemon_threads = True
+        self.httpd.drupal = self.drupal
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Mean seconds added to each response.",
+    )
+    parser.add_argument(
+        "--latency_jitter",
+        type=float,
+        default=0.0,
+        help="Standard deviation of the added latency.",
+    )
+    parser.add_argument(
+        "--error_rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests that get an error response.",
+    )
+    parser.add_argument(
+        "--error_status", type=int, default=503, help="HTTP status of injected errors."
+    )
+    args = parser.parse_args()
+
+    server = MockDrupalServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    print(f"Mock Drupal listening at {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
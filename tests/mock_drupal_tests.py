@@ -0,0 +1,22 @@
+"""unittest tests that run Workbench end to end against the mock Drupal in mock_drupal_server.py."""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from benchmark_tasks import all_tasks, run_benchmarks
+
+
+class TestTasksAgainstMockDrupal(unittest.TestCase):
+
+    def test_all_benchmarked_tasks_complete(self):
+        results = run_benchmarks([3], all_tasks, {})
+        self.assertEqual([result["task"] for result in results], all_tasks)
+        for result in results:
+            self.assertEqual(result["exit_code"], 0, result["output"])
+            self.assertGreater(result["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,16 @@
 
 import argparse
 import contextlib
+import copy
+import csv
+import datetime
+import importlib
 import io
+import json
 import sys
 import os
+import threading
+import time
 from datetime import timedelta
 from pathlib import Path
 from unittest import mock
@@ -12,11 +19,20 @@ from unittest import mock
 import requests
 from ruamel.yaml import YAML
 import collections
+import shutil
 import tempfile
 import unittest
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import workbench_utils
+import workbench_metrics
+import workbench_throttle
+import workbench_preprocessors
+import workbench_hooks
+import workbench_lookup_cache
+import workbench_http_cache
+import workbench_fields
+import workbench_csv_row
 from WorkbenchConfig import WorkbenchConfig
 
 
@@ -1930,6 +1946,1669 @@ class TestPagedContentIgnoreFile(unittest.TestCase):
         self.assertFalse(res)
 
 
+class TestScheduleMediaUploads(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {
+            "media_upload_scheduling": "largest_first",
+            "media_upload_lanes": 2,
+            "media_upload_size_buckets": [100],
+            "media_upload_estimated_bytes_per_second": 10,
+        }
+        self.jobs = [
+            {"filename": "small1.jpg", "size": 5},
+            {"filename": "huge.mp4", "size": 1000},
+            {"filename": "small2.jpg", "size": 7},
+            {"filename": "large.tif", "size": 600},
+            {"filename": "medium.tif", "size": 500},
+        ]
+
+    def test_largest_first(self):
+        lanes = workbench_utils.schedule_media_uploads(self.config, self.jobs)
+        self.assertEqual(len(lanes), 2)
+        lane_filenames = [[job["filename"] for job in lane] for lane in lanes]
+        self.assertEqual(lane_filenames[0], ["huge.mp4", "small2.jpg", "small1.jpg"])
+        self.assertEqual(lane_filenames[1], ["large.tif", "medium.tif"])
+        makespan = workbench_utils.get_projected_media_upload_makespan(
+            self.config, lanes
+        )
+        self.assertEqual(makespan, 110.0)
+
+    def test_size_buckets(self):
+        self.config["media_upload_scheduling"] = "size_buckets"
+        self.config["media_upload_lanes"] = 3
+        lanes = workbench_utils.schedule_media_uploads(self.config, self.jobs)
+        self.assertEqual(len(lanes), 3)
+        lane_filenames = [[job["filename"] for job in lane] for lane in lanes]
+        self.assertEqual(lane_filenames[0], ["small2.jpg", "small1.jpg"])
+        self.assertEqual(lane_filenames[1], ["huge.mp4"])
+        self.assertEqual(lane_filenames[2], ["large.tif", "medium.tif"])
+
+    def test_more_lanes_than_jobs(self):
+        self.config["media_upload_lanes"] = 10
+        lanes = workbench_utils.schedule_media_uploads(self.config, self.jobs)
+        self.assertEqual(len(lanes), 5)
+
+    def test_size_buckets_do_not_exceed_lanes(self):
+        self.config["media_upload_scheduling"] = "size_buckets"
+        self.config["media_upload_size_buckets"] = [100, 550]
+        self.config["media_upload_lanes"] = 2
+        lanes = workbench_utils.schedule_media_uploads(self.config, self.jobs)
+        self.assertEqual(len(lanes), 2)
+        lane_filenames = [[job["filename"] for job in lane] for lane in lanes]
+        self.assertEqual(lane_filenames[0], ["medium.tif", "small2.jpg", "small1.jpg"])
+        self.assertEqual(lane_filenames[1], ["huge.mp4", "large.tif"])
+
+    def test_media_upload_batch_is_full(self):
+        self.config["media_upload_batch_size"] = 3
+        self.config["media_upload_batch_bytes"] = 1500
+        self.assertFalse(
+            workbench_utils.media_upload_batch_is_full(self.config, self.jobs[:2])
+        )
+        self.assertTrue(
+            workbench_utils.media_upload_batch_is_full(self.config, self.jobs[:3])
+        )
+        self.assertTrue(
+            workbench_utils.media_upload_batch_is_full(
+                self.config, [self.jobs[1], self.jobs[3]]
+            )
+        )
+
+    def test_failed_uploads_are_recorded(self):
+        rollback_dir = tempfile.mkdtemp()
+        rollback_csv_path = os.path.join(rollback_dir, "rollback.csv")
+        with open(rollback_csv_path, "w") as fh:
+            fh.write("node_id\n")
+        self.config["id_field"] = "id"
+        self.config["progress_bar"] = False
+        jobs = [
+            {
+                "filename": job["filename"],
+                "file_fieldname": "file",
+                "node_id": str(i),
+                "node_uri": "https://islandora.dev/node/" + str(i),
+                "csv_row": {"id": "row" + str(i)},
+                "media_use_tid": None,
+                "size": job["size"],
+            }
+            for i, job in enumerate(self.jobs)
+        ]
+
+        def create_media(config, filename, *args):
+            return 500 if filename == "large.tif" else 201
+
+        with mock.patch.object(
+            workbench_utils, "create_media", side_effect=create_media
+        ), mock.patch.object(
+            workbench_utils,
+            "get_rollback_csv_filepath",
+            return_value=rollback_csv_path,
+        ), contextlib.redirect_stdout(
+            io.StringIO()
+        ):
+            summary = workbench_utils.run_scheduled_media_uploads(self.config, jobs)
+            failures_csv_path = workbench_utils.get_media_upload_failures_csv_path(
+                self.config
+            )
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(os.path.dirname(failures_csv_path), rollback_dir)
+        with open(failures_csv_path, newline="") as fh:
+            failures = list(csv.DictReader(fh))
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0]["node_id"], "3")
+        self.assertEqual(failures[0]["id"], "row3")
+        self.assertEqual(failures[0]["file"], "large.tif")
+        self.assertEqual(failures[0]["status_code"], "500")
+        with open(rollback_csv_path) as fh:
+            self.assertIn('# Media for "large.tif" not created', fh.read())
+        shutil.rmtree(rollback_dir)
+
+    def test_get_media_upload_file_size(self):
+        input_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(input_dir, "subdir"))
+        with open(os.path.join(input_dir, "subdir", "page.jpg"), "wb") as fh:
+            fh.write(b"x" * 42)
+        config = {"input_dir": input_dir}
+        file_sizes = workbench_utils.get_input_dir_file_sizes(config)
+        self.assertEqual(file_sizes, {"subdir/page.jpg": 42})
+        self.assertEqual(
+            workbench_utils.get_media_upload_file_size(
+                config, "subdir/page.jpg", file_sizes
+            ),
+            42,
+        )
+        self.assertEqual(
+            workbench_utils.get_media_upload_file_size(
+                config, "http://example.com/file.jpg", file_sizes
+            ),
+            0,
+        )
+        self.assertEqual(
+            workbench_utils.get_media_upload_file_size(
+                config, "missing.jpg", file_sizes
+            ),
+            0,
+        )
+
+
+class TestPagedContentPageOrdering(unittest.TestCase):
+
+    def test_page_file_sort_key(self):
+        config = {"paged_content_sequence_separator": "-"}
+        page_files = ["book-10.jpg", "book-2.jpg", "notes.txt", "book-001.jpg"]
+        sorted_page_files = sorted(
+            page_files,
+            key=lambda f: workbench_utils.get_page_file_sort_key(config, f),
+        )
+        self.assertEqual(
+            sorted_page_files,
+            ["book-001.jpg", "book-2.jpg", "book-10.jpg", "notes.txt"],
+        )
+
+
+class TestRecoveryModePageFilesInCsvIdToNodeIdMap(unittest.TestCase):
+
+    def setUp(self):
+        self.db_file_path = os.path.join(
+            tempfile.gettempdir(), "recovery_mode_page_files_test.db"
+        )
+        if os.path.exists(self.db_file_path):
+            os.remove(self.db_file_path)
+        self.config = {
+            "csv_id_to_node_id_map_path": self.db_file_path,
+            "csv_id_to_node_id_map_allowed_hosts": [],
+            "recovery_mode_starting_from_node_id": 100,
+            "config_file": "config.yml",
+            "host": "https://islandora.dev",
+        }
+        workbench_utils.prepare_csv_id_to_node_id_map(self.config)
+        for parent_csv_id, csv_id, node_id in [
+            ("book1", "page-1.jpg", 50),
+            ("book1", "page-2.jpg", 101),
+            ("book1", "page-3.jpg", 102),
+            ("book2", "page-1.jpg", 103),
+        ]:
+            workbench_utils.populate_csv_id_to_node_id_map(
+                self.config, parent_csv_id, "10", csv_id, node_id
+            )
+
+    def test_page_files_in_map(self):
+        page_files_in_map = (
+            workbench_utils.get_recovery_mode_page_files_in_csv_id_to_node_id_map(
+                self.config, "book1"
+            )
+        )
+        self.assertEqual(page_files_in_map, {"page-2.jpg": "101", "page-3.jpg": "102"})
+
+    def tearDown(self):
+        os.remove(self.db_file_path)
+
+
+class TestCSVExporterReorderBuffer(unittest.TestCase):
+
+    def test_rows_written_in_input_order(self):
+        import random
+        import time
+        import workbench_export
+
+        exporter = workbench_export.CSVExporter.__new__(workbench_export.CSVExporter)
+        exporter.config = {
+            "export_threads": 4,
+            "export_reorder_buffer_factor": 2,
+            "progress_bar": False,
+            "enable_http_cache": False,
+        }
+        exporter.csv_data = iter([{"node_id": str(i)} for i in range(40)])
+
+        def export_row(row, field_names):
+            time.sleep(random.uniform(0, 0.01))
+            if row["node_id"] == "7":
+                return None
+            return row["node_id"], {"node_id": row["node_id"]}
+
+        written = []
+        exporter.export_row = export_row
+        exporter.write_exported_row = (
+            lambda writer, result, row_count, total_rows: written.append(result[0])
+        )
+        exporter._process_nodes(None, [])
+        self.assertEqual(written, [str(i) for i in range(40) if i != 7])
+
+
+class TestExportFileDownloadThreads(unittest.TestCase):
+
+    def test_queue_is_bounded_and_failures_are_listed(self):
+        import workbench_export
+
+        config = {
+            "export_csv_term_mode": "tid",
+            "export_file_download_threads": 2,
+            "export_file_directory": "/tmp/export",
+            "progress_bar": False,
+        }
+        prepared = []
+        transfers_can_run = threading.Event()
+
+        def prepare_file_download(config, node_id, **kwargs):
+            prepared.append(node_id)
+            return {
+                "node_id": node_id,
+                "url": "https://example.com/" + node_id + ".jpg",
+                "path": "/tmp/export/" + node_id + ".jpg",
+                "skip": False,
+            }
+
+        def transfer_file_from_drupal(config, download):
+            transfers_can_run.wait()
+            return False if download["node_id"] == "3" else 10
+
+        with mock.patch.object(
+            workbench_export, "get_field_definitions", return_value={}
+        ), mock.patch.object(
+            workbench_export, "prepare_file_download", prepare_file_download
+        ), mock.patch.object(
+            workbench_export, "transfer_file_from_drupal", transfer_file_from_drupal
+        ):
+            exporter = workbench_export.WorkbenchExportBase(config)
+            paths = []
+            submitter = threading.Thread(
+                target=lambda: paths.extend(
+                    exporter.process_file_data(str(i)) for i in range(10)
+                )
+            )
+            submitter.start()
+            time.sleep(0.2)
+            # Two downloads running and two queued; the fifth waits for a slot.
+            self.assertEqual(len(prepared), 5)
+            transfers_can_run.set()
+            submitter.join()
+            with contextlib.redirect_stdout(io.StringIO()):
+                exporter.finish_file_downloads()
+
+        self.assertEqual(paths, ["/tmp/export/" + str(i) + ".jpg" for i in range(10)])
+        self.assertEqual(exporter.download_stats["failed"], 1)
+        self.assertEqual(exporter.failed_downloads, ["/tmp/export/3.jpg"])
+
+
+class TestViewExporterPagePrefetch(unittest.TestCase):
+
+    def fetch_pages(self, prefetch_pages):
+        import workbench_export
+
+        class Response:
+            def __init__(self, status_code, text):
+                self.status_code = status_code
+                self.text = text
+
+        pages = {
+            0: Response(200, json.dumps([{"nid": [{"value": 1}]}])),
+            1: Response(500, ""),
+            2: Response(200, json.dumps([{"nid": [{"value": 2}]}])),
+            3: Response(200, "[]"),
+        }
+        requested_urls = []
+
+        def issue_request(config, method, url):
+            requested_urls.append(url)
+            page = int(url.split("page=")[1].split("&")[0])
+            return pages[page]
+
+        exporter = workbench_export.ViewExporter.__new__(workbench_export.ViewExporter)
+        exporter.config = {
+            "view_prefetch_pages": prefetch_pages,
+            "view_items_per_page": 50,
+        }
+        exporter.view_config = {
+            "base_url": "https://example.com/view",
+            "parameters": "type=foo",
+        }
+        with mock.patch.object(workbench_export, "issue_request", issue_request):
+            if prefetch_pages > 0:
+                fetched = list(exporter.prefetch_view_pages())
+            else:
+                fetched = list(exporter.fetch_view_pages())
+        return fetched, requested_urls
+
+    def test_prefetch_yields_same_pages_as_sequential_fetch(self):
+        sequential, sequential_urls = self.fetch_pages(0)
+        prefetched, prefetched_urls = self.fetch_pages(2)
+        self.assertEqual(
+            [(page, nodes) for page, response, nodes in sequential],
+            [(page, nodes) for page, response, nodes in prefetched],
+        )
+        self.assertEqual([page for page, response, nodes in sequential], [0, 1, 2, 3])
+        self.assertIsNone(sequential[1][2])
+        self.assertEqual(sequential_urls, prefetched_urls)
+        self.assertEqual(
+            sequential_urls[0],
+            "https://example.com/view?page=0&type=foo&items_per_page=50",
+        )
+
+
+class TestTermDataCache(unittest.TestCase):
+
+    def setUp(self):
+        workbench_utils.term_data_cache.clear()
+        self.requested_urls = []
+
+    def tearDown(self):
+        workbench_utils.term_data_cache.clear()
+
+    def issue_request(self, config, method, url, headers=None):
+        self.requested_urls.append(url)
+        response = mock.Mock()
+        tid = url.split("/taxonomy/term/")[1].split("?")[0]
+        if tid == "404":
+            response.status_code = 404
+        else:
+            response.status_code = 200
+            response.json.return_value = {
+                "vid": [{"target_id": "subjects"}],
+                "name": [{"value": "Term " + tid}],
+                "field_external_uri": [{"uri": "http://example.com/" + tid}],
+            }
+        return response
+
+    def test_one_request_per_distinct_term(self):
+        config = {"host": "https://example.com", "term_cache_size": 10}
+        with mock.patch.object(workbench_utils, "issue_request", self.issue_request):
+            for tid in [1, "1", 2, " 1", 2, "404", "404"]:
+                workbench_utils.get_term_vocab(config, tid)
+                workbench_utils.get_term_name(config, tid)
+                workbench_utils.get_term_uri(config, tid)
+            self.assertEqual(workbench_utils.get_term_name(config, 2), "Term 2")
+            self.assertEqual(workbench_utils.get_term_vocab(config, 2), "subjects")
+            self.assertEqual(
+                workbench_utils.get_term_uri(config, 2), "http://example.com/2"
+            )
+            self.assertFalse(workbench_utils.get_term_name(config, "404"))
+        self.assertEqual(len(self.requested_urls), 3)
+
+    def test_least_recently_used_terms_are_evicted(self):
+        config = {"host": "https://example.com", "term_cache_size": 2}
+        with mock.patch.object(workbench_utils, "issue_request", self.issue_request):
+            for tid in [1, 2, 1, 3, 1, 2]:
+                workbench_utils.get_term_name(config, tid)
+        self.assertEqual(len(self.requested_urls), 4)
+        self.assertEqual(list(workbench_utils.term_data_cache.keys()), ["1", "2"])
+
+    def test_failed_requests_are_not_cached(self):
+        config = {"host": "https://example.com", "term_cache_size": 10}
+        unavailable = mock.Mock(status_code=503)
+        with mock.patch.object(
+            workbench_utils,
+            "issue_request",
+            side_effect=[
+                unavailable,
+                self.issue_request(config, "GET", "/taxonomy/term/5"),
+            ],
+        ) as mock_issue_request:
+            self.assertFalse(workbench_utils.get_term_name(config, 5))
+            self.assertEqual(workbench_utils.get_term_name(config, 5), "Term 5")
+            self.assertEqual(workbench_utils.get_term_name(config, 5), "Term 5")
+        self.assertEqual(mock_issue_request.call_count, 2)
+
+    def test_forget_term_data(self):
+        config = {"host": "https://example.com", "term_cache_size": 10}
+        with mock.patch.object(workbench_utils, "issue_request", self.issue_request):
+            workbench_utils.get_term_name(config, 1)
+            workbench_utils.get_term_name(config, 2)
+            workbench_utils.forget_term_data(" 1")
+            workbench_utils.forget_term_data(3)
+            workbench_utils.get_term_name(config, 1)
+            workbench_utils.get_term_name(config, 2)
+        self.assertEqual(len(self.requested_urls), 3)
+
+
+class TestResumableFileDownloads(unittest.TestCase):
+
+    def setUp(self):
+        self.export_dir = tempfile.mkdtemp()
+        self.config = {
+            "export_file_directory": self.export_dir,
+            "export_file_skip_existing": True,
+            "export_file_skip_existing_algorithm": None,
+            "secure_ssl_only": False,
+        }
+        workbench_utils.reserved_download_paths.clear()
+
+    def tearDown(self):
+        workbench_utils.reserved_download_paths.clear()
+        shutil.rmtree(self.export_dir)
+
+    def prepare(self, remote_size):
+        media_list = [
+            {
+                "field_media_use": [{"target_id": 17}],
+                "field_media_image": [
+                    {"url": "https://example.com/files/page.jpg", "target_uuid": "u"}
+                ],
+            }
+        ]
+        head_response = mock.Mock(
+            status_code=200, headers={"Content-Length": str(remote_size)}
+        )
+        with mock.patch.object(
+            workbench_utils, "resolve_media_use_term_id", return_value=17
+        ), mock.patch.object(
+            workbench_utils.requests, "head", return_value=head_response
+        ):
+            return workbench_utils.prepare_file_download(
+                self.config, "1", media_list=media_list
+            )
+
+    def test_existing_file_with_matching_size_is_skipped(self):
+        with open(os.path.join(self.export_dir, "page.jpg"), "wb") as f:
+            f.write(b"12345")
+
+        download = self.prepare(5)
+        self.assertTrue(download["skip"])
+        self.assertEqual(download["path"], os.path.join(self.export_dir, "page.jpg"))
+
+        # Another node's file with the same name gets a deduped path.
+        download = self.prepare(5)
+        self.assertFalse(download["skip"])
+        self.assertEqual(download["path"], os.path.join(self.export_dir, "page_1.jpg"))
+
+    def test_existing_file_with_different_size_is_not_overwritten(self):
+        with open(os.path.join(self.export_dir, "page.jpg"), "wb") as f:
+            f.write(b"12345")
+
+        download = self.prepare(6)
+        self.assertFalse(download["skip"])
+        self.assertEqual(download["path"], os.path.join(self.export_dir, "page_1.jpg"))
+
+    def test_partial_download_is_resumed(self):
+        path = os.path.join(self.export_dir, "page.jpg")
+        with open(path + ".part", "wb") as f:
+            f.write(b"123")
+
+        response = mock.MagicMock(status_code=206)
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [b"45", b"6"]
+        download = {
+            "node_id": "1",
+            "url": "https://example.com/files/page.jpg",
+            "path": path,
+            "skip": False,
+        }
+        with mock.patch.object(
+            workbench_utils.requests, "get", return_value=response
+        ) as get:
+            num_bytes = workbench_utils.transfer_file_from_drupal(self.config, download)
+
+        self.assertEqual(get.call_args.kwargs["headers"], {"Range": "bytes=3-"})
+        self.assertEqual(num_bytes, 3)
+        self.assertFalse(os.path.exists(path + ".part"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"123456")
+
+
+class TestParquetExportWriter(unittest.TestCase):
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow") is not None, "pyarrow is not installed"
+    )
+    def test_typed_and_list_columns(self):
+        import pyarrow.parquet
+        import workbench_export
+
+        field_definitions = {
+            "field_weight": {"field_type": "integer", "cardinality": 1, "label": "W"},
+            "field_subject": {
+                "field_type": "entity_reference",
+                "cardinality": -1,
+                "label": "Subject",
+            },
+            "field_date": {"field_type": "datetime", "cardinality": 1, "label": "D"},
+        }
+        field_names = [
+            "node_id",
+            "created",
+            "field_weight",
+            "field_subject",
+            "field_date",
+        ]
+        config = {"export_parquet_row_group_size": 2, "subdelimiter": "|"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "export.parquet")
+            writer = workbench_export.ParquetExportWriter(
+                config, output_path, field_names, field_definitions
+            )
+            for i in range(3):
+                writer.writerow(
+                    {
+                        "node_id": str(i + 1),
+                        "created": "2024-01-02T03:04:05+00:00",
+                        "field_weight": "x" if i == 2 else str(i),
+                        "field_subject": "subjects:Cats|subjects:Dogs",
+                        "field_date": "2020-05-01",
+                    }
+                )
+            writer.close()
+
+            parquet_file = pyarrow.parquet.ParquetFile(output_path)
+            self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+            table = parquet_file.read()
+
+        self.assertEqual(table.schema.field("node_id").type, "int64")
+        self.assertEqual(table.column("field_weight").to_pylist(), [0, 1, None])
+        self.assertEqual(
+            table.column("field_subject").to_pylist()[0],
+            ["subjects:Cats", "subjects:Dogs"],
+        )
+        self.assertEqual(
+            table.column("field_date").to_pylist()[0], datetime.datetime(2020, 5, 1)
+        )
+        self.assertEqual(
+            table.schema.field("field_subject").metadata[b"label"], b"Subject"
+        )
+
+
+class TestWorkbenchMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = workbench_metrics.WorkbenchMetrics()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_endpoint_template(self):
+        self.assertEqual(
+            workbench_metrics.get_endpoint_template(
+                "https://example.com/node/12?_format=json"
+            ),
+            "/node/{id}",
+        )
+        self.assertEqual(
+            workbench_metrics.get_endpoint_template(
+                "https://example.com/jsonapi/node/page/0b9a8e39-3b6a-4a4e-a2f1-4e8f8e2d1a9c"
+            ),
+            "/jsonapi/node/page/{uuid}",
+        )
+
+    def test_nested_timers_for_the_same_phase_are_timed_once(self):
+        with self.metrics.timer("term_resolution"):
+            with self.metrics.timer("term_resolution"):
+                with self.metrics.timer("node_post"):
+                    pass
+        self.assertEqual(self.metrics.phases["term_resolution"].count, 1)
+        self.assertEqual(self.metrics.phases["node_post"].count, 1)
+
+    def test_latency_percentiles(self):
+        histogram = workbench_metrics.LatencyHistogram()
+        for millisecond in range(1, 1001):
+            histogram.record(millisecond / 1000)
+        for percentile, expected in [(50, 0.5), (95, 0.95), (99, 0.99)]:
+            self.assertAlmostEqual(
+                histogram.get_percentile(percentile), expected, delta=expected * 0.02
+            )
+        self.assertLessEqual(len(histogram.latency_counts), 500)
+        self.assertIsNone(workbench_metrics.LatencyHistogram().get_percentile(50))
+
+    def test_get_latency_percentile(self):
+        for seconds in [0.01, 0.02, 2]:
+            self.metrics.record_request(
+                "GET", "https://example.com/node/1?_format=json", seconds, 200
+            )
+        self.assertAlmostEqual(
+            self.metrics.get_latency_percentile(50, "GET /node/{id}"), 0.02, places=3
+        )
+        self.assertAlmostEqual(self.metrics.get_latency_percentile(99), 2, delta=0.03)
+        self.assertIsNone(self.metrics.get_latency_percentile(50, "GET /media/{id}"))
+
+    def test_number_of_endpoints_is_capped(self):
+        self.metrics.max_endpoints = 3
+        self.metrics.record_request("GET", "https://example.com/node/1", 0.01, 200)
+        for i in range(100):
+            self.metrics.record_request(
+                "GET", f"https://example.com/alias-{i}", 0.01, 200
+            )
+        self.metrics.record_request("GET", "https://example.com/node/2", 0.01, 200)
+        self.assertEqual(
+            sorted(self.metrics.endpoints),
+            ["GET /alias-0", "GET /alias-1", "GET /node/{id}", "GET {other}"],
+        )
+        self.assertEqual(self.metrics.endpoints["GET {other}"]["histogram"].count, 98)
+        self.assertEqual(self.metrics.endpoints["GET /node/{id}"]["histogram"].count, 2)
+
+    def test_response_time_trend_uses_most_recent_requests(self):
+        config = {"log_response_time_sample": False}
+        with mock.patch.object(
+            workbench_utils,
+            "http_response_times",
+            collections.deque(maxlen=20),
+        ):
+            for response_time in range(100):
+                average = workbench_utils.calculate_response_time_trend(
+                    config, response_time
+                )
+            self.assertEqual(len(workbench_utils.http_response_times), 20)
+        self.assertEqual(average, sum(range(80, 100)) / 20)
+
+    def test_report(self):
+        metrics_file_path = os.path.join(self.temp_dir, "metrics.json")
+        config = {
+            "task": "create",
+            "metrics_file_path": metrics_file_path,
+            "metrics_slow_row_threshold": 0,
+        }
+        for row_id in ["001", "002"]:
+            self.metrics.start_row(config, row_id)
+            self.metrics.record("node_post", 0.02)
+            self.metrics.record_request(
+                "POST", "https://example.com/node?_format=json", 0.02, 201
+            )
+            self.metrics.record_request(
+                "GET", f"https://example.com/node/{row_id}?_format=json", 0.3, 200
+            )
+        self.metrics.write_report(config)
+
+        with open(metrics_file_path) as metrics_file:
+            report = json.load(metrics_file)
+        self.assertEqual(report["counters"]["http_requests"], 4)
+        self.assertEqual(report["rows"]["count"], 2)
+        self.assertEqual(report["phases"]["node_post"]["count"], 2)
+        self.assertEqual(report["phases"]["node_post"]["buckets"]["<=0.025"], 2)
+        self.assertEqual(
+            report["endpoints"]["GET /node/{id}"]["status_codes"], {"200": 2}
+        )
+        self.assertEqual(report["endpoints"]["GET /node/{id}"]["buckets"]["<=0.5"], 2)
+        self.assertEqual([row["id"] for row in report["slow_rows"]], ["001", "002"])
+        self.assertEqual(report["slow_rows"][0]["phases"], {"node_post": 0.02})
+        self.assertEqual(report["slow_rows"][0]["requests"], 2)
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+
+    def complete_requests(self, limiter, count, **kwargs):
+        for i in range(count):
+            limiter.acquire()
+            limiter.release(**kwargs)
+
+    def test_limit_grows_additively_and_halves_on_overload(self):
+        limiter = workbench_throttle.AdaptiveConcurrencyLimiter(1, 8, 3)
+        self.complete_requests(limiter, 1, response_time=0.01, status_code=200)
+        self.assertEqual(limiter.limit, 2)
+        # About one more concurrent request per window of successful requests.
+        self.complete_requests(limiter, 3, response_time=0.01, status_code=200)
+        self.assertEqual(int(limiter.limit), 3)
+        self.complete_requests(limiter, 200, response_time=0.01, status_code=200)
+        self.assertEqual(limiter.limit, 8)
+
+        self.complete_requests(limiter, 1, response_time=0.01, status_code=503)
+        self.assertEqual(limiter.limit, 4)
+        limiter.next_decrease = 0
+        self.complete_requests(
+            limiter, 1, response_time=0.5, status_code=200, median_response_time=0.1
+        )
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_backoff_at_minimum_limit(self):
+        limiter = workbench_throttle.AdaptiveConcurrencyLimiter(1, 8, 3)
+        # Released without acquire(), which would sleep for the backoff.
+        limiter.in_flight = 3
+        limiter.release(0.01, 429, retry_after="2")
+        self.assertEqual(limiter.backoff, 2)
+        limiter.release(0.01, 429)
+        self.assertEqual(limiter.backoff, 4)
+        limiter.release(0.01, 200)
+        self.assertEqual(limiter.backoff, 0)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_limit_is_enforced_across_threads(self):
+        limiter = workbench_throttle.AdaptiveConcurrencyLimiter(2, 2, 3)
+        lock = threading.Lock()
+        in_flight = []
+
+        def request():
+            limiter.acquire()
+            with lock:
+                in_flight.append(limiter.in_flight)
+            time.sleep(0.01)
+            limiter.release(0.01, 200)
+
+        threads = [threading.Thread(target=request) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(max(in_flight), 2)
+
+
+class TestTokenBuckets(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_token_bucket_waits(self):
+        bucket = workbench_throttle.TokenBucket(10, burst=2)
+        waits = [bucket.reserve() for i in range(4)]
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.01)
+        self.assertAlmostEqual(waits[3], 0.2, delta=0.01)
+
+    def test_shared_token_bucket(self):
+        db_path = os.path.join(self.temp_dir, "rate_limits.db")
+        primary = workbench_throttle.SharedTokenBucket(db_path, "writes", 10, burst=1)
+        # A second process that doesn't configure a rate uses the one already in effect.
+        secondary = workbench_throttle.SharedTokenBucket(db_path, "writes")
+        self.assertEqual(secondary.rate, 10)
+        self.assertIsNone(workbench_throttle.SharedTokenBucket(db_path, "reads").rate)
+
+        self.assertEqual(primary.reserve(), 0)
+        self.assertAlmostEqual(secondary.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(primary.reserve(), 0.2, delta=0.01)
+
+
+class TestPreprocessors(unittest.TestCase):
+
+    def setUp(self):
+        self.scripts_dir = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"
+        )
+        self.persistent_script = (
+            sys.executable
+            + " "
+            + os.path.join(self.scripts_dir, "samplepreprocessor_persistent.py")
+        )
+        self.plugin = "python:" + os.path.join(
+            self.scripts_dir, "samplepreprocessor_plugin.py"
+        )
+        self.config = {
+            "subdelimiter": "|",
+            "config_file_path": "config.yml",
+            "preprocessor_mode": "persistent",
+            "preprocessor_batch_size": 3,
+            "preprocessor_processes": 1,
+        }
+
+    def tearDown(self):
+        workbench_utils.close_preprocessors()
+
+    def test_persistent_preprocessor(self):
+        for processes in [1, 2]:
+            preprocessor = workbench_preprocessors.PersistentPreprocessor(
+                self.persistent_script.split(" "), "|", "config.yml", processes
+            )
+            values = [f"foo {i}|bar" for i in range(25)] + [None]
+            results = preprocessor.preprocess(values)
+            self.assertEqual(results, [f"FOO {i}|BAR" for i in range(25)] + [None])
+            self.assertEqual(preprocessor.preprocess(["baz"]), ["BAZ"])
+            preprocessor.close()
+
+    def test_plugin_preprocessor(self):
+        plugin_path = self.plugin[len("python:") :]
+        for processes in [1, 2]:
+            preprocessor = workbench_preprocessors.PluginPreprocessor(
+                plugin_path, "|", "config.yml", processes
+            )
+            self.assertEqual(
+                preprocessor.preprocess(["foo|bar", None, "baz"]),
+                ["FOO|BAR", None, "BAZ"],
+            )
+            preprocessor.close()
+
+    def test_preprocess_csv_rows_in_batches(self):
+        config = dict(
+            self.config,
+            preprocessors=[
+                {"field_a": self.persistent_script},
+                {"field_b": self.plugin},
+            ],
+        )
+        csv_data = [
+            {"id": str(i), "field_a": "a" if i % 2 else "b", "field_b": f"b{i}"}
+            for i in range(7)
+        ]
+        preprocessed = []
+        with mock.patch.object(
+            workbench_utils, "preprocess_field_data"
+        ) as preprocess_field_data:
+            for row in workbench_utils.preprocess_csv_rows(config, iter(csv_data)):
+                for field, script in [
+                    ("field_a", self.persistent_script),
+                    ("field_b", self.plugin),
+                ]:
+                    row[field] = workbench_utils.preprocess_csv(
+                        config, row, field, script
+                    )
+                preprocessed.append(dict(row))
+                # Each batch's values are preprocessed before its first row is yielded.
+                if row["id"] in ["0", "3"]:
+                    self.assertGreater(len(workbench_utils.preprocessed_values), 0)
+        preprocess_field_data.assert_not_called()
+        self.assertEqual(
+            [(row["field_a"], row["field_b"]) for row in preprocessed],
+            [("A" if i % 2 else "B", f"B{i}") for i in range(7)],
+        )
+        self.assertEqual(len(workbench_utils.preprocessed_values), 0)
+
+
+class TestHookExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_entity_runs(self):
+        calls = []
+
+        def run_script(command, config_path, http_response_code, entity_json, filename):
+            calls.append(entity_json)
+            return "", 0 if http_response_code == 201 else 1
+
+        hook_executor = workbench_hooks.HookExecutor(
+            "script.py", "Post node create script", run_script, workers=3
+        )
+        for i in range(10):
+            hook_executor.submit(
+                "config.yml", 201 if i != 4 else 500, f'{{"nid": {i}}}'
+            )
+        hook_executor.close()
+        self.assertEqual(len(calls), 10)
+        self.assertEqual(hook_executor.runs, 10)
+        self.assertEqual(len(hook_executor.failures), 1)
+        self.assertEqual(hook_executor.failures[0]["return_code"], 1)
+
+    def test_batched_runs(self):
+        output_path = os.path.join(self.temp_dir, "entities.jsonl")
+        script_path = os.path.join(self.temp_dir, "hook.py")
+        with open(script_path, "w") as script:
+            script.write(
+                "import sys, json\n"
+                + "assert sys.argv[2] == '--jsonl'\n"
+                + "lines = sys.stdin.readlines()\n"
+                + f"open({output_path!r}, 'a').writelines(lines)\n"
+                + "sys.exit(0 if all(json.loads(l)['http_response_code'] == '201' for l in lines) else 3)\n"
+            )
+
+        def run_script(*args):
+            raise AssertionError("Batched executors don't run the script per entity.")
+
+        hook_executor = workbench_hooks.HookExecutor(
+            sys.executable + " " + script_path,
+            "Post node create script",
+            run_script,
+            workers=1,
+            batch_size=4,
+        )
+        for i in range(10):
+            hook_executor.submit("config.yml", 201, json.dumps({"nid": [{"value": i}]}))
+        hook_executor.submit("config.yml", 500, "{}")
+        hook_executor.close()
+
+        with open(output_path) as output:
+            entities = [json.loads(line) for line in output]
+        self.assertEqual(len(entities), 11)
+        self.assertEqual(json.loads(entities[0]["entity"]), {"nid": [{"value": 0}]})
+        self.assertEqual(hook_executor.entities, 11)
+        self.assertLess(hook_executor.runs, 11)
+        self.assertEqual(len(hook_executor.failures), 1)
+        self.assertEqual(hook_executor.failures[0]["return_code"], 3)
+
+
+class TestCsvRowSelection(unittest.TestCase):
+
+    def test_compile_csv_row_filters(self):
+        config = {
+            "subdelimiter": "|",
+            "csv_row_filters": [
+                "field_model:isnot:Digital document",
+                "field_edtf_date:is:2020-01-01",
+                "field_edtf_date:is:2000",
+            ],
+        }
+        csv_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "assets",
+            "csv_row_filters_test",
+            "csv_row_filters_test.csv",
+        )
+        row_passes_filters = workbench_utils.compile_csv_row_filters(config)
+        with open(csv_path) as csv_file:
+            ids = [
+                row["id"] for row in csv.DictReader(csv_file) if row_passes_filters(row)
+            ]
+        self.assertEqual(ids, ["issue_812_001", "issue_812_003"])
+
+        config["csv_row_filters"] = ["field_model:isnot:''"]
+        row_passes_filters = workbench_utils.compile_csv_row_filters(config)
+        self.assertFalse(row_passes_filters({"field_model": ""}))
+        self.assertTrue(row_passes_filters({"field_model": "|Image"}))
+        self.assertTrue(row_passes_filters({"title": "No field_model column"}))
+
+        self.assertIsNone(
+            workbench_utils.compile_csv_row_filters({"csv_row_filters": []})
+        )
+
+    def test_get_csv_rows_to_process(self):
+        config = {"task": "create", "csv_rows_to_process": [1, "002"]}
+        self.assertEqual(workbench_utils.get_csv_rows_to_process(config), {"1", "002"})
+        config["task"] = "delete"
+        self.assertIsNone(workbench_utils.get_csv_rows_to_process(config))
+
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as ids_file:
+            ids_file.write("001\n\n003\n")
+        config = {"task": "update", "csv_rows_to_process": ids_file.name}
+        self.assertEqual(
+            workbench_utils.get_csv_rows_to_process(config), {"001", "003"}
+        )
+        os.remove(ids_file.name)
+
+
+class TestUrlAliasCache(unittest.TestCase):
+
+    def setUp(self):
+        workbench_utils.url_alias_cache.clear()
+        self.config = {
+            "host": "https://islandora.dev",
+            "url_alias_cache_warm_up_threads": 4,
+        }
+        self.requested_urls = []
+
+    def tearDown(self):
+        workbench_utils.url_alias_cache.clear()
+
+    def issue_request(self, config, method, url, *args, **kwargs):
+        self.requested_urls.append(url)
+        response = mock.Mock()
+        if "missing" in url:
+            response.status_code = 404
+        elif "unavailable" in url:
+            response.status_code = 503
+        else:
+            response.status_code = 200
+            path = url.split("?")[0]
+            entity_id = int(path.rsplit("/", 1)[-1]) if path[-1].isdigit() else 10
+            response.text = json.dumps(
+                {key: [{"value": entity_id}] for key in ["nid", "mid", "tid"]}
+            )
+        return response
+
+    def test_each_url_is_queried_once(self):
+        with mock.patch.object(
+            workbench_utils, "issue_request", side_effect=self.issue_request
+        ):
+            for i in range(3):
+                self.assertEqual(
+                    workbench_utils.get_nid_from_url_alias(self.config, "/an_alias"), 10
+                )
+                self.assertEqual(
+                    workbench_utils.get_nid_from_url_alias(
+                        self.config, "https://islandora.dev/an_alias"
+                    ),
+                    10,
+                )
+                self.assertFalse(
+                    workbench_utils.get_nid_from_url_alias(self.config, "/missing")
+                )
+                self.assertEqual(
+                    workbench_utils.get_mid_from_media_url_alias(
+                        self.config, "http://islandora.dev/media/5"
+                    ),
+                    5,
+                )
+                self.assertEqual(
+                    workbench_utils.get_tid_from_term_url_alias(
+                        self.config, "https://islandora.dev/taxonomy/term/7"
+                    ),
+                    7,
+                )
+            self.assertEqual(len(self.requested_urls), 4)
+
+            # Failures other than 403 and 404 are retried.
+            for i in range(2):
+                self.assertFalse(
+                    workbench_utils.get_nid_from_url_alias(self.config, "/unavailable")
+                )
+            self.assertEqual(len(self.requested_urls), 6)
+
+    def test_created_alias_replaces_not_found(self):
+        response = mock.Mock(status_code=201)
+        with mock.patch.object(
+            workbench_utils, "issue_request", side_effect=self.issue_request
+        ):
+            self.assertFalse(
+                workbench_utils.get_nid_from_url_alias(self.config, "/missing")
+            )
+        with mock.patch.object(workbench_utils, "issue_request", return_value=response):
+            workbench_utils.create_url_alias(self.config, "25", "/missing")
+        with mock.patch.object(
+            workbench_utils, "issue_request", side_effect=self.issue_request
+        ):
+            self.assertEqual(
+                workbench_utils.get_nid_from_url_alias(self.config, "/missing"), 25
+            )
+        self.assertEqual(len(self.requested_urls), 1)
+
+    def test_warm_url_alias_cache(self):
+        url_aliases = [f"/alias/{i % 50}" for i in range(200)] + ["12", " "]
+        with mock.patch.object(
+            workbench_utils, "issue_request", side_effect=self.issue_request
+        ):
+            workbench_utils.warm_url_alias_cache(self.config, "node", url_aliases)
+            self.assertEqual(len(self.requested_urls), 50)
+            self.assertEqual(
+                workbench_utils.get_nid_from_url_alias(self.config, "/alias/49"), 49
+            )
+        self.assertEqual(len(self.requested_urls), 50)
+
+
+class TestPreprocessedCsvReuse(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            "task": "delete",
+            "id_field": "id",
+            "input_dir": self.temp_dir,
+            "input_csv": "input.csv",
+            "temp_dir": self.temp_dir,
+            "delimiter": ",",
+            "subdelimiter": "|",
+            "csv_headers": "names",
+            "ignore_csv_columns": [],
+            "csv_start_row": 0,
+            "csv_stop_row": None,
+            "clean_csv_values_skip": [],
+            "warm_url_alias_cache": False,
+            "csv_row_index": False,
+        }
+        self.write_input_csv(["1", "2", "# 3", "4"])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        workbench_utils.preprocessed_csv_files.clear()
+
+    def write_input_csv(self, node_ids):
+        with open(os.path.join(self.temp_dir, "input.csv"), "w") as csv_file:
+            csv_file.write("node_id\n" + "\n".join(node_ids) + "\n")
+
+    def get_node_ids(self):
+        return [row["node_id"] for row in workbench_utils.get_csv_data(self.config)]
+
+    def test_preprocessed_csv_is_reused(self):
+        self.assertEqual(self.get_node_ids(), ["1", "2", "4"])
+        self.assertEqual(workbench_utils.get_csv_row_count(self.config), 3)
+
+        with mock.patch.object(workbench_utils, "clean_csv_values") as clean:
+            self.assertEqual(self.get_node_ids(), ["1", "2", "4"])
+            self.assertEqual(workbench_utils.get_csv_row_count(self.config), 3)
+        clean.assert_not_called()
+
+    def test_preprocessed_csv_is_rewritten_after_changes(self):
+        self.assertEqual(self.get_node_ids(), ["1", "2", "4"])
+
+        self.config["csv_start_row"] = 2
+        self.assertEqual(self.get_node_ids(), ["2", "4"])
+
+        self.write_input_csv(["5", "6", "7", "8", "9"])
+        self.assertEqual(self.get_node_ids(), ["6", "7", "8", "9"])
+        self.assertEqual(workbench_utils.get_csv_row_count(self.config), 4)
+
+
+class TestCsvRowIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_csv_path = os.path.join(self.temp_dir, "input.csv")
+        with open(self.input_csv_path, "w", encoding="utf-8-sig", newline="") as f:
+            f.write("node_id,field_description\r\n")
+            for i in range(1, 21):
+                if i % 5 == 0:
+                    f.write("\r\n")
+                f.write(f'{i},"Row {i}\nhas a ""quoted"" newline, and ü"\r\n')
+        self.config = {
+            "task": "update",
+            "id_field": "node_id",
+            "input_dir": self.temp_dir,
+            "input_csv": "input.csv",
+            "temp_dir": self.temp_dir,
+            "delimiter": ",",
+            "subdelimiter": "|",
+            "csv_headers": "names",
+            "ignore_csv_columns": [],
+            "csv_start_row": 0,
+            "csv_stop_row": None,
+            "clean_csv_values_skip": ["inside_spaces"],
+            "warm_url_alias_cache": False,
+            "csv_row_index": True,
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        workbench_utils.preprocessed_csv_files.clear()
+
+    def test_csv_row_offsets(self):
+        self.assertEqual(
+            workbench_utils.get_input_csv_row_count(self.config, self.input_csv_path),
+            20,
+        )
+        for row_index in [0, 4, 19]:
+            offset = workbench_utils.get_csv_row_offset(
+                self.config, self.input_csv_path, row_index
+            )
+            with open(self.input_csv_path, "rb") as f:
+                f.seek(offset)
+                row = next(
+                    csv.reader(io.TextIOWrapper(f, encoding="utf-8", newline=""))
+                )
+            self.assertEqual(row[0], str(row_index + 1))
+        self.assertIsNone(
+            workbench_utils.get_csv_row_offset(self.config, self.input_csv_path, 21)
+        )
+
+        # The index is rewritten when the CSV file changes.
+        with open(self.input_csv_path, "a", encoding="utf-8", newline="") as f:
+            f.write("21,Another row\r\n")
+        self.assertEqual(
+            workbench_utils.get_input_csv_row_count(self.config, self.input_csv_path),
+            21,
+        )
+
+    def test_get_csv_data_seeks_to_csv_start_row(self):
+        for start_row, stop_row in [(2, None), (7, 12), (15, 10), (20, None)]:
+            self.config["csv_start_row"] = start_row
+            self.config["csv_stop_row"] = stop_row
+            self.config["csv_row_index"] = False
+            expected = list(workbench_utils.get_csv_data(self.config))
+            self.config["csv_row_index"] = True
+            self.assertEqual(list(workbench_utils.get_csv_data(self.config)), expected)
+
+    def test_get_csv_shard_ranges(self):
+        self.assertEqual(
+            workbench_utils.get_csv_shard_ranges(self.config, 3),
+            [(1, 6), (7, 13), (14, 20)],
+        )
+        self.assertEqual(len(workbench_utils.get_csv_shard_ranges(self.config, 50)), 20)
+
+
+class TestCreateTermsLevels(unittest.TestCase):
+
+    def test_get_term_creation_levels(self):
+        rows = [
+            {"term_name": "Grandchild", "parent": "child"},
+            {"term_name": "Child", "parent": "Parent"},
+            {"term_name": "Parent", "parent": ""},
+            {"term_name": "Orphan", "parent": "Not in the CSV"},
+            {"term_name": "parent ", "parent": ""},
+            {"term_name": "Loop 1", "parent": "Loop 2"},
+            {"term_name": "Loop 2", "parent": "Loop 1"},
+            {"term_name": "Below loop", "parent": "Loop 2"},
+        ]
+        levels = workbench_utils.get_term_creation_levels({}, rows)
+        self.assertEqual(
+            [[row["term_name"] for row in level] for level in levels],
+            [
+                ["Parent", "Orphan"],
+                ["Child"],
+                ["Grandchild"],
+                ["parent "],
+                ["Loop 1"],
+                ["Loop 2"],
+                ["Below loop"],
+            ],
+        )
+
+    def test_find_term_in_prefetched_vocabulary(self):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {
+            "data": [
+                {"attributes": {"drupal_internal__tid": 3, "name": "Cats"}},
+                {"attributes": {"drupal_internal__tid": 4, "name": "Dogs"}},
+            ],
+            "links": {},
+        }
+        config = {"host": "https://islandora.dev", "term_cache_size": 100}
+        try:
+            with mock.patch.object(
+                workbench_utils, "issue_request", return_value=response
+            ) as issue_request:
+                workbench_utils.prefetch_vocabulary_terms(config, "animals")
+                self.assertEqual(
+                    workbench_utils.find_term_in_vocab(config, "animals", " cats"), 3
+                )
+                self.assertFalse(
+                    workbench_utils.find_term_in_vocab(config, "animals", "Birds")
+                )
+            self.assertEqual(issue_request.call_count, 1)
+        finally:
+            workbench_utils.term_ids_by_name.clear()
+            workbench_utils.prefetched_vocabularies.clear()
+            workbench_utils.term_data_cache.clear()
+
+
+class TestBulkCreateTerms(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {
+            "subdelimiter": "|",
+            "columns_with_term_names": [],
+            "protected_vocabularies": ["genre"],
+            "bulk_create_terms_threads": 4,
+        }
+        self.field_definitions = {
+            "field_subject": {
+                "field_type": "entity_reference",
+                "target_type": "taxonomy_term",
+                "vocabularies": ["subject"],
+            },
+            "field_linked_agent": {
+                "field_type": "typed_relation",
+                "target_type": "taxonomy_term",
+                "vocabularies": ["person", "corporate_body"],
+            },
+            "field_genre": {
+                "field_type": "entity_reference",
+                "target_type": "taxonomy_term",
+                "vocabularies": ["genre"],
+            },
+            "field_member_of": {
+                "field_type": "entity_reference",
+                "target_type": "node",
+            },
+        }
+        self.created_terms = []
+
+    def tearDown(self):
+        workbench_utils.term_ids_by_name.clear()
+
+    def create_term(self, config, vocab_id, term_name, term_csv_row=None):
+        self.created_terms.append((vocab_id, term_name))
+        if term_name == "Existing":
+            return 1
+        tid = 100 + len(self.created_terms)
+        workbench_utils.term_ids_by_name[(vocab_id, term_name.lower().strip())] = tid
+        return tid
+
+    def test_bulk_create_terms(self):
+        csv_data = csv.DictReader(
+            io.StringIO(
+                "id,field_subject,field_linked_agent,field_genre,field_member_of\n"
+                + "1,Cats|subject:Dogs|5,relators:aut:person:Smith|relators:pbl:10,Poetry,Not a term\n"
+                + "2, cats |Existing|http://example.com/term,relators:aut:Jones,,\n"
+            )
+        )
+        with mock.patch.object(
+            workbench_utils, "get_csv_data", return_value=csv_data
+        ), mock.patch.object(
+            workbench_utils, "create_term", side_effect=self.create_term
+        ):
+            workbench_utils.bulk_create_terms(self.config, self.field_definitions)
+        self.assertEqual(
+            sorted(self.created_terms),
+            [
+                ("person", "Smith"),
+                ("subject", "Cats"),
+                ("subject", "Dogs"),
+                ("subject", "Existing"),
+            ],
+        )
+        self.assertEqual(workbench_utils.term_ids_by_name[("subject", "existing")], 1)
+
+
+class TestLookupCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            "host": "https://islandora.dev",
+            "lookup_cache_db_path": os.path.join(self.temp_dir, "lookups.db"),
+            "lookup_cache_ttl_term_names": 86400,
+            "lookup_cache_ttl_term_uris": 0,
+            "lookup_cache_ttl_url_aliases": 3600,
+        }
+        workbench_utils.lookup_cache = None
+        workbench_utils.url_alias_cache.clear()
+        self.requested_urls = []
+
+    def tearDown(self):
+        workbench_utils.lookup_cache = None
+        workbench_utils.url_alias_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def issue_request(self, config, method, url, *args, **kwargs):
+        self.requested_urls.append(url)
+        response = mock.Mock()
+        response.status_code = 200
+        response.text = json.dumps({"nid": [{"value": 10}]})
+        return response
+
+    def test_entries_expire_and_are_scoped_by_host(self):
+        cache = workbench_lookup_cache.LookupCache(
+            self.config["lookup_cache_db_path"],
+            "https://islandora.dev/",
+            {"term_names": 86400, "term_uris": 0, "url_aliases": 1},
+        )
+        cache.set("term_names", "genre:cats", 5)
+        cache.set("term_uris", "http://example.com/cats", 5)
+        self.assertEqual(cache.get("term_names", "genre:cats"), 5)
+        self.assertIsNone(cache.get("term_uris", "http://example.com/cats"))
+
+        other_host_cache = workbench_lookup_cache.LookupCache(
+            self.config["lookup_cache_db_path"],
+            "https://other.islandora.dev",
+            {"term_names": 86400},
+        )
+        self.assertIsNone(other_host_cache.get("term_names", "genre:cats"))
+
+        now = time.time()
+        with mock.patch.object(workbench_lookup_cache.time, "time") as mock_time:
+            mock_time.return_value = now
+            cache.set("url_aliases", "node /an_alias", 10)
+            self.assertEqual(cache.get("url_aliases", "node /an_alias"), 10)
+            mock_time.return_value = now + 2
+            self.assertIsNone(cache.get("url_aliases", "node /an_alias"))
+
+        other_host_cache.set("term_names", "genre:dogs", 6)
+        self.assertEqual(cache.clear("term_names"), 1)
+        self.assertIsNone(cache.get("term_names", "genre:cats"))
+        self.assertEqual(other_host_cache.get("term_names", "genre:dogs"), 6)
+
+    def test_url_aliases_are_kept_between_tasks(self):
+        with mock.patch.object(
+            workbench_utils, "issue_request", side_effect=self.issue_request
+        ):
+            self.assertEqual(
+                workbench_utils.get_nid_from_url_alias(self.config, "/an_alias"), 10
+            )
+            # A later task, with an empty in-memory cache.
+            workbench_utils.url_alias_cache.clear()
+            workbench_utils.lookup_cache = None
+            self.assertEqual(
+                workbench_utils.get_nid_from_url_alias(self.config, "/an_alias"), 10
+            )
+            self.assertEqual(len(self.requested_urls), 1)
+
+            workbench_utils.forget_deleted_entity(self.config, "node", "10")
+            self.assertEqual(
+                workbench_utils.get_nid_from_url_alias(self.config, "/an_alias"), 10
+            )
+            self.assertEqual(len(self.requested_urls), 2)
+
+    def test_forget_deleted_entity_only_forgets_its_entity_type(self):
+        workbench_utils.cache_lookup(self.config, "url_aliases", "node /a_node", 5)
+        workbench_utils.cache_lookup(self.config, "url_aliases", "media /a_media", 5)
+        workbench_utils.forget_deleted_entity(self.config, "node", 5)
+        self.assertIsNone(
+            workbench_utils.get_cached_lookup(
+                self.config, "url_aliases", "node /a_node"
+            )
+        )
+        self.assertEqual(
+            workbench_utils.get_cached_lookup(
+                self.config, "url_aliases", "media /a_media"
+            ),
+            5,
+        )
+
+    def test_clear_lookup_cache(self):
+        workbench_utils.cache_lookup(self.config, "term_names", "genre:cats", 5)
+        workbench_utils.cache_lookup(self.config, "url_aliases", "node /an_alias", 10)
+        args = argparse.Namespace(clear_lookup_cache="term_names")
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(SystemExit):
+            workbench_utils.clear_lookup_cache(self.config, args)
+        self.assertIsNone(
+            workbench_utils.get_cached_lookup(self.config, "term_names", "genre:cats")
+        )
+        self.assertEqual(
+            workbench_utils.get_cached_lookup(
+                self.config, "url_aliases", "node /an_alias"
+            ),
+            10,
+        )
+
+
+class TestHttpCachePolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = mock.Mock()
+        self.policy = workbench_http_cache.HttpCachePolicy(
+            self.cache,
+            "https://islandora.dev/",
+            expire_after=60,
+            max_entries=3,
+            max_bytes=1000,
+            eviction_interval=60,
+            eviction_requests=10,
+        )
+
+    def get_response(self, url):
+        response = mock.Mock()
+        response.request.url = url
+        return response
+
+    def test_is_cacheable(self):
+        for url in [
+            "https://islandora.dev/term_from_uri?_format=json&uri=http://example.com",
+            "https://islandora.dev/entity/field_storage_config/node.field_model?_format=json",
+            "https://islandora.dev/taxonomy/term/5?_format=json",
+            "https://islandora.dev/node/5?_format=json",
+            "https://islandora.dev/an_alias?_format=json",
+        ]:
+            self.assertTrue(self.policy.is_cacheable(self.get_response(url)), url)
+        for url in [
+            "https://islandora.dev/node/5/media?_format=json",
+            "https://example.com/files/image.jpg",
+        ]:
+            self.assertFalse(self.policy.is_cacheable(self.get_response(url)), url)
+
+    def test_evicts_least_recently_used_responses(self):
+        for key in ["a", "b", "c"]:
+            self.policy.record(key, 100, False, "https://islandora.dev/term_from_uri")
+        self.policy.record("a", 100, True, "https://islandora.dev/term_from_uri")
+        # Not due yet.
+        self.assertEqual(self.policy.evict(), 0)
+
+        self.policy.record("d", 100, False, "https://islandora.dev/term_from_uri")
+        self.assertEqual(self.policy.evict(), 1)
+        self.cache.delete.assert_called_once_with("b")
+        self.assertEqual(list(self.policy.entries), ["c", "a", "d"])
+
+        self.policy.record("e", 900, False, "https://islandora.dev/term_from_uri")
+        self.assertEqual(self.policy.evict(), 2)
+        self.assertEqual(list(self.policy.entries), ["d", "e"])
+        self.assertEqual(self.policy.bytes, 1000)
+
+    def test_invalidate(self):
+        self.policy.record("a", 100, False, "https://islandora.dev/node/5?_format=json")
+        self.policy.record("b", 100, False, "https://islandora.dev/media/6/edit")
+        self.policy.record("c", 100, False, "https://islandora.dev/taxonomy/term/7")
+        self.policy.invalidate("https://islandora.dev/node/55?_format=json")
+        self.cache.delete.assert_not_called()
+        self.policy.invalidate("https://islandora.dev/media/6?_format=json")
+        self.policy.invalidate("https://islandora.dev/taxonomy/term/7?_format=json")
+        self.assertEqual(
+            self.cache.delete.call_args_list, [mock.call("b"), mock.call("c")]
+        )
+        self.assertEqual(list(self.policy.entries), ["a"])
+        self.assertEqual(self.policy.keys_by_entity, {"/node/5": {"a"}})
+
+    def test_evicts_expired_responses_when_due(self):
+        now = time.monotonic()
+        with mock.patch.object(workbench_http_cache.time, "monotonic") as monotonic:
+            monotonic.return_value = now
+            self.policy.record("a", 100, False, "https://islandora.dev/term_from_uri")
+            monotonic.return_value = now + 30
+            self.policy.record("b", 100, False, "https://islandora.dev/term_from_uri")
+            self.assertEqual(self.policy.evict(), 0)
+
+            monotonic.return_value = now + 61
+            self.assertEqual(self.policy.evict(), 1)
+            self.cache.delete.assert_called_once_with("a")
+            self.assertEqual(self.policy.evict(), 0)
+
+            for i in range(10):
+                self.policy.record(
+                    "b", 100, True, "https://islandora.dev/term_from_uri"
+                )
+            self.assertEqual(self.policy.evict(), 0)
+            self.assertEqual(list(self.policy.entries), ["b"])
+            self.assertEqual(self.policy.requests, 0)
+
+
+class TestCompileCreatePlan(unittest.TestCase):
+
+    def test_compile_create_plan(self):
+        config = {
+            "content_type": "islandora_object",
+            "id_field": "id",
+            "additional_files": [{"transcript": 5}],
+            "preprocessors": [
+                {"field_description": "/tmp/first.py"},
+                {"field_description": "python /tmp/second.py"},
+            ],
+        }
+        field_definitions = {
+            "title": {"field_type": "string"},
+            "field_description": {"field_type": "text_long"},
+            "field_subject": {"field_type": "entity_reference"},
+        }
+        csv_column_headers = [
+            "id",
+            "file",
+            "title",
+            "field_subject",
+            "transcript",
+            "url_alias",
+            "field_description",
+            "media:video:field_track",
+            "field_typo",
+        ]
+        with mock.patch.object(
+            workbench_utils, "get_entity_fields", return_value=["title"]
+        ), contextlib.redirect_stdout(io.StringIO()):
+            create_plan = workbench_utils.compile_create_plan(
+                config, field_definitions, csv_column_headers
+            )
+
+        self.assertEqual(
+            [column["field"] for column in create_plan],
+            [
+                "field_subject",
+                "transcript",
+                "url_alias",
+                "field_description",
+                "media:video:field_track",
+                "field_typo",
+            ],
+        )
+        columns = {column["field"]: column for column in create_plan}
+        self.assertEqual(
+            [field for field, column in columns.items() if column["skip"] is False],
+            ["field_subject", "field_description"],
+        )
+        self.assertIsInstance(
+            columns["field_subject"]["handler"], workbench_fields.EntityReferenceField
+        )
+        self.assertIsInstance(
+            columns["field_description"]["handler"], workbench_fields.SimpleField
+        )
+        self.assertIsNone(columns["url_alias"]["handler"])
+        self.assertEqual(
+            columns["field_description"]["preprocessors"],
+            ["/tmp/first.py", "python /tmp/second.py"],
+        )
+        self.assertEqual(columns["transcript"]["additional_file_media_use_tid"], 5)
+        self.assertIsNone(columns["field_subject"]["additional_file_media_use_tid"])
+
+    def test_get_additional_files_columns(self):
+        config = {
+            "content_type": "islandora_object",
+            "id_field": "id",
+            "additional_files": [
+                {"thumbnail": "http://pcdm.org/use#ThumbnailImage"},
+                {"not_in_csv": 7},
+                {"transcript": 5},
+            ],
+        }
+        field_definitions = {"field_description": {"field_type": "text_long"}}
+        csv_column_headers = [
+            "id",
+            "file",
+            "title",
+            "transcript",
+            "field_description",
+            "thumbnail",
+        ]
+        with mock.patch.object(
+            workbench_utils, "get_entity_fields", return_value=["title"]
+        ):
+            create_plan = workbench_utils.compile_create_plan(
+                config, field_definitions, csv_column_headers
+            )
+
+        # create() creates a media for each of these columns, using their media use terms.
+        additional_files_columns = workbench_utils.get_additional_files_columns(
+            create_plan
+        )
+        self.assertEqual(
+            [
+                (column["field"], column["additional_file_media_use_tid"])
+                for column in additional_files_columns
+            ],
+            [("transcript", 5), ("thumbnail", "http://pcdm.org/use#ThumbnailImage")],
+        )
+        self.assertTrue(all(column["skip"] for column in additional_files_columns))
+
+
+class TestCsvRow(unittest.TestCase):
+
+    def test_copies_are_independent(self):
+        base = {"id": "1", "title": "A title", "field_member_of": "", "url_alias": ""}
+        row = workbench_csv_row.CsvRow(base)
+        row["field_member_of"] = "10"
+        row["field_weight"] = 2
+        row_for_media = row.copy()
+        row_as_parent = copy.deepcopy(row)
+
+        row["title"] = "Another title"
+        del row["url_alias"]
+        del row_for_media["field_weight"]
+
+        self.assertEqual(
+            dict(row),
+            {
+                "id": "1",
+                "title": "Another title",
+                "field_member_of": "10",
+                "field_weight": 2,
+            },
+        )
+        self.assertEqual(list(row_for_media), list(base))
+        self.assertEqual(row_for_media["field_member_of"], "10")
+        self.assertEqual(len(row_as_parent), 5)
+        self.assertEqual(row_as_parent["title"], "A title")
+        self.assertNotIn("url_alias", row)
+        with self.assertRaises(KeyError):
+            row["url_alias"]
+        row["url_alias"] = "/an_alias"
+        self.assertEqual(
+            list(row), ["id", "title", "field_member_of", "url_alias", "field_weight"]
+        )
+        # The values read from the CSV file are never changed.
+        self.assertEqual(base["title"], "A title")
+        self.assertEqual(base["url_alias"], "")
+
+    def test_copy_of(self):
+        csv_row = {"id": "1", "title": "A title"}
+        row = workbench_csv_row.CsvRow.copy_of(csv_row)
+        row["title"] = "Another title"
+        self.assertEqual(csv_row["title"], "A title")
+        self.assertEqual(
+            workbench_csv_row.CsvRow.copy_of(row),
+            {"id": "1", "title": "Another title"},
+        )
+
+
 def mocked_requests_get(*args, **kwargs):
     # To handle both requests.get(url) and requests.sessions.Session.get(self, url)
     if "url" in kwargs:
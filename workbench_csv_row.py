@@ -0,0 +1,83 @@
+"""A CSV row that can be copied without copying its values, used by the "create" task and
+create_child_from_file() in workbench_utils.
+
+Workbench changes rows as it processes them (e.g. replacing parent IDs with node IDs), so it
+used to pass copy.deepcopy()s of each row to create_media(), write_to_output_csv(), and
+create_children_from_directory(). A CsvRow instead keeps the row as read from the CSV file,
+which it never changes, and records changes in a small dict of overrides, so a copy only
+copies the overrides. Values are expected to be strings or numbers, as they are in rows read
+from CSV files; a deepcopy() of a CsvRow also copies its overridden values.
+"""
+
+import copy
+import collections.abc
+
+
+class CsvRow(collections.abc.MutableMapping):
+    __slots__ = ("base", "overrides", "deleted")
+
+    def __init__(self, base, overrides=None, deleted=None):
+        """
+        Parameters
+        ----------
+        base : dict
+            The row as read from the CSV file. It must not be changed after the CsvRow is
+            created; use copy_of() to make a CsvRow from a dict that may be.
+        """
+        self.base = base
+        self.overrides = overrides if overrides is not None else dict()
+        self.deleted = deleted if deleted is not None else set()
+
+    @classmethod
+    def copy_of(cls, row):
+        """Copy a CsvRow or a dict, e.g. a row from a csv.DictReader, as a CsvRow."""
+        if isinstance(row, cls):
+            return row.copy()
+        return cls(dict(row))
+
+    def __getitem__(self, key):
+        if key in self.overrides:
+            return self.overrides[key]
+        if key in self.deleted:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __setitem__(self, key, value):
+        self.overrides[key] = value
+        self.deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.overrides.pop(key, None)
+        if key in self.base:
+            self.deleted.add(key)
+
+    def __contains__(self, key):
+        return key in self.overrides or (key in self.base and key not in self.deleted)
+
+    def __iter__(self):
+        for key in self.base:
+            if key not in self.deleted:
+                yield key
+        for key in self.overrides:
+            if key not in self.base:
+                yield key
+
+    def __len__(self):
+        return (
+            len(self.base)
+            - len(self.deleted)
+            + sum(1 for key in self.overrides if key not in self.base)
+        )
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def copy(self):
+        return CsvRow(self.base, dict(self.overrides), set(self.deleted))
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return CsvRow(self.base, copy.deepcopy(self.overrides, memo), set(self.deleted))
@@ -1,14 +1,153 @@
 import os
 import sys
 import json
+import time
 import logging
+import contextlib
+import queue
 import datetime
+import threading
 import collections
-import requests_cache
+import concurrent.futures
 from workbench_utils import *
 from progress_bar import InitBar
 
 
+class ParquetExportWriter:
+    """Writes exported rows to a Parquet file, as an alternative to csv.DictWriter.
+
+    Rows are buffered and written as row groups of "export_parquet_row_group_size" rows.
+    Multivalued fields become list columns, and integer, decimal, boolean, and date fields
+    (plus node_id, uid, created, and changed) are typed. Values that can't be converted
+    to a column's type are written as nulls and logged.
+    """
+
+    timestamp_columns = ["created", "changed"]
+    integer_columns = ["node_id", "uid"]
+
+    def __init__(self, config, output_path, field_names, field_definitions):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            message = 'The "pyarrow" library is required for "export_output_format: parquet". Install it with "pip install pyarrow".'
+            logging.error(message)
+            sys.exit("Error: " + message)
+
+        self.pa = pyarrow
+        self.config = config
+        self.field_names = field_names
+        self.field_definitions = field_definitions
+        self.row_group_size = int(config["export_parquet_row_group_size"])
+        self.converters = dict()
+        fields = [self.get_column(field_name) for field_name in field_names]
+        self.schema = pyarrow.schema(fields)
+        self.columns = {field_name: [] for field_name in field_names}
+        self.num_buffered_rows = 0
+        self.parquet_writer = pyarrow.parquet.ParquetWriter(
+            output_path, self.schema, compression="zstd"
+        )
+
+    def get_column(self, field_name):
+        """Get the Arrow field for a column and register the function used to convert its CSV values."""
+        pa = self.pa
+        metadata = dict()
+        if field_name in self.integer_columns:
+            value_type, converter = pa.int64(), int
+        elif field_name in self.timestamp_columns:
+            value_type, converter = pa.timestamp("s", tz="UTC"), self.to_timestamp
+        elif field_name in self.field_definitions:
+            field_type = self.field_definitions[field_name].get("field_type")
+            metadata = {
+                "label": str(self.field_definitions[field_name].get("label", "")),
+                "cardinality": str(
+                    self.field_definitions[field_name].get("cardinality", "")
+                ),
+            }
+            if field_type == "integer":
+                value_type, converter = pa.int64(), int
+            elif field_type in ["decimal", "float"]:
+                value_type, converter = pa.float64(), float
+            elif field_type == "boolean":
+                value_type, converter = pa.bool_(), self.to_boolean
+            elif field_type == "datetime":
+                value_type, converter = pa.timestamp("s"), self.to_datetime
+            else:
+                value_type, converter = pa.string(), str
+            if self.field_definitions[field_name].get("cardinality", 1) != 1:
+                self.converters[field_name] = (True, converter)
+                return pa.field(field_name, pa.list_(value_type), metadata=metadata)
+        else:
+            value_type, converter = pa.string(), str
+
+        self.converters[field_name] = (False, converter)
+        return pa.field(field_name, value_type, metadata=metadata or None)
+
+    @staticmethod
+    def to_timestamp(value):
+        return datetime.datetime.fromisoformat(str(value)).astimezone(
+            datetime.timezone.utc
+        )
+
+    @staticmethod
+    def to_datetime(value):
+        value = datetime.datetime.fromisoformat(str(value))
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def to_boolean(value):
+        if str(value).strip().lower() in ["1", "true", "on"]:
+            return True
+        if str(value).strip().lower() in ["0", "false", "off"]:
+            return False
+        raise ValueError(f'"{value}" is not a boolean value')
+
+    def convert_value(self, field_name, value):
+        """Convert a CSV cell to the value stored in its column."""
+        is_list, converter = self.converters[field_name]
+        if value is None or value == "":
+            return None
+        if is_list:
+            subvalues = str(value).split(self.config["subdelimiter"])
+            return [self.convert_subvalue(field_name, converter, v) for v in subvalues]
+        return self.convert_subvalue(field_name, converter, value)
+
+    def convert_subvalue(self, field_name, converter, value):
+        try:
+            return converter(value)
+        except (ValueError, TypeError):
+            logging.warning(
+                'Value "%s" in column "%s" could not be converted to the column\'s type; writing a null instead.',
+                value,
+                field_name,
+            )
+            return None
+
+    def writerow(self, row):
+        for field_name in self.field_names:
+            self.columns[field_name].append(
+                self.convert_value(field_name, row.get(field_name))
+            )
+        self.num_buffered_rows += 1
+        if self.num_buffered_rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as a row group."""
+        if self.num_buffered_rows == 0:
+            return
+        table = self.pa.table(self.columns, schema=self.schema)
+        self.parquet_writer.write_table(table)
+        self.columns = {field_name: [] for field_name in self.field_names}
+        self.num_buffered_rows = 0
+
+    def close(self):
+        self.flush()
+        self.parquet_writer.close()
+
+
 class WorkbenchExportBase:
     def __init__(self, config, args=None):
         self.config = config
@@ -25,6 +164,27 @@ class WorkbenchExportBase:
         ]
         self.seen_nids = set()
         self.pbar = InitBar() if config.get("progress_bar") else None
+        if config["export_csv_term_mode"] == "name":
+            for vocab_id in config["term_cache_prefetch_vocabularies"]:
+                prefetch_vocabulary_terms(config, vocab_id)
+
+        # Files are downloaded on a separate pool of threads; see process_file_data().
+        self.download_executor = None
+        self.download_slots = None
+        if int(config["export_file_download_threads"]) > 1:
+            self.download_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=int(config["export_file_download_threads"])
+            )
+            # Limits the downloads queued or running at any time, so the queue doesn't
+            # grow with the number of nodes exported.
+            self.download_slots = threading.BoundedSemaphore(
+                2 * int(config["export_file_download_threads"])
+            )
+        self.download_stats = {"files": 0, "bytes": 0, "skipped": 0, "failed": 0}
+        # The exported file path values of the downloads that failed.
+        self.failed_downloads = []
+        self.download_stats_lock = threading.Lock()
+        self.download_start_time = None
 
     @staticmethod
     def deduplicate_list(input_list):
@@ -42,6 +202,23 @@ class WorkbenchExportBase:
 
         return writer
 
+    @contextlib.contextmanager
+    def open_output_writer(self, output_path, field_names, export_mode=False):
+        """Open the export's output file and yield a writer with a writerow() method,
+        either a CSV writer or, if "export_output_format" is "parquet", a ParquetExportWriter.
+        """
+        if self.config["export_output_format"] == "parquet":
+            writer = ParquetExportWriter(
+                self.config, output_path, field_names, self.field_definitions
+            )
+            try:
+                yield writer
+            finally:
+                writer.close()
+        else:
+            with open(output_path, "a+", encoding="utf-8") as csv_file:
+                yield self.initialize_csv_writer(csv_file, field_names, export_mode)
+
     def _write_metadata_rows(self, writer, field_names):
         """Write field labels and cardinality rows for export mode."""
         field_labels = collections.OrderedDict()
@@ -94,7 +271,12 @@ class WorkbenchExportBase:
         writer.writerow(cardinality)
 
     def process_file_data(self, node_id, media_use_term_id=None, media_list=None):
-        """Handle file processing (download or URL) based on config."""
+        """Handle file processing (download or URL) based on config.
+
+        If "export_file_download_threads" is greater than 1, the file is only located here and its
+        download is queued; the path it will be downloaded to is returned right away. If the download
+        then fails, the path is logged and listed by finish_file_downloads().
+        """
         if self.config.get("export_file_url_instead_of_download", False):
             result = get_media_file_url(
                 self.config,
@@ -102,14 +284,82 @@ class WorkbenchExportBase:
                 media_use_term_id=media_use_term_id,
                 media_list=media_list,
             )
-        else:
-            result = download_file_from_drupal(
-                self.config,
-                node_id,
-                media_use_term_id=media_use_term_id,
-                media_list=media_list,
+            return result if result else ""  # Avoid 'False' values in file columns.
+
+        download = prepare_file_download(
+            self.config,
+            node_id,
+            media_use_term_id=media_use_term_id,
+            media_list=media_list,
+        )
+        if download is False:
+            return ""
+
+        with self.download_stats_lock:
+            if self.download_start_time is None:
+                self.download_start_time = time.perf_counter()
+
+        if self.download_executor is not None:
+            self.download_slots.acquire()
+            future = self.download_executor.submit(self.download_file, download)
+            future.add_done_callback(lambda future: self.download_slots.release())
+        elif self.download_file(download) is False:
+            return ""
+        return get_exported_file_path_value(self.config, download["path"])
+
+    def download_file(self, download):
+        """Transfer a file prepared by prepare_file_download() and record it in the download statistics."""
+        try:
+            result = transfer_file_from_drupal(self.config, download)
+        except Exception as e:
+            logging.error(f"Download of {download['url']} failed: {e}")
+            result = False
+        with self.download_stats_lock:
+            if result is False:
+                self.download_stats["failed"] += 1
+                if self.download_executor is not None:
+                    path_value = get_exported_file_path_value(
+                        self.config, download["path"]
+                    )
+                    self.failed_downloads.append(path_value)
+                    logging.warning(
+                        f'File for node {download["node_id"]} was not downloaded to "{path_value}", '
+                        + "but that path is in the export's output."
+                    )
+            elif download["skip"] is True:
+                self.download_stats["skipped"] += 1
+            else:
+                self.download_stats["files"] += 1
+                self.download_stats["bytes"] += result
+        return result
+
+    def finish_file_downloads(self):
+        """Wait for queued file downloads to finish and report their aggregate throughput."""
+        if self.download_executor is not None:
+            self.download_executor.shutdown(wait=True)
+        if self.download_start_time is None:
+            return
+
+        elapsed = max(time.perf_counter() - self.download_start_time, 0.001)
+        stats = self.download_stats
+        message = (
+            f"Downloaded {stats['files']} files ({stats['bytes'] / 1048576:.1f} MB) in {elapsed:.1f} seconds "
+            f"({stats['bytes'] / 1048576 / elapsed:.2f} MB/second); {stats['skipped']} files already present "
+            f'in "export_file_directory" were skipped.'
+        )
+        logging.info(message)
+        print(message)
+        if stats["failed"] > 0:
+            message = f"{stats['failed']} file downloads failed. See the log for more information."
+            logging.warning(message)
+            print("Warning: " + message)
+        if len(self.failed_downloads) > 0:
+            message = (
+                "These file paths are in the export's output but their files were not downloaded: "
+                + ", ".join(self.failed_downloads)
             )
-        return result if result else ""  # Avoid 'False' values in file columns.
+            logging.warning(message)
+            print("Warning: " + message)
 
     def log_progress(
         self, message, row_count=None, total_rows=None, level=logging.INFO
@@ -255,6 +505,8 @@ class CSVExporter(WorkbenchExportBase):
                 self.config["input_dir"],
                 self.config["input_csv"] + ".csv_file_with_field_values",
             )
+            if self.config["export_output_format"] == "parquet":
+                csv_path += ".parquet"
 
         if os.path.exists(csv_path):
             os.remove(csv_path)
@@ -382,43 +634,87 @@ class CSVExporter(WorkbenchExportBase):
         csv_file_path = self.setup_csv_output_path()
         field_names = self.prepare_headers()
 
-        with open(csv_file_path, "a+", encoding="utf-8") as csv_file:
-            writer = self.initialize_csv_writer(csv_file, field_names, True)
+        with self.open_output_writer(csv_file_path, field_names, True) as writer:
             self._process_nodes(writer, field_names)
+        self.finish_file_downloads()
 
         return csv_file_path
 
     def _process_nodes(self, writer, field_names):
-        """Process all nodes for CSV export."""
-        csv_data_list = list(self.csv_data)
+        """Process all nodes for CSV export.
+
+        Input rows are streamed from the preprocessed CSV. If "export_threads" is greater than 1,
+        nodes are fetched and serialized on a pool of worker threads, and the finished rows are
+        passed through a reorder buffer so they are written in the same order as the input CSV.
+        """
+        max_workers = max(1, int(self.config["export_threads"]))
+        total_rows = (
+            get_csv_row_count(self.config) if self.config["progress_bar"] else None
+        )
         row_count = 0
 
-        for row in csv_data_list:
-            # Delete expired items from request_cache before processing a row.
-            if self.config["enable_http_cache"]:
-                requests_cache.delete(expired=True)
+        if max_workers == 1:
+            for row in self.csv_data:
+                # Evict expired and least recently used responses from the HTTP cache, if due.
+                if self.config["enable_http_cache"]:
+                    maybe_evict_http_cache(self.config)
 
-            node_id = self.validate_and_get_node_id(row)
-            if not node_id:
-                continue
+                result = self.export_row(row, field_names)
+                if result is None:
+                    continue
+                self.write_exported_row(writer, result, row_count, total_rows)
+                row_count += 1
+            return
+
+        # Expired responses are not deleted from the request cache while worker threads are using it.
+        reorder_buffer = collections.deque()
+        reorder_window = max_workers * int(self.config["export_reorder_buffer_factor"])
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for row in self.csv_data:
+                reorder_buffer.append(
+                    executor.submit(self.export_row, row, field_names)
+                )
+                # Write out finished rows, in input order, once the buffer is full.
+                while len(reorder_buffer) >= reorder_window:
+                    result = reorder_buffer.popleft().result()
+                    if result is not None:
+                        self.write_exported_row(writer, result, row_count, total_rows)
+                        row_count += 1
+            while len(reorder_buffer) > 0:
+                result = reorder_buffer.popleft().result()
+                if result is not None:
+                    self.write_exported_row(writer, result, row_count, total_rows)
+                    row_count += 1
+
+    def export_row(self, row, field_names):
+        """Fetch and serialize the node identified in an input CSV row. Safe to call from
+        worker threads; returns a (node_id, output_row) tuple, or None if the node is skipped.
+        """
+        node_id = self.validate_and_get_node_id(row)
+        if not node_id:
+            return None
 
-            node_json = self.fetch_node_json(node_id)
-            if not node_json or not self.validate_content_type(node_json, node_id):
-                continue
+        node_json = self.fetch_node_json(node_id)
+        if not node_json or not self.validate_content_type(node_json, node_id):
+            return None
 
-            output_row = self.process_node_row(node_json, field_names)
-            if not output_row:
-                continue
+        output_row = self.process_node_row(node_json, field_names)
+        if not output_row:
+            return None
 
-            writer.writerow(output_row)
-            suffix = self.row_log_suffix(row)
+        return node_id, output_row
 
-            self.log_progress(
-                f'Exporting data{suffix} for node {node_id} "{output_row["title"]}."',
-                row_count,
-                len(csv_data_list),
-            )
-            row_count += 1
+    def write_exported_row(self, writer, result, row_count, total_rows):
+        """Write a row returned by export_row() to the output CSV and log it."""
+        node_id, output_row = result
+        writer.writerow(output_row)
+        suffix = self.row_log_suffix(output_row)
+
+        self.log_progress(
+            f'Exporting data{suffix} for node {node_id} "{output_row["title"]}."',
+            row_count,
+            total_rows,
+        )
 
 
 class ViewExporter(WorkbenchExportBase):
@@ -434,7 +730,7 @@ class ViewExporter(WorkbenchExportBase):
         config_base = os.path.basename(self.args.config).split(".")[0]
         csv_path = os.path.join(
             self.config["input_dir"],
-            f"{config_base}_view_export_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.csv",
+            f"{config_base}_view_export_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.{self.config['export_output_format']}",
         )
 
         if os.path.exists(csv_path):
@@ -564,35 +860,98 @@ class ViewExporter(WorkbenchExportBase):
         csv_file_path = self.setup_csv_output_path()
         field_names = self.prepare_headers()
 
-        with open(csv_file_path, "a+", encoding="utf-8") as csv_file:
-            writer = self.initialize_csv_writer(csv_file, field_names)
+        with self.open_output_writer(csv_file_path, field_names) as writer:
             self._process_view_pages(writer, field_names)
+        self.finish_file_downloads()
 
         return csv_file_path
 
-    def _process_view_pages(self, writer, field_names):
-        """Process paginated View results."""
-        page = 0
+    def get_view_page_url(self, page):
+        """Get the URL of a page of View results."""
+        url = f"{self.view_config['base_url']}?page={page}&{self.view_config['parameters']}"
+        if self.config["view_items_per_page"] is not None:
+            url = (
+                url.rstrip("&")
+                + f"&items_per_page={self.config['view_items_per_page']}"
+            )
+        return url
 
+    def fetch_view_pages(self):
+        """Generator that requests pages of View results in order and yields (page, response, nodes)
+        tuples. nodes is None if the page could not be retrieved, and empty for the last page.
+        """
+        page = 0
         while True:
-            current_url = f"{self.view_config['base_url']}?page={page}&{self.view_config['parameters']}"
-            response = issue_request(self.config, "GET", current_url)
-
+            response = issue_request(self.config, "GET", self.get_view_page_url(page))
             if response.status_code != 200:
-                self.log_progress(
-                    f"Skipping page {page} due to HTTP {response.status_code}",
-                    level=logging.WARNING,
-                )
+                yield page, response, None
                 page += 1
                 continue
 
             nodes = self.parse_json_response(response)
+            yield page, response, nodes
             if not nodes:
                 break
+            page += 1
+
+    def prefetch_view_pages(self):
+        """Generator that yields the same tuples as fetch_view_pages(), but fetches up to
+        "view_prefetch_pages" pages ahead on a background thread so that processing a page
+        overlaps with requesting the following ones."""
+        page_queue = queue.Queue(maxsize=int(self.config["view_prefetch_pages"]))
+        stop_fetching = threading.Event()
+
+        def put(item):
+            while not stop_fetching.is_set():
+                try:
+                    page_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch():
+            try:
+                for page_tuple in self.fetch_view_pages():
+                    if not put(("page", page_tuple)):
+                        return
+            except BaseException as e:
+                # issue_request() calls sys.exit() on connection errors; hand those to the main thread.
+                put(("error", e))
+                return
+            put(("done", None))
+
+        fetcher = threading.Thread(target=fetch, name="view-page-prefetch", daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                kind, item = page_queue.get()
+                if kind == "error":
+                    raise item
+                if kind == "done":
+                    break
+                yield item
+        finally:
+            stop_fetching.set()
+
+    def _process_view_pages(self, writer, field_names):
+        """Process paginated View results."""
+        if int(self.config["view_prefetch_pages"]) > 0:
+            view_pages = self.prefetch_view_pages()
+        else:
+            view_pages = self.fetch_view_pages()
+
+        for page, response, nodes in view_pages:
+            if nodes is None:
+                self.log_progress(
+                    f"Skipping page {page} due to HTTP {response.status_code}",
+                    level=logging.WARNING,
+                )
+                continue
 
             for node in nodes:
                 if self.config.get("enable_http_cache", False):
-                    requests_cache.delete(expired=True)
+                    maybe_evict_http_cache(self.config)
 
                 nid = self.extract_node_id(node)
                 if not nid or nid in self.seen_nids:
@@ -609,5 +968,3 @@ class ViewExporter(WorkbenchExportBase):
                     suffix = self.row_log_suffix(row)
                     self.log_progress(f"Exported node{suffix} {nid}: {row['title']}")
                     self.execute_post_export_script(response, json.dumps(node))
-
-            page += 1
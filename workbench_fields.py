@@ -1642,14 +1642,8 @@ class MediaTrackField(WorkbenchField):
         subvalues = list()
         for subvalue in field_data:
             if all(
-                "label" in subvalue,
-                subvalue["label"] is not None,
-                "kind" in subvalue,
-                subvalue["kind"] is not None,
-                "srclang" in subvalue,
-                subvalue["srclang"] is not None,
-                "url" in subvalue,
-                subvalue["url"] is not None,
+                subvalue.get(key) is not None
+                for key in ["label", "kind", "srclang", "url"]
             ):
                 serialized = f"{subvalue['label']}:{subvalue['kind']}:{subvalue['srclang']}:{os.path.basename(subvalue['url'])}"
                 subvalues.append(serialized)
@@ -0,0 +1,136 @@
+"""Runs entity post-task scripts (node_post_create, node_post_update, media_post_create) in the
+background, used by execute_entity_post_task_scripts() in workbench_utils.
+
+Each script gets its own HookExecutor, with a bounded queue and a pool of worker threads. If the
+queue is full, submit() waits, so a slow script slows the task down instead of letting the queue
+grow without bound. With a batch size greater than 1, a worker runs the script once for up to that
+many queued entities, with the arguments "config_file_path --jsonl", and writes one JSON object
+per entity to the script's stdin, with the keys "http_response_code", "entity" (the response body,
+as the script would get it in its third argument), and "filename".
+"""
+
+import json
+import queue
+import logging
+import threading
+import subprocess
+
+
+class HookExecutor:
+    def __init__(
+        self, command, label, run_script, workers=2, queue_size=1000, batch_size=1
+    ):
+        """
+        Parameters
+        ----------
+        command : str
+            The script, optionally preceded by its interpreter, as configured.
+        label : str
+            Describes the script in log messages, e.g. "Post node create script".
+        run_script : callable
+            Function used to run the script for one entity, with the same signature as
+            execute_entity_post_task_script().
+        """
+        self.command = command
+        self.label = label
+        self.run_script = run_script
+        self.batch_size = max(1, batch_size)
+        self.queue = queue.Queue(max(1, queue_size))
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.entities = 0
+        self.failures = []
+        self.threads = [
+            threading.Thread(target=self.work, daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, path_to_config_file, http_response_code, entity_json, filename=""):
+        self.queue.put((path_to_config_file, http_response_code, entity_json, filename))
+
+    def work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                self.run_batch(batch)
+            except Exception as e:
+                self.record_result(len(batch), None, f"{type(e).__name__}: {e}")
+            if stop:
+                return
+
+    def run_batch(self, batch):
+        if self.batch_size == 1:
+            path_to_config_file, http_response_code, entity_json, filename = batch[0]
+            output, return_code = self.run_script(
+                self.command,
+                path_to_config_file,
+                http_response_code,
+                entity_json,
+                filename,
+            )
+        else:
+            lines = "".join(
+                json.dumps(
+                    {
+                        "http_response_code": str(http_response_code),
+                        "entity": entity_json,
+                        "filename": filename,
+                    }
+                )
+                + "\n"
+                for path_to_config_file, http_response_code, entity_json, filename in batch
+            )
+            process = subprocess.run(
+                self.command.split(" ") + [batch[0][0], "--jsonl"],
+                input=lines,
+                stdout=subprocess.PIPE,
+                encoding="utf-8",
+            )
+            output, return_code = process.stdout.strip(), process.returncode
+        self.record_result(len(batch), return_code, output)
+
+    def record_result(self, num_entities, return_code, output):
+        with self.lock:
+            self.runs += 1
+            self.entities += num_entities
+            if return_code != 0:
+                self.failures.append(
+                    {
+                        "entities": num_entities,
+                        "return_code": return_code,
+                        "output": output[-500:] if output else "",
+                    }
+                )
+        if return_code == 0:
+            logging.info(f"{self.label} {self.command} executed successfully.")
+        else:
+            logging.error(
+                f"{self.label} {self.command} failed with exit code {return_code}"
+                + (
+                    f" for a batch of {num_entities} entities."
+                    if num_entities > 1
+                    else "."
+                )
+            )
+
+    def close(self):
+        """Wait for the queued entities to be processed and stop the worker threads."""
+        for thread in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
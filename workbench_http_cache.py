@@ -0,0 +1,163 @@
+"""Eviction policy for the requests_cache HTTP response cache, used by workbench_utils when the
+"enable_http_cache" config setting is true.
+
+requests_cache keeps responses until they are explicitly deleted, and deleting expired responses
+means scanning the whole cache. HttpCachePolicy instead keeps track of the responses Workbench
+caches, in least recently used order, and evicts them in batches: when "eviction_interval"
+seconds or "eviction_requests" requests have passed since the last eviction, or the cache
+exceeds "max_entries" responses or "max_bytes" bytes. An eviction deletes the expired responses
+and then the least recently used ones until the cache is within its limits.
+
+Only responses to GET and HEAD requests to the Drupal host are cached, and not those that list
+a node's media or check a file's hash, which change as Workbench runs; see is_cacheable(). Cached
+responses for a node, media, file, or term are deleted when Workbench changes or deletes it; see
+invalidate().
+"""
+
+import time
+import threading
+import collections
+import urllib.parse
+from workbench_metrics import get_endpoint_template
+
+
+def get_entity_path(url):
+    """Get the path of the entity a URL is for, e.g. "/node/12" for
+    "https://example.com/node/12/edit?_format=json", or None if it isn't for an entity.
+    """
+    segments = urllib.parse.urlparse(url).path.split("/")
+    for i in [2, 3]:
+        if len(segments) > i and segments[i].isdigit():
+            return "/".join(segments[: i + 1])
+    return None
+
+
+class HttpCachePolicy:
+    uncached_endpoints = [
+        "/node/{id}/media",
+        "/islandora_workbench_integration/file_hash",
+    ]
+
+    def __init__(
+        self,
+        cache,
+        host,
+        expire_after=None,
+        max_entries=None,
+        max_bytes=None,
+        eviction_interval=60,
+        eviction_requests=1000,
+    ):
+        """
+        Parameters
+        ----------
+        cache : requests_cache.backends.base.BaseCache
+            The cache of the installed requests_cache session.
+        host : str
+            The Drupal host. Responses from other hosts are not cached.
+        expire_after : int|None
+            The number of seconds responses are cached for, or None (or a negative number) if
+            they don't expire.
+        max_entries, max_bytes : int|None
+            The maximum number of responses, and their total size, kept after an eviction,
+            or None for no maximum.
+        """
+        self.cache = cache
+        self.host = host.rstrip("/")
+        self.expire_after = (
+            expire_after if expire_after is not None and expire_after >= 0 else None
+        )
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction_interval = eviction_interval
+        self.eviction_requests = eviction_requests
+        # Cache key: (size in bytes, expiry time, entity path), least recently used first.
+        self.entries = collections.OrderedDict()
+        self.keys_by_entity = dict()
+        self.bytes = 0
+        self.requests = 0
+        self.last_eviction = time.monotonic()
+        self.lock = threading.Lock()
+
+    def is_cacheable(self, response):
+        """The requests_cache filter_fn: whether to cache a response."""
+        url = response.request.url
+        if not url.startswith(self.host + "/"):
+            return False
+        return get_endpoint_template(url) not in self.uncached_endpoints
+
+    def record(self, key, size, from_cache, url):
+        """Register a cached response as the most recently used one."""
+        now = time.monotonic()
+        entity_path = get_entity_path(url)
+        with self.lock:
+            self.requests += 1
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[0]
+            if from_cache is True and entry is not None:
+                expires = entry[1]
+            elif self.expire_after is not None:
+                expires = now + self.expire_after
+            else:
+                expires = None
+            self.entries[key] = (size, expires, entity_path)
+            self.bytes += size
+            if entity_path is not None:
+                self.keys_by_entity.setdefault(entity_path, set()).add(key)
+
+    def remove_entry(self, key):
+        """Stop tracking a response. Call with self.lock held."""
+        size, expires, entity_path = self.entries.pop(key)
+        self.bytes -= size
+        if entity_path is not None:
+            self.keys_by_entity[entity_path].discard(key)
+            if len(self.keys_by_entity[entity_path]) == 0:
+                del self.keys_by_entity[entity_path]
+
+    def invalidate(self, url):
+        """Delete the cached responses for the entity a POST, PATCH, or DELETE request
+        changed."""
+        entity_path = get_entity_path(url)
+        if entity_path is None:
+            return
+        with self.lock:
+            keys = list(self.keys_by_entity.get(entity_path, []))
+            for key in keys:
+                self.remove_entry(key)
+        if len(keys) > 0:
+            self.cache.delete(*keys)
+
+    def is_over_limit(self):
+        return (
+            self.max_entries is not None and len(self.entries) > self.max_entries
+        ) or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def evict(self, force=False):
+        """Delete the expired and least recently used responses from the cache, if an eviction
+        is due or force is True. Returns the number of responses deleted."""
+        now = time.monotonic()
+        with self.lock:
+            if (
+                force is False
+                and now - self.last_eviction < self.eviction_interval
+                and self.requests < self.eviction_requests
+                and not self.is_over_limit()
+            ):
+                return 0
+            self.last_eviction = now
+            self.requests = 0
+            keys = [
+                key
+                for key, (size, expires, entity_path) in self.entries.items()
+                if expires is not None and expires <= now
+            ]
+            for key in keys:
+                self.remove_entry(key)
+            while len(self.entries) > 0 and self.is_over_limit():
+                key = next(iter(self.entries))
+                self.remove_entry(key)
+                keys.append(key)
+        if len(keys) > 0:
+            self.cache.delete(*keys)
+        return len(keys)
@@ -0,0 +1,92 @@
+"""A cache, kept in SQLite, of lookups that rarely change between tasks run against the same
+Drupal site, used by workbench_utils when the "lookup_cache_db_path" config setting is set.
+
+Entries are scoped by host and grouped by kind ("term_names", "term_uris", and "url_aliases"),
+and each kind has its own time to live, in seconds. Only lookups that found something are
+cached, since terms and URL aliases that don't exist yet may be created at any time.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+
+
+class LookupCache:
+    def __init__(self, db_path, host, ttls):
+        """
+        Parameters
+        ----------
+        db_path : str
+            The path to the SQLite database. Several Workbench processes can share it.
+        host : str
+            The Drupal host the cached lookups were made against.
+        ttls : dict
+            The number of seconds entries of each kind are kept for, keyed by kind. Entries
+            of kinds with a time to live of 0, or not in ttls, are not cached.
+        """
+        self.host = host.rstrip("/")
+        self.ttls = ttls
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            db_path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute("pragma journal_mode=wal")
+        self.connection.execute(
+            "create table if not exists lookups (host text, kind text, key text, value text, expires real, "
+            + "primary key (host, kind, key))"
+        )
+
+    def get(self, kind, key):
+        """Get a cached lookup's value, or None if it isn't cached or has expired."""
+        if not self.ttls.get(kind):
+            return None
+        with self.lock:
+            entry = self.connection.execute(
+                "select value, expires from lookups where host = ? and kind = ? and key = ?",
+                (self.host, kind, key),
+            ).fetchone()
+        if entry is None or entry[1] < time.time():
+            return None
+        return json.loads(entry[0])
+
+    def set(self, kind, key, value):
+        if not self.ttls.get(kind):
+            return
+        with self.lock:
+            self.connection.execute(
+                "insert or replace into lookups values (?, ?, ?, ?, ?)",
+                (
+                    self.host,
+                    kind,
+                    key,
+                    json.dumps(value),
+                    time.time() + self.ttls[kind],
+                ),
+            )
+
+    def delete_value(self, kind, value, key_prefix=""):
+        """Delete the entries of a kind that have the given value, and whose keys start with
+        key_prefix, e.g. the URL aliases of a deleted node."""
+        with self.lock:
+            self.connection.execute(
+                "delete from lookups where host = ? and kind = ? and value = ? "
+                + "and substr(key, 1, ?) = ?",
+                (self.host, kind, json.dumps(value), len(key_prefix), key_prefix),
+            )
+
+    def clear(self, kind=None):
+        """Delete the entries for this host, either all of them or those of one kind, and any
+        expired entries. Returns the number of entries deleted."""
+        with self.lock:
+            if kind is None:
+                cursor = self.connection.execute(
+                    "delete from lookups where host = ? or expires < ?",
+                    (self.host, time.time()),
+                )
+            else:
+                cursor = self.connection.execute(
+                    "delete from lookups where (host = ? and kind = ?) or expires < ?",
+                    (self.host, kind, time.time()),
+                )
+            return cursor.rowcount
@@ -0,0 +1,340 @@
+"""Timers, counters, and histograms for measuring where time goes during a Workbench task.
+
+A single WorkbenchMetrics instance, "metrics", is shared by workbench and workbench_utils.
+Phases are timed with metrics.timer() or the metrics.timed() decorator, HTTP requests are
+recorded by issue_request(), and tasks that process CSV rows call metrics.start_row() and
+metrics.end_row() so that the phases of unusually slow rows can be reported. If the
+"metrics_file_path" config setting is set, the metrics are written to that file as JSON
+at the end of the task.
+"""
+
+import re
+import json
+import time
+import logging
+import datetime
+import threading
+import functools
+import contextlib
+import urllib.parse
+
+
+class Histogram:
+    """Counts durations, in seconds, in fixed buckets. The last bucket counts durations
+    longer than the largest bound."""
+
+    bucket_bounds = [
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+        30,
+        60,
+    ]
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(self.bucket_bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        bucket = len(self.bucket_bounds)
+        for i, bound in enumerate(self.bucket_bounds):
+            if seconds <= bound:
+                bucket = i
+                break
+        self.bucket_counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def to_dict(self):
+        buckets = dict()
+        for bound, count in zip(self.bucket_bounds, self.bucket_counts):
+            buckets[f"<={bound}"] = count
+        buckets[f">{self.bucket_bounds[-1]}"] = self.bucket_counts[-1]
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else None,
+            "min_seconds": self.min,
+            "max_seconds": self.max,
+            "buckets": buckets,
+        }
+
+
+class LatencyHistogram(Histogram):
+    """A Histogram that can also report percentiles, using log-linear buckets in the style
+    of HdrHistogram: durations are counted in microseconds, exactly below 128 and within
+    1/64 (about 1.5%) of their value above that. Memory use is bounded by the number of
+    buckets, not the number of durations recorded."""
+
+    sub_bucket_bits = 7
+
+    def __init__(self):
+        super().__init__()
+        self.latency_counts = dict()
+
+    def get_bucket(self, microseconds):
+        if microseconds < (1 << self.sub_bucket_bits):
+            return 0, microseconds
+        shift = microseconds.bit_length() - self.sub_bucket_bits
+        return shift, microseconds >> shift
+
+    def record(self, seconds):
+        super().record(seconds)
+        bucket = self.get_bucket(max(0, int(seconds * 1000000)))
+        self.latency_counts[bucket] = self.latency_counts.get(bucket, 0) + 1
+
+    def get_percentile(self, percentile):
+        """Get the duration, in seconds, that the given percentage of recorded durations
+        are shorter than or equal to, or None if nothing has been recorded."""
+        if self.count == 0:
+            return None
+        target = max(1, percentile / 100 * self.count)
+        seen = 0
+        for shift, sub_bucket in sorted(self.latency_counts):
+            seen += self.latency_counts[(shift, sub_bucket)]
+            if seen >= target:
+                # The middle of the bucket's range of values.
+                microseconds = (sub_bucket << shift) + ((1 << shift) - 1) / 2
+                return min(max(microseconds / 1000000, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        latency = super().to_dict()
+        for percentile in [50, 95, 99]:
+            value = self.get_percentile(percentile)
+            latency[f"p{percentile}_seconds"] = (
+                round(value, 6) if value is not None else None
+            )
+        return latency
+
+
+def get_endpoint_template(url):
+    """Reduce a request URL to its path with IDs replaced by placeholders, e.g.
+    "https://example.com/node/12?_format=json" to "/node/{id}", so requests to the same
+    endpoint are counted together."""
+    path = urllib.parse.urlparse(url).path
+    segments = []
+    for segment in path.split("/"):
+        if segment.isdigit():
+            segment = "{id}"
+        elif re.fullmatch(
+            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+            segment,
+            re.IGNORECASE,
+        ):
+            segment = "{uuid}"
+        segments.append(segment)
+    return "/".join(segments) or "/"
+
+
+class WorkbenchMetrics:
+    # Requests to endpoints beyond this many are counted together, e.g. as "GET {other}",
+    # since paths such as URL aliases don't reduce to a template.
+    max_endpoints = 200
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.start_time = datetime.datetime.now()
+            self.phases = dict()
+            self.endpoints = dict()
+            self.counters = dict()
+            self.slow_rows = []
+            self.row_histogram = Histogram()
+            self.request_latency = LatencyHistogram()
+
+    def record(self, phase, seconds):
+        """Record the duration of a phase, and add it to the current row's breakdown."""
+        with self.lock:
+            if phase not in self.phases:
+                self.phases[phase] = Histogram()
+            self.phases[phase].record(seconds)
+        row = getattr(self.local, "row", None)
+        if row is not None:
+            row["phases"][phase] = row["phases"].get(phase, 0) + seconds
+
+    def increment(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        """Time the enclosed block as the named phase. A phase nested within itself
+        (e.g. in a recursive call) is only timed once, by the outermost timer."""
+        active_phases = self.local.__dict__.setdefault("active_phases", set())
+        if phase in active_phases:
+            yield
+            return
+        active_phases.add(phase)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            active_phases.discard(phase)
+            self.record(phase, time.perf_counter() - start)
+
+    def timed(self, phase):
+        """Decorator that times each call to the decorated function as the named phase."""
+
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.timer(phase):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record_request(self, method, url, seconds, status_code):
+        """Record an HTTP request's duration under its method and endpoint template."""
+        endpoint = method + " " + get_endpoint_template(url)
+        with self.lock:
+            if (
+                endpoint not in self.endpoints
+                and len(self.endpoints) >= self.max_endpoints
+            ):
+                endpoint = method + " {other}"
+            if endpoint not in self.endpoints:
+                self.endpoints[endpoint] = {
+                    "histogram": LatencyHistogram(),
+                    "status_codes": dict(),
+                }
+            self.endpoints[endpoint]["histogram"].record(seconds)
+            self.request_latency.record(seconds)
+            status_codes = self.endpoints[endpoint]["status_codes"]
+            status_codes[str(status_code)] = status_codes.get(str(status_code), 0) + 1
+            self.counters["http_requests"] = self.counters.get("http_requests", 0) + 1
+        row = getattr(self.local, "row", None)
+        if row is not None:
+            row["requests"] += 1
+
+    def get_latency_percentile(self, percentile, endpoint=None, min_count=1):
+        """Get a percentile (e.g. 95) of the duration, in seconds, of the HTTP requests
+        made so far, either to all endpoints or to the given "METHOD /endpoint/template".
+        Returns None if fewer than min_count requests have been made."""
+        with self.lock:
+            if endpoint is None:
+                histogram = self.request_latency
+            elif endpoint in self.endpoints:
+                histogram = self.endpoints[endpoint]["histogram"]
+            else:
+                return None
+            if histogram.count < min_count:
+                return None
+            return histogram.get_percentile(percentile)
+
+    def start_row(self, config, row_id):
+        """Start timing a CSV row. Ends the previous row processed in this thread, if any,
+        so tasks only need to call end_row() once, after their last row."""
+        self.end_row()
+        threshold = config.get("metrics_slow_row_threshold")
+        self.local.row = {
+            "id": row_id,
+            "start": time.perf_counter(),
+            "phases": dict(),
+            "requests": 0,
+            "threshold": float(threshold) if threshold is not None else None,
+        }
+
+    def end_row(self):
+        row = getattr(self.local, "row", None)
+        if row is None:
+            return
+        self.local.row = None
+        seconds = time.perf_counter() - row["start"]
+        with self.lock:
+            self.row_histogram.record(seconds)
+        if row["threshold"] is not None and seconds >= row["threshold"]:
+            slow_row = {
+                "id": row["id"],
+                "seconds": round(seconds, 6),
+                "requests": row["requests"],
+                "phases": {
+                    phase: round(phase_seconds, 6)
+                    for phase, phase_seconds in row["phases"].items()
+                },
+            }
+            with self.lock:
+                self.slow_rows.append(slow_row)
+            logging.warning(
+                f'Row "{row["id"]}" took {seconds:.3f} seconds, exceeding the "metrics_slow_row_threshold" '
+                f"of {row['threshold']} seconds. Time per phase: {slow_row['phases']}."
+            )
+
+    def get_report(self, config):
+        with self.lock:
+            return {
+                "task": config["task"],
+                "config_file": config.get("config_file"),
+                "start_time": self.start_time.isoformat(timespec="seconds"),
+                "end_time": datetime.datetime.now().isoformat(timespec="seconds"),
+                "elapsed_seconds": round(
+                    (datetime.datetime.now() - self.start_time).total_seconds(), 3
+                ),
+                "counters": dict(self.counters),
+                "rows": self.row_histogram.to_dict(),
+                "requests": self.request_latency.to_dict(),
+                "phases": {
+                    phase: histogram.to_dict()
+                    for phase, histogram in self.phases.items()
+                },
+                "endpoints": {
+                    endpoint: dict(
+                        entry["histogram"].to_dict(),
+                        status_codes=dict(entry["status_codes"]),
+                    )
+                    for endpoint, entry in self.endpoints.items()
+                },
+                "slow_rows": list(self.slow_rows),
+            }
+
+    def log_summary(self):
+        """Log the 50th, 95th, and 99th percentile duration of the task's HTTP requests,
+        overall and for each endpoint."""
+        with self.lock:
+            if self.request_latency.count == 0:
+                return
+            histograms = [("All requests", self.request_latency)] + [
+                (endpoint, self.endpoints[endpoint]["histogram"])
+                for endpoint in sorted(self.endpoints)
+            ]
+            for label, histogram in histograms:
+                percentiles = ", ".join(
+                    f"p{percentile} {histogram.get_percentile(percentile) * 1000:.1f} ms"
+                    for percentile in [50, 95, 99]
+                )
+                logging.info(
+                    f"HTTP response times: {label}: {histogram.count} requests, {percentiles}."
+                )
+
+    def write_report(self, config):
+        """Write the metrics to the file named in the "metrics_file_path" config setting, if set."""
+        if config.get("metrics_file_path") is None:
+            return
+        self.end_row()
+        with open(config["metrics_file_path"], "w") as metrics_file:
+            json.dump(self.get_report(config), metrics_file, indent=2)
+        logging.info(f'Task metrics written to {config["metrics_file_path"]}.')
+
+
+metrics = WorkbenchMetrics()
@@ -0,0 +1,188 @@
+"""Field preprocessors that process many values per process, used by preprocess_csv() in workbench_utils.
+
+By default Workbench runs a preprocessor script once per CSV value, passing the value as an
+argument. The classes here avoid starting a process per value:
+
+- PersistentPreprocessor starts a script once (or once per process in a pool) and exchanges
+  JSON lines with it. Workbench runs the script with the arguments "subdelimiter --jsonl
+  config_file_path" and writes one {"id": ..., "value": ...} object per line to its stdin. The
+  script must write one {"id": ..., "value": ...} object per line to its stdout for each input
+  line, in the same order, flushing after each one, or {"id": ..., "error": ...} if it could
+  not process the value. See scripts/samplepreprocessor_persistent.py.
+- PluginPreprocessor calls a Python function, preprocess(value, subdelimiter, config_file_path),
+  defined in a .py file, in Workbench's process or in a process pool. It is used for
+  preprocessors registered as "python:/path/to/plugin.py". See scripts/samplepreprocessor_plugin.py.
+
+Both take a list of values and return a list of results, with None for values that could
+not be preprocessed.
+"""
+
+import os
+import json
+import logging
+import threading
+import subprocess
+import importlib.util
+import concurrent.futures
+
+
+class PersistentPreprocessor:
+    def __init__(self, command, subdelimiter, config_file_path, processes=1):
+        self.command = command
+        self.workers = []
+        for i in range(max(1, processes)):
+            worker = subprocess.Popen(
+                command + [subdelimiter, "--jsonl", config_file_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                encoding="utf-8",
+                bufsize=1,
+            )
+            self.workers.append({"process": worker, "lock": threading.Lock()})
+        self.next_id = 0
+        self.next_id_lock = threading.Lock()
+
+    def preprocess_with_worker(self, worker, values, first_id):
+        """Send values to one worker process and read its results. The values are written
+        by a separate thread so that a worker whose stdout pipe fills up can't deadlock
+        with Workbench filling its stdin pipe."""
+        process = worker["process"]
+
+        def write_values():
+            try:
+                for i, value in enumerate(values):
+                    process.stdin.write(
+                        json.dumps({"id": first_id + i, "value": value}) + "\n"
+                    )
+                process.stdin.flush()
+            except (BrokenPipeError, OSError):
+                pass
+
+        results = []
+        with worker["lock"]:
+            writer = threading.Thread(target=write_values, daemon=True)
+            writer.start()
+            for i in range(len(values)):
+                line = process.stdout.readline()
+                if line == "":
+                    logging.error(
+                        f'Persistent preprocessor "{" ".join(self.command)}" exited with return code {process.poll()} '
+                        + "before returning all of its results."
+                    )
+                    results.extend([None] * (len(values) - len(results)))
+                    break
+                try:
+                    result = json.loads(line)
+                except json.decoder.JSONDecodeError:
+                    result = {"error": f"Invalid JSON: {line.strip()}"}
+                if "error" in result or "value" not in result:
+                    logging.error(
+                        f'Persistent preprocessor "{" ".join(self.command)}" could not preprocess "{values[i]}": '
+                        + str(result.get("error"))
+                    )
+                    results.append(None)
+                else:
+                    results.append(str(result["value"]))
+            writer.join()
+        return results
+
+    def preprocess(self, values):
+        with self.next_id_lock:
+            first_id = self.next_id
+            self.next_id += len(values)
+        if len(self.workers) == 1 or len(values) < 2:
+            return self.preprocess_with_worker(self.workers[0], values, first_id)
+
+        # Give each worker process a contiguous share of the values, so results can be
+        # reassembled in order.
+        share = -(-len(values) // len(self.workers))
+        with concurrent.futures.ThreadPoolExecutor(len(self.workers)) as executor:
+            futures = [
+                executor.submit(
+                    self.preprocess_with_worker,
+                    worker,
+                    values[i * share : (i + 1) * share],
+                    first_id + i * share,
+                )
+                for i, worker in enumerate(self.workers)
+            ]
+            return [result for future in futures for result in future.result()]
+
+    def close(self):
+        for worker in self.workers:
+            try:
+                worker["process"].stdin.close()
+                worker["process"].wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                worker["process"].kill()
+
+
+# The plugin function loaded in each process of a PluginPreprocessor's process pool.
+plugin_function = None
+
+
+def load_plugin(plugin_path):
+    global plugin_function
+    spec = importlib.util.spec_from_file_location(
+        "workbench_preprocessor_plugin_"
+        + os.path.splitext(os.path.basename(plugin_path))[0],
+        plugin_path,
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    plugin_function = module.preprocess
+    return plugin_function
+
+
+def call_plugin(value, subdelimiter, config_file_path, function=None):
+    """Call a plugin function, returning its result as a (True, result) tuple or, if it
+    raised an exception, (False, the exception's message)."""
+    try:
+        function = function if function is not None else plugin_function
+        return True, str(function(value, subdelimiter, config_file_path))
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+class PluginPreprocessor:
+    def __init__(self, plugin_path, subdelimiter, config_file_path, processes=1):
+        self.plugin_path = plugin_path
+        self.subdelimiter = subdelimiter
+        self.config_file_path = config_file_path
+        self.function = load_plugin(plugin_path)
+        self.executor = None
+        if processes > 1:
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                processes, initializer=load_plugin, initargs=(plugin_path,)
+            )
+            self.processes = processes
+
+    def preprocess(self, values):
+        if self.executor is None or len(values) < 2:
+            outcomes = [
+                call_plugin(
+                    value, self.subdelimiter, self.config_file_path, self.function
+                )
+                for value in values
+            ]
+        else:
+            outcomes = self.executor.map(
+                call_plugin,
+                values,
+                [self.subdelimiter] * len(values),
+                [self.config_file_path] * len(values),
+                chunksize=max(1, len(values) // (self.processes * 4)),
+            )
+        results = []
+        for value, (succeeded, result) in zip(values, outcomes):
+            if succeeded is False:
+                logging.error(
+                    f'Preprocessor plugin "{self.plugin_path}" could not preprocess "{value}": {result}'
+                )
+                result = None
+            results.append(result)
+        return results
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
@@ -0,0 +1,195 @@
+"""Controls for how hard Workbench pushes on Drupal, used by issue_request() in workbench_utils."""
+
+import time
+import sqlite3
+import logging
+import threading
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of HTTP requests in flight at once, adjusting the limit with
+    additive increase/multiplicative decrease (AIMD), as TCP does with its congestion window.
+
+    Each successful request that isn't slow raises the limit by 1/limit, so the limit grows
+    by about one request per full "window" of requests. A 429 or 503 response, or a response
+    slower than "latency_factor" times the median for its endpoint, halves the limit, at most
+    once per slow response's duration so a burst of slow responses counts as one signal. If
+    Drupal is still overloaded at the minimum limit, requests are delayed, by the response's
+    Retry-After header if it has one, otherwise by an exponentially increasing backoff.
+    """
+
+    max_backoff = 30
+
+    def __init__(self, min_limit=1, max_limit=16, latency_factor=3):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.latency_factor = latency_factor
+        self.limit = float(self.min_limit)
+        self.in_flight = 0
+        self.backoff = 0
+        self.next_decrease = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Wait until another request is allowed to start."""
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+            backoff = self.backoff
+        if backoff > 0:
+            time.sleep(backoff)
+
+    def release(
+        self, response_time, status_code, median_response_time=None, retry_after=None
+    ):
+        """Register the outcome of a request started after acquire() and adjust the limit.
+
+        Parameters
+        ----------
+        response_time : float
+            The request's response time, in seconds.
+        status_code : int|None
+            The HTTP status code of the response, or None if there was no response.
+        median_response_time : float|None
+            The median response time of earlier requests to the same endpoint, if known.
+        retry_after : str|None
+            The value of the response's Retry-After header, if any.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            overloaded = status_code in [429, 503]
+            slow = (
+                median_response_time is not None
+                and response_time > median_response_time * self.latency_factor
+            )
+            if overloaded or slow:
+                now = time.monotonic()
+                if now >= self.next_decrease:
+                    previous_limit = int(self.limit)
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self.next_decrease = now + response_time
+                    if int(self.limit) != previous_limit:
+                        logging.info(
+                            f"Concurrent HTTP requests reduced to {int(self.limit)} after "
+                            + (
+                                f"HTTP status {status_code}."
+                                if overloaded
+                                else f"a {response_time:.3f} second response."
+                            )
+                        )
+                if overloaded and int(self.limit) == self.min_limit:
+                    if retry_after is not None and str(retry_after).isdigit():
+                        self.backoff = min(int(retry_after), self.max_backoff)
+                    else:
+                        self.backoff = min(max(self.backoff * 2, 0.5), self.max_backoff)
+                    logging.warning(
+                        f"Drupal responded with HTTP status {status_code}, delaying requests by {self.backoff} seconds."
+                    )
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self.backoff = 0
+            self.condition.notify_all()
+
+
+class TokenBucket:
+    """Limits a kind of request to "rate" per second, with bursts of up to "burst" requests.
+
+    Each request takes a token, and tokens are added at "rate" per second up to "burst".
+    A request that finds no token available still takes one, leaving the bucket in debt,
+    and waits until the debt would be repaid. Requests therefore queue in order and run
+    at exactly the allowed rate, without polling.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.time()
+        self.lock = threading.Lock()
+
+    def take_token(self, tokens, updated, now):
+        """Refill a bucket that had "tokens" tokens at time "updated", take one token at time
+        "now", and return the new number of tokens and how long to wait before proceeding.
+        """
+        tokens = min(self.burst, tokens + max(0, now - updated) * self.rate) - 1
+        return tokens, max(0, -tokens / self.rate)
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before making the request."""
+        with self.lock:
+            now = time.time()
+            self.tokens, wait = self.take_token(self.tokens, self.updated, now)
+            self.updated = now
+        return wait
+
+    def acquire(self):
+        """Wait until a request is allowed to proceed."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """A TokenBucket whose state is kept in an SQLite database, so that all Workbench
+    processes using the same database (e.g. a primary task and its secondary tasks, or
+    several tasks run at once) share one budget. The rate and burst are stored with the
+    bucket, so processes that don't configure them use the ones already in effect."""
+
+    def __init__(self, db_path, name, rate=None, burst=1):
+        self.db_path = db_path
+        self.name = name
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            db_path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute(
+            "create table if not exists token_buckets (name text primary key, rate real, burst real, tokens real, updated real)"
+        )
+        with self.lock:
+            self.connection.execute("begin immediate")
+            try:
+                bucket = self.connection.execute(
+                    "select rate, burst from token_buckets where name = ?", (name,)
+                ).fetchone()
+                if rate is not None:
+                    if bucket is None:
+                        self.connection.execute(
+                            "insert into token_buckets values (?, ?, ?, ?, ?)",
+                            (name, rate, max(1.0, burst), max(1.0, burst), time.time()),
+                        )
+                    else:
+                        self.connection.execute(
+                            "update token_buckets set rate = ?, burst = ? where name = ?",
+                            (rate, max(1.0, burst), name),
+                        )
+                elif bucket is not None:
+                    rate, burst = bucket
+                self.connection.execute("commit")
+            except Exception:
+                self.connection.execute("rollback")
+                raise
+        self.rate = float(rate) if rate is not None else None
+        self.burst = max(1.0, float(burst))
+
+    def reserve(self):
+        with self.lock:
+            self.connection.execute("begin immediate")
+            try:
+                tokens, updated = self.connection.execute(
+                    "select tokens, updated from token_buckets where name = ?",
+                    (self.name,),
+                ).fetchone()
+                now = time.time()
+                tokens, wait = self.take_token(tokens, updated, now)
+                # Time only moves forward, so a process whose clock is slightly behind
+                # another's can't refill the bucket a second time.
+                self.connection.execute(
+                    "update token_buckets set tokens = ?, updated = ? where name = ?",
+                    (tokens, max(now, updated), self.name),
+                )
+                self.connection.execute("commit")
+            except Exception:
+                self.connection.execute("rollback")
+                raise
+        return wait
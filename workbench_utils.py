@@ -34,11 +34,26 @@ from progress_bar import InitBar
 import edtf_validate.valid_edtf
 import shutil
 import itertools
+import io
+import array
 import http.client
 import sqlite3
 import zipfile
+import concurrent.futures
+import threading
 import requests_cache
 from rich.traceback import install
+from workbench_metrics import metrics, get_endpoint_template
+from workbench_throttle import (
+    AdaptiveConcurrencyLimiter,
+    TokenBucket,
+    SharedTokenBucket,
+)
+from workbench_preprocessors import PersistentPreprocessor, PluginPreprocessor
+from workbench_hooks import HookExecutor
+from workbench_lookup_cache import LookupCache
+from workbench_http_cache import HttpCachePolicy
+from workbench_csv_row import CsvRow
 
 install()
 
@@ -48,10 +63,14 @@ yaml = YAML()
 EXECUTION_START_TIME = datetime.datetime.now()
 # Workaround for https://github.com/mjordan/islandora_workbench/issues/360.
 http.client._MAXHEADERS = 10000
-http_response_times = []
+# Response times of the most recent HTTP requests, used by calculate_response_time_trend().
+http_response_times = collections.deque(maxlen=20)
 # Global lists of terms to reduce queries to Drupal.
 checked_terms = list()
-newly_created_terms = list()
+# IDs of the terms created during this task, and of the terms in vocabularies prefetched by
+# prefetch_vocabulary_terms(), keyed by vocabulary ID and lowercased term name; see find_term_in_vocab().
+term_ids_by_name = dict()
+prefetched_vocabularies = set()
 # These are the Drupal field names on the standard types of media.
 file_fields = [
     "field_media_file",
@@ -61,6 +80,48 @@ file_fields = [
     "field_media_video_file",
 ]
 commented_out_input_csv_rows_present = False
+# Setup shared by all paged content created by create_children_from_directory() during a task.
+paged_content_task_setup = dict()
+paged_content_lock = threading.Lock()
+# Names, URIs, and vocabulary IDs of terms, keyed by term ID. Bounded by config['term_cache_size'];
+# see get_cached_term_data().
+term_data_cache = collections.OrderedDict()
+term_data_cache_lock = threading.Lock()
+# Paths in export_file_directory already assigned to a file download during this task.
+reserved_download_paths = set()
+download_path_lock = threading.Lock()
+# Shared by all threads making requests when config['adaptive_concurrency'] is true; see
+# get_concurrency_limiter().
+concurrency_limiter = None
+concurrency_limiter_lock = threading.Lock()
+# Token buckets enforcing config['rate_limit_reads_per_second'] and config['rate_limit_writes_per_second'],
+# keyed by "reads" and "writes"; see get_request_rate_limiter().
+request_rate_limiters = None
+request_rate_limiters_lock = threading.Lock()
+# Persistent and plugin preprocessors started during this task, keyed by their configured
+# script path, and values they have already preprocessed in batches; see get_preprocessor()
+# and preprocess_csv_rows().
+preprocessors = dict()
+preprocessors_lock = threading.Lock()
+preprocessed_values = dict()
+# Background executors for entity post-task scripts, keyed by hook and script; see
+# execute_entity_post_task_scripts().
+hook_executors = dict()
+hook_executors_lock = threading.Lock()
+# Entity IDs that URL aliases (and canonical URLs) resolve to, or False for URLs that can't be
+# found or accessed, keyed by entity type and query URL; see get_entity_id_from_url_alias().
+url_alias_cache = dict()
+url_alias_cache_lock = threading.Lock()
+# The fingerprint of the input CSV and config that each preprocessed CSV file was written from
+# during this task, and its row count, keyed by the preprocessed file's path; see get_csv_data().
+preprocessed_csv_files = dict()
+# Term and URL alias lookups kept between tasks when config['lookup_cache_db_path'] is set;
+# see get_lookup_cache().
+lookup_cache = None
+lookup_cache_lock = threading.Lock()
+lookup_cache_kinds = ["term_names", "term_uris", "url_aliases"]
+# Set by install_http_cache().
+http_cache_policy = None
 
 
 def set_media_type(
@@ -275,7 +336,7 @@ def issue_request(
                 logging.error(message)
                 sys.exit("Error: " + message)
 
-            if config["check"] is False:
+            if config["check"] is False and config["adaptive_concurrency"] is False:
                 if (
                     "pause" in config
                     # and method in ["POST", "PUT", "PATCH", "DELETE"]
@@ -309,18 +370,44 @@ def issue_request(
                 logging.info(headers)
             if json_data is not None and config["log_json"] is True:
                 log_json(json_data)
-            response = session.request(
-                method,
-                url,
-                allow_redirects=config["allow_redirects"],
-                verify=config["secure_ssl_only"],
-                auth=(config["username"], config["password"]),
-                headers=headers,
-                json=json_data,
-                data=data,
-                params=query,
-                stream=True if method in ["PUT", "POST", "PATCH"] else False,
-            )
+            rate_limiter = get_request_rate_limiter(config, method)
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            limiter = get_concurrency_limiter(config)
+            if limiter is not None:
+                limiter.acquire()
+            request_start_time = time.perf_counter()
+            try:
+                response = session.request(
+                    method,
+                    url,
+                    allow_redirects=config["allow_redirects"],
+                    verify=config["secure_ssl_only"],
+                    auth=(config["username"], config["password"]),
+                    headers=headers,
+                    json=json_data,
+                    data=data,
+                    params=query,
+                    stream=True if method in ["PUT", "POST", "PATCH"] else False,
+                )
+            except requests.exceptions.RequestException:
+                if limiter is not None:
+                    limiter.release(time.perf_counter() - request_start_time, None)
+                raise
+            metrics.record_request(
+                method, url, response.elapsed.total_seconds(), response.status_code
+            )
+            record_http_cache_response(config, method, response)
+            if limiter is not None:
+                # Requests to endpoints with fewer than 10 responses so far are judged only by their status code.
+                limiter.release(
+                    response.elapsed.total_seconds(),
+                    response.status_code,
+                    metrics.get_latency_percentile(
+                        50, method + " " + get_endpoint_template(url), min_count=10
+                    ),
+                    response.headers.get("Retry-After"),
+                )
 
             if config["log_response_status_code"] is True:
                 logging.info(response.status_code)
@@ -332,8 +419,10 @@ def issue_request(
             average_response_time = calculate_response_time_trend(config, response_time)
 
             log_response_time_value = copy.copy(config["log_response_time"])
-            if "adaptive_pause" in config and value_is_numeric(
-                config["adaptive_pause"]
+            if (
+                "adaptive_pause" in config
+                and value_is_numeric(config["adaptive_pause"])
+                and config["adaptive_concurrency"] is False
             ):
                 # Pause defined in config['adaptive_pause'] is included in the response time,
                 # so we subtract it to get the "unpaused" response time.
@@ -361,8 +450,10 @@ def issue_request(
                     )
                 else:
                     url_for_logging = urllib.parse.urlparse(url).path
-                if "adaptive_pause" in config and value_is_numeric(
-                    config["adaptive_pause"]
+                if (
+                    "adaptive_pause" in config
+                    and value_is_numeric(config["adaptive_pause"])
+                    and config["adaptive_concurrency"] is False
                 ):
                     response_time = response_time - int(config["adaptive_pause"])
                 response_time_trend_entry = {
@@ -396,6 +487,284 @@ def issue_request(
             sys.exit("Error: " + message)
 
 
+def get_concurrency_limiter(config: dict) -> Optional[AdaptiveConcurrencyLimiter]:
+    """Gets the limiter that adjusts how many HTTP requests may be in flight at once.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+
+    Returns
+    -------
+    AdaptiveConcurrencyLimiter|None
+        The limiter shared by all threads, or None if 'adaptive_concurrency' is false.
+    """
+    global concurrency_limiter
+    if config["adaptive_concurrency"] is False:
+        return None
+    with concurrency_limiter_lock:
+        if concurrency_limiter is None:
+            concurrency_limiter = AdaptiveConcurrencyLimiter(
+                config["adaptive_concurrency_min"],
+                config["adaptive_concurrency_max"],
+                config["adaptive_concurrency_latency_factor"],
+            )
+    return concurrency_limiter
+
+
+def install_http_cache(config: dict) -> None:
+    """Installs the requests_cache HTTP response cache, with an HttpCachePolicy that
+    decides which responses are cached and when they are evicted.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    """
+    global http_cache_policy
+    if config["http_cache_storage"] == "sqlite" and os.path.exists("http_cache.sqlite"):
+        logging.info('Cleared HTTP cache file "http_cache.sqlite".')
+        os.remove("http_cache.sqlite")
+    requests_cache.install_cache(
+        backend=config["http_cache_storage"],
+        expire_after=config["http_cache_storage_expire_after"],
+        filter_fn=lambda response: http_cache_policy.is_cacheable(response),
+    )
+    http_cache_policy = HttpCachePolicy(
+        requests_cache.get_cache(),
+        config["host"],
+        expire_after=config["http_cache_storage_expire_after"],
+        max_entries=config["http_cache_max_entries"],
+        max_bytes=config["http_cache_max_bytes"],
+        eviction_interval=config["http_cache_eviction_interval"],
+        eviction_requests=config["http_cache_eviction_requests"],
+    )
+
+
+def record_http_cache_response(
+    config: dict, method: str, response: requests.Response
+) -> None:
+    """Registers a response to a request made by issue_request() with the HTTP cache's
+    eviction policy, if the response was cached, or if the request changed an entity,
+    deletes the entity's cached responses.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    method : string
+        The request's HTTP method.
+    response : requests.Response
+        The response.
+    """
+    if http_cache_policy is None or getattr(response, "cache_key", None) is None:
+        return
+    if method.upper() in ["POST", "PUT", "PATCH", "DELETE"]:
+        http_cache_policy.invalidate(response.request.url)
+        return
+    if getattr(response, "from_cache", False) is True:
+        metrics.increment("http_cache_hits")
+    elif (
+        method.upper() not in ["GET", "HEAD"]
+        or response.status_code != 200
+        or http_cache_policy.is_cacheable(response) is False
+    ):
+        return
+    http_cache_policy.record(
+        response.cache_key,
+        len(response.content or b""),
+        response.from_cache,
+        response.request.url,
+    )
+
+
+def maybe_evict_http_cache(config: dict) -> None:
+    """Deletes expired and least recently used responses from the HTTP cache if an eviction
+    is due, which is much cheaper than having requests_cache look for expired responses
+    before each CSV row.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    """
+    if http_cache_policy is None:
+        return
+    num_evicted = http_cache_policy.evict()
+    if num_evicted > 0:
+        metrics.increment("http_cache_evictions", num_evicted)
+
+
+def get_lookup_cache(config: dict) -> Optional[LookupCache]:
+    """Gets the cache of term and URL alias lookups kept between tasks.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+
+    Returns
+    -------
+    LookupCache|None
+        The cache shared by all threads, or None if 'lookup_cache_db_path' is not set.
+    """
+    global lookup_cache
+    if config.get("lookup_cache_db_path") is None:
+        return None
+    with lookup_cache_lock:
+        if lookup_cache is None:
+            lookup_cache = LookupCache(
+                config["lookup_cache_db_path"],
+                config["host"],
+                {
+                    kind: config[f"lookup_cache_ttl_{kind}"]
+                    for kind in lookup_cache_kinds
+                },
+            )
+    return lookup_cache
+
+
+def get_cached_lookup(config: dict, kind: str, key: str) -> Union[int, str, None]:
+    """Gets the result of a lookup made by an earlier task from the lookup cache.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    kind : string
+        One of the kinds in lookup_cache_kinds.
+    key : string
+        What was looked up, e.g. a term URI.
+
+    Returns
+    -------
+    int|string|None
+        The result of the lookup, or None if it isn't cached.
+    """
+    cache = get_lookup_cache(config)
+    if cache is None:
+        return None
+    value = cache.get(kind, key)
+    metrics.increment(
+        "lookup_cache_hits" if value is not None else "lookup_cache_misses"
+    )
+    return value
+
+
+def cache_lookup(config: dict, kind: str, key: str, value: Union[int, str]) -> None:
+    """Adds the result of a lookup to the lookup cache, if it is enabled.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    kind : string
+        One of the kinds in lookup_cache_kinds.
+    key : string
+        What was looked up, e.g. a term URI.
+    value : int|string
+        The result of the lookup, e.g. a term ID.
+    """
+    cache = get_lookup_cache(config)
+    if cache is not None:
+        cache.set(kind, key, value)
+
+
+def clear_lookup_cache(config: dict, args: Namespace) -> None:
+    """Deletes the entries for config['host'] from the lookup cache, either all of them or
+    those of the kind given in the --clear_lookup_cache command-line option, and exits.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    args : Namespace
+        The command-line arguments.
+    """
+    if get_lookup_cache(config) is None:
+        message = 'The "lookup_cache_db_path" configuration setting is not set, so there is no lookup cache to clear.'
+        logging.error(message)
+        sys.exit("Error: " + message)
+    if args.clear_lookup_cache == "all":
+        kind = None
+    elif args.clear_lookup_cache in lookup_cache_kinds:
+        kind = args.clear_lookup_cache
+    else:
+        message = (
+            f'"{args.clear_lookup_cache}" is not a kind of lookup cache entry. Use one of '
+            + ", ".join(lookup_cache_kinds)
+            + ', or "all".'
+        )
+        logging.error(message)
+        sys.exit("Error: " + message)
+
+    num_entries = get_lookup_cache(config).clear(kind)
+    message = f'Deleted {num_entries} entries from the lookup cache at {config["lookup_cache_db_path"]}.'
+    print(message)
+    logging.info(message)
+    sys.exit()
+
+
+def get_request_rate_limiter(config: dict, method: str) -> Optional[TokenBucket]:
+    """Gets the token bucket that limits the rate of requests using the given HTTP method.
+    GET, HEAD, and OPTIONS requests are reads; all others are writes.
+
+    If 'rate_limit_db_path' is set, the buckets are kept in that SQLite database and shared
+    by all Workbench processes using it. Its path is passed to secondary tasks in the
+    ISLANDORA_WORKBENCH_RATE_LIMIT_DB_PATH environment variable, and secondary tasks whose
+    configuration doesn't set the rates use the ones set by the primary task.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    method : str
+        The HTTP method of the request.
+
+    Returns
+    -------
+    TokenBucket|None
+        The token bucket, or None if requests using the method are not rate limited.
+    """
+    global request_rate_limiters
+    with request_rate_limiters_lock:
+        if request_rate_limiters is None:
+            request_rate_limiters = dict()
+            db_path = config["rate_limit_db_path"]
+            if db_path is None:
+                db_path = os.environ.get("ISLANDORA_WORKBENCH_RATE_LIMIT_DB_PATH")
+            for budget in ["reads", "writes"]:
+                rate = config[f"rate_limit_{budget}_per_second"]
+                if db_path is not None:
+                    bucket = SharedTokenBucket(
+                        os.path.abspath(db_path),
+                        budget,
+                        rate,
+                        config["rate_limit_burst"],
+                    )
+                    if bucket.rate is not None:
+                        request_rate_limiters[budget] = bucket
+                elif rate is not None:
+                    request_rate_limiters[budget] = TokenBucket(
+                        rate, config["rate_limit_burst"]
+                    )
+                if budget in request_rate_limiters:
+                    logging.info(
+                        f"HTTP {budget} limited to {request_rate_limiters[budget].rate} per second"
+                        + (f' (shared through "{db_path}").' if db_path else ".")
+                    )
+            if db_path is not None:
+                os.environ["ISLANDORA_WORKBENCH_RATE_LIMIT_DB_PATH"] = os.path.abspath(
+                    db_path
+                )
+
+    if method.upper() in ["GET", "HEAD", "OPTIONS"]:
+        return request_rate_limiters.get("reads")
+    else:
+        return request_rate_limiters.get("writes")
+
+
 def convert_semver_to_number(version_string: str) -> tuple:
     """Convert a Semantic Version number (e.g. Drupal's) string to a tuple. We only need the
     major and minor numbers (e.g. 9.2).
@@ -1071,12 +1440,7 @@ def get_nid_from_url_alias(config: dict, url_alias_to_query: str) -> Union[int,
             f'{config["host"]}/{url_alias_to_query.lstrip("/")}?_format=json'
         )
 
-    alias_query_response = issue_request(config, "GET", alias_query_url)
-    if alias_query_response.status_code != 200:
-        return False
-    else:
-        alias_query_node = json.loads(alias_query_response.text)
-        return alias_query_node["nid"][0]["value"]
+    return get_entity_id_from_url_alias(config, "node", alias_query_url)
 
 
 def get_mid_from_media_url_alias(config: dict, url_alias: str) -> Union[int, bool]:
@@ -1099,13 +1463,7 @@ def get_mid_from_media_url_alias(config: dict, url_alias: str) -> Union[int, boo
     if url_alias.startswith("http://") and config["host"].startswith("https://"):
         url_alias = re.sub(r"^http://", "https://", url_alias, flags=re.IGNORECASE)
 
-    url = url_alias + "?_format=json"
-    response = issue_request(config, "GET", url)
-    if response.status_code != 200:
-        return False
-    else:
-        media = json.loads(response.text)
-        return media["mid"][0]["value"]
+    return get_entity_id_from_url_alias(config, "media", url_alias + "?_format=json")
 
 
 def get_tid_from_term_url_alias(config: dict, url_alias: str) -> Union[int, bool]:
@@ -1128,13 +1486,137 @@ def get_tid_from_term_url_alias(config: dict, url_alias: str) -> Union[int, bool
     if url_alias.startswith("http://") and config["host"].startswith("https://"):
         url_alias = re.sub(r"^http://", "https://", url_alias, flags=re.IGNORECASE)
 
-    url = url_alias + "?_format=json"
-    response = issue_request(config, "GET", url)
-    if response.status_code != 200:
-        return False
+    return get_entity_id_from_url_alias(
+        config, "taxonomy_term", url_alias + "?_format=json"
+    )
+
+
+def get_entity_id_from_url_alias(
+    config: dict, entity_type: str, alias_query_url: str
+) -> Union[int, bool]:
+    """Gets the ID of the node, media, or term at a URL alias (or canonical URL), querying
+    Drupal for each URL at most once per run. URLs that Drupal responds to with a 403 or 404
+    are remembered as not found; other failures are not, so they can be retried.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    entity_type : string
+        One of 'node', 'media', or 'taxonomy_term'.
+    alias_query_url : string
+        The URL to query, including the '?_format=json' query string.
+    Returns
+    -------
+    int|boolean
+        The entity ID, or False if the URL cannot be found.
+    """
+    key = (entity_type, alias_query_url)
+    with url_alias_cache_lock:
+        cached_entity_id = url_alias_cache.get(key)
+        if cached_entity_id is None:
+            url_alias_cache[key] = concurrent.futures.Future()
+    # Another thread is already querying this URL, or has queried it.
+    if cached_entity_id is not None:
+        return cached_entity_id.result()
+
+    id_keys = {"node": "nid", "media": "mid", "taxonomy_term": "tid"}
+    try:
+        entity_id = get_cached_lookup(
+            config, "url_aliases", entity_type + " " + alias_query_url
+        )
+        if entity_id is not None:
+            with url_alias_cache_lock:
+                url_alias_cache[key].set_result(entity_id)
+            return entity_id
+
+        response = issue_request(config, "GET", alias_query_url)
+        if response.status_code == 200:
+            entity_id = json.loads(response.text)[id_keys[entity_type]][0]["value"]
+            cache_lookup(
+                config, "url_aliases", entity_type + " " + alias_query_url, entity_id
+            )
+        else:
+            entity_id = False
+    except BaseException as e:
+        with url_alias_cache_lock:
+            url_alias_cache.pop(key).set_exception(e)
+        raise
+
+    with url_alias_cache_lock:
+        if entity_id is False and response.status_code not in [403, 404]:
+            url_alias_cache.pop(key).set_result(entity_id)
+        else:
+            url_alias_cache[key].set_result(entity_id)
+    return entity_id
+
+
+def forget_deleted_entity(
+    config: dict, entity_type: str, entity_id: Union[int, str]
+) -> None:
+    """Removes the URL aliases that resolve to a deleted node or media from the URL alias
+    cache and the lookup cache.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    entity_type : string
+        Either 'node' or 'media'.
+    entity_id : int|string
+        The deleted entity's ID.
+    """
+    entity_id = int(entity_id)
+    with url_alias_cache_lock:
+        for key in list(url_alias_cache):
+            future = url_alias_cache[key]
+            if (
+                key[0] == entity_type
+                and future.done()
+                and future.exception() is None
+                and future.result() == entity_id
+            ):
+                del url_alias_cache[key]
+    cache = get_lookup_cache(config)
+    if cache is not None:
+        for cached_entity_id in [entity_id, str(entity_id)]:
+            cache.delete_value("url_aliases", cached_entity_id, entity_type + " ")
+
+
+def warm_url_alias_cache(config: dict, entity_type: str, url_aliases: list) -> None:
+    """Resolves URL aliases (or canonical URLs) into the cache used by get_nid_from_url_alias()
+    and get_mid_from_media_url_alias(), querying Drupal for several at once, so that rows
+    identifying entities by URL don't each wait on their own query.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    entity_type : string
+        Either 'node' or 'media'.
+    url_aliases : list
+        The URL aliases to resolve. Numeric values and duplicates are skipped.
+    """
+    url_aliases = {
+        url_alias.strip()
+        for url_alias in url_aliases
+        if len(url_alias.strip()) > 0 and value_is_numeric(url_alias) is False
+    }
+    if len(url_aliases) == 0:
+        return
+
+    if entity_type == "media":
+        resolve = get_mid_from_media_url_alias
+        url_aliases = [
+            url_alias for url_alias in url_aliases if url_alias.startswith("http")
+        ]
     else:
-        term = json.loads(response.text)
-        return term["tid"][0]["value"]
+        resolve = get_nid_from_url_alias
+    logging.info(f"Resolving {len(url_aliases)} {entity_type} URL aliases.")
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=config["url_alias_cache_warm_up_threads"]
+    ) as executor:
+        list(executor.map(lambda url_alias: resolve(config, url_alias), url_aliases))
 
 
 def get_nid_from_url_without_config(url: str) -> Union[int, bool]:
@@ -2796,6 +3278,18 @@ def check_input(config: dict, args: Namespace) -> None:
                 logging.error(message)
                 sys.exit("Error: " + message)
 
+        if config["media_upload_scheduling"] not in [
+            False,
+            "largest_first",
+            "size_buckets",
+        ]:
+            message = (
+                'The "media_upload_scheduling" configuration setting must be one of "largest_first" or "size_buckets" '
+                + "(or false to create media as each node is created)."
+            )
+            logging.error(message)
+            sys.exit("Error: " + message)
+
         if (
             config["validate_fixity_during_check"] is True
             and config["fixity_algorithm"] is not None
@@ -4043,6 +4537,13 @@ def check_input(config: dict, args: Namespace) -> None:
             for pkey, pvalue in preprocessor_script.items():
                 field = pkey.strip()
                 script_path = pvalue.strip()
+                if script_path.startswith("python:"):
+                    plugin_path = script_path[len("python:") :].strip()
+                    if not os.path.exists(plugin_path):
+                        message = f'Preprocessor plugin "{plugin_path}" for field "{field}" not found.'
+                        logging.error(message)
+                        sys.exit("Error: " + message)
+                    continue
                 # Since in some cases script paths need to include the interpreter (e.g. "python /path/to/script"),
                 # we only check for the existence of the second part of the path name.
                 if " " in script_path:
@@ -4101,6 +4602,46 @@ def check_input(config: dict, args: Namespace) -> None:
                 logging.info(message)
                 print(message)
 
+    if config["adaptive_concurrency"] is True:
+        for pause_option in ["pause", "adaptive_pause"]:
+            if pause_option in config:
+                message = f'Configuration option "{pause_option}" is ignored because "adaptive_concurrency" is true.'
+                logging.warning(message)
+                print("Warning: " + message)
+
+    for rate_limit_option in [
+        "rate_limit_reads_per_second",
+        "rate_limit_writes_per_second",
+    ]:
+        if config[rate_limit_option] is not None and (
+            value_is_numeric(config[rate_limit_option], allow_decimals=True) is False
+            or float(config[rate_limit_option]) <= 0
+        ):
+            message = f'Configuration option "{rate_limit_option}" must be a number greater than 0.'
+            logging.error(message)
+            sys.exit("Error: " + message)
+
+    if (
+        config["entity_post_task_script_batch_size"] > 1
+        and config["entity_post_task_scripts_async"] is False
+    ):
+        message = 'Configuration option "entity_post_task_script_batch_size" is ignored because "entity_post_task_scripts_async" is false.'
+        logging.warning(message)
+        print("Warning: " + message)
+
+    if config["preprocessor_mode"] not in ["per_value", "persistent"]:
+        message = 'Configuration option "preprocessor_mode" must be either "per_value" or "persistent".'
+        logging.error(message)
+        sys.exit("Error: " + message)
+
+    if config["metrics_slow_row_threshold"] is not None and (
+        value_is_numeric(config["metrics_slow_row_threshold"], allow_decimals=True)
+        is False
+    ):
+        message = 'Configuration option "metrics_slow_row_threshold" must be a number of seconds.'
+        logging.error(message)
+        sys.exit("Error: " + message)
+
     if config["task"] == "export_csv":
         if "node_id" not in csv_column_headers:
             message = (
@@ -4115,6 +4656,25 @@ def check_input(config: dict, args: Namespace) -> None:
             logging.error(message)
             sys.exit("Error: " + message)
 
+        if config["export_output_format"] not in ["csv", "parquet"]:
+            message = 'Configuration option "export_output_format" must be either "csv" or "parquet".'
+            logging.error(message)
+            sys.exit("Error: " + message)
+
+        if config["export_file_skip_existing_algorithm"] is not None:
+            if config["export_file_skip_existing_algorithm"] not in [
+                "md5",
+                "sha1",
+                "sha256",
+            ]:
+                message = (
+                    "Configured export_file_skip_existing_algorithm '"
+                    + str(config["export_file_skip_existing_algorithm"])
+                    + "' must be one of 'md5', 'sha1', or 'sha256'."
+                )
+                logging.error(message)
+                sys.exit("Error: " + message)
+
         if config["export_file_directory"] is not None:
             if not os.path.exists(config["export_csv_file_path"]):
                 try:
@@ -4724,35 +5284,155 @@ def get_additional_files_config(config: dict) -> dict:
     return additional_files_entries
 
 
-def split_typed_relation_string(
-    config: dict, typed_relation_string: str, target_type: str
+def compile_create_plan(
+    config: dict, field_definitions: dict, csv_column_headers: list
 ) -> list:
-    """Fields of type 'typed_relation' are represented in the CSV file
-    using a structured string, specifically namespace:property:id,
-    e.g., 'relators:pht:5'. 'id' is either a term ID or a node ID. This
-    function takes one of those strings (optionally with a multivalue
-    subdelimiter) and returns a list of dictionaries in the form they
-    take in existing node values. ID values can also be term names (strings)
-    and term URIs (also strings, but in the form 'http....').
+    """Works out, once per "create" task, what to do with each of the input CSV's columns
+    other than "file", "title", and the ID column, so the task doesn't need to for every row.
 
-    Also, these values can (but don't need to) have an optional namespace
-    in the term ID segment, which is the vocabulary ID string. These
-    typed relation strings look like 'relators:pht:person:Jordan, Mark'.
-    However, since we split the typed relation strings only on the first
-    two :, the entire third segment is considered, for the purposes of
-    splitting the value, to be the term.
-    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
-    :param typed_relation_string: str - The typed relation string from the CSV.
-    :param target_type: str - The target type, currently only "taxonomy_term"
-    :return: list - A list of dictionaries representing the typed relations with keys target_id, rel_type, and target_type.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    field_definitions : dict
+        The field definitions for the content type, as returned by get_field_definitions().
+    csv_column_headers : list
+        The input CSV's column headers.
+    Returns
+    -------
+    list
+        A dict for each column, in CSV order, with the keys 'field' (the column header),
+        'preprocessors' (the paths of the preprocessor scripts to apply to the column's
+        values, in order), 'additional_file_media_use_tid' (the media use term ID if the
+        column is registered in 'additional_files', otherwise None), 'skip' (True if the
+        column's values aren't added to the node, e.g. reserved columns), and 'handler'
+        (the WorkbenchField used to add the column's values to the node, or None if
+        'skip' is True).
     """
-    typed_relation_string = typed_relation_string.strip()
-
-    return_list = []
-    if len(typed_relation_string) == 0:
-        return return_list
+    # Importing the workbench_fields module at the top of this module with the
+    # rest of the imports causes a circular import exception, so we do it here.
+    import workbench_fields
 
-    temp_list = typed_relation_string.split(config["subdelimiter"])
+    entity_fields = get_entity_fields(config, "node", config["content_type"])
+    # Only add config['id_field'] to required_fields if it is not a node field.
+    required_fields = ["file", "title"]
+    if config["id_field"] not in entity_fields:
+        required_fields.append(config["id_field"])
+    additional_files_entries = get_additional_files_config(config)
+    # These columns are reserved by Workbench and are not Drupal fields, or are base fields
+    # that create() adds to the node before its other fields ('langcode' is a core Drupal
+    # field, but is not considered a "base field").
+    reserved_columns = [
+        "uid",
+        "created",
+        "published",
+        "promote",
+        "parent_id",
+        "langcode",
+        "image_alt_text",
+        "url_alias",
+        "media_use_tid",
+        "checksum",
+        "directory",
+    ]
+
+    create_plan = []
+    for custom_field in csv_column_headers:
+        if custom_field in required_fields:
+            continue
+        # The following two patterns are valid: /fieldname: interpreter script_path/, and /fieldname: script_path/.
+        # Also, on Windows, both interpreter and script_path can contain colons.
+        preprocessors = []
+        if "preprocessors" in config and len(config["preprocessors"]) > 0:
+            for preprocessor in config["preprocessors"]:
+                for (
+                    processor_field_name,
+                    processor_script_path,
+                ) in preprocessor.items():
+                    if custom_field == processor_field_name:
+                        preprocessors.append(processor_script_path)
+
+        # We skip CSV columns whose headers use the 'media:video:field_foo' media track convention.
+        skip = (
+            custom_field in additional_files_entries
+            or custom_field in reserved_columns
+            or custom_field.startswith("media:")
+        )
+        if skip is False and custom_field not in field_definitions:
+            message = f'Column "{custom_field}" in your input CSV is not a field of content type "{config["content_type"]}"; its values will be ignored.'
+            print("Warning: " + message)
+            logging.warning(message)
+            skip = True
+
+        create_plan.append(
+            {
+                "field": custom_field,
+                "preprocessors": preprocessors,
+                "additional_file_media_use_tid": additional_files_entries.get(
+                    custom_field
+                ),
+                "skip": skip,
+                "handler": (
+                    None
+                    if skip
+                    else workbench_fields.WorkbenchFieldFactory.get_field_handler(
+                        field_definitions[custom_field]["field_type"]
+                    )
+                ),
+            }
+        )
+    return create_plan
+
+
+def get_additional_files_columns(create_plan: list) -> list:
+    """Gets the columns in a plan returned by compile_create_plan() that are registered in
+    the 'additional_files' config setting, i.e., those that name a file to create a media for.
+
+    Parameters
+    ----------
+    create_plan : list
+        The plan returned by compile_create_plan().
+    Returns
+    -------
+    list
+        The plan's entries for the columns, in CSV order.
+    """
+    return [
+        column
+        for column in create_plan
+        if column["additional_file_media_use_tid"] is not None
+    ]
+
+
+def split_typed_relation_string(
+    config: dict, typed_relation_string: str, target_type: str
+) -> list:
+    """Fields of type 'typed_relation' are represented in the CSV file
+    using a structured string, specifically namespace:property:id,
+    e.g., 'relators:pht:5'. 'id' is either a term ID or a node ID. This
+    function takes one of those strings (optionally with a multivalue
+    subdelimiter) and returns a list of dictionaries in the form they
+    take in existing node values. ID values can also be term names (strings)
+    and term URIs (also strings, but in the form 'http....').
+
+    Also, these values can (but don't need to) have an optional namespace
+    in the term ID segment, which is the vocabulary ID string. These
+    typed relation strings look like 'relators:pht:person:Jordan, Mark'.
+    However, since we split the typed relation strings only on the first
+    two :, the entire third segment is considered, for the purposes of
+    splitting the value, to be the term.
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param typed_relation_string: str - The typed relation string from the CSV.
+    :param target_type: str - The target type, currently only "taxonomy_term"
+    :return: list - A list of dictionaries representing the typed relations with keys target_id, rel_type, and target_type.
+    """
+    typed_relation_string = typed_relation_string.strip()
+
+    return_list = []
+    if len(typed_relation_string) == 0:
+        return return_list
+
+    temp_list = typed_relation_string.split(config["subdelimiter"])
     for item in temp_list:
         item_list = item.split(":", 2)
         if value_is_numeric(item_list[2]):
@@ -5276,6 +5956,7 @@ def execute_shutdown_script(
     return result, cmd.returncode
 
 
+@metrics.timed("post_task_scripts")
 def execute_entity_post_task_script(
     path_to_script: str,
     path_to_config_file: str,
@@ -5309,6 +5990,84 @@ def execute_entity_post_task_script(
     return result, cmd.returncode
 
 
+def execute_entity_post_task_scripts(
+    config: dict,
+    hook: str,
+    path_to_config_file: str,
+    http_response_code: int,
+    entity_json: str = "",
+    filename: str = "",
+) -> None:
+    """Executes the scripts registered in an entity post-task hook, e.g. 'node_post_create'. If
+    'entity_post_task_scripts_async' is true, the entity is queued for each script's background
+    HookExecutor instead, and failures are reported when the task finishes.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param hook: str - One of 'node_post_create', 'node_post_update', or 'media_post_create'.
+    :param path_to_config_file: str - The path to the Workbench configuration file.
+    :param http_response_code: int - The HTTP status code of the response creating or updating the entity.
+    :param entity_json: str - The body of that response.
+    :param filename: str - The media file's path, for 'media_post_create' scripts.
+    """
+    label = "Post " + " ".join(hook.split("_")[0::2]) + " script"
+    for command in config[hook]:
+        if config["entity_post_task_scripts_async"] is True:
+            with hook_executors_lock:
+                if (hook, command) not in hook_executors:
+                    hook_executors[(hook, command)] = HookExecutor(
+                        command,
+                        label,
+                        execute_entity_post_task_script,
+                        config["entity_post_task_script_workers"],
+                        config["entity_post_task_script_queue_size"],
+                        config["entity_post_task_script_batch_size"],
+                    )
+                hook_executor = hook_executors[(hook, command)]
+            hook_executor.submit(
+                path_to_config_file, http_response_code, entity_json, filename
+            )
+            continue
+
+        post_task_output, post_task_return_code = execute_entity_post_task_script(
+            command, path_to_config_file, http_response_code, entity_json, filename
+        )
+        if post_task_return_code == 0:
+            logging.info(label + " " + command + " executed successfully.")
+        else:
+            logging.error(
+                label
+                + " "
+                + command
+                + " failed with exit code "
+                + str(post_task_return_code)
+                + "."
+            )
+
+
+def close_hook_executors() -> None:
+    """Waits for background entity post-task scripts to finish, and reports any that failed."""
+    with hook_executors_lock:
+        for (hook, command), hook_executor in hook_executors.items():
+            hook_executor.close()
+            failed_entities = sum(
+                failure["entities"] for failure in hook_executor.failures
+            )
+            message = (
+                f"{hook_executor.label} {command} ran {hook_executor.runs} times for {hook_executor.entities} entities; "
+                + f"{len(hook_executor.failures)} runs, for {failed_entities} entities, failed."
+            )
+            if len(hook_executor.failures) > 0:
+                logging.error(message)
+                for failure in hook_executor.failures:
+                    logging.error(
+                        f'Exit code {failure["return_code"]} for {failure["entities"]} entities, output was "{failure["output"]}".'
+                    )
+                print("Warning: " + message + " See the log for more information.")
+            else:
+                logging.info(message)
+        hook_executors.clear()
+
+
 def execute_script_to_run(
     config: dict, path_to_script: str, entity_type: str, entity_id: str
 ) -> Union[tuple, None]:
@@ -5491,9 +6250,10 @@ def create_file(
     binary_data = open(file_path, "rb")
 
     try:
-        file_response = issue_request(
-            config, "POST", file_endpoint_path, file_headers, "", binary_data
-        )
+        with metrics.timer("file_upload"):
+            file_response = issue_request(
+                config, "POST", file_endpoint_path, file_headers, "", binary_data
+            )
         if file_response.status_code == 201:
             file_json = json.loads(file_response.text)
             file_id = file_json["fid"][0]["value"]
@@ -6012,9 +6772,10 @@ def create_media(
         )
         media_headers = {"Content-Type": "application/json"}
         try:
-            media_response = issue_request(
-                config, "POST", media_endpoint_path, media_headers, media_json
-            )
+            with metrics.timer("media_post"):
+                media_response = issue_request(
+                    config, "POST", media_endpoint_path, media_headers, media_json
+                )
             if media_response.status_code != 201:
                 logging.error(
                     'Media not created, POST request to "%s" returned an HTTP status code of "%s" and a response body of %s.',
@@ -6041,26 +6802,14 @@ def create_media(
 
             # Execute media-specific post-create scripts, if any are configured.
             if "media_post_create" in config and len(config["media_post_create"]) > 0:
-                for command in config["media_post_create"]:
-                    post_task_output, post_task_return_code = (
-                        execute_entity_post_task_script(
-                            command,
-                            config["config_file_path"],
-                            media_response.status_code,
-                            media_response.text,
-                            os.path.abspath(filename),
-                        )
-                    )
-                    if post_task_return_code == 0:
-                        logging.info(
-                            "Post media create script "
-                            + command
-                            + " executed successfully."
-                        )
-                    else:
-                        logging.error(
-                            "Post media create script " + command + " failed."
-                        )
+                execute_entity_post_task_scripts(
+                    config,
+                    "media_post_create",
+                    config["config_file_path"],
+                    media_response.status_code,
+                    media_response.text,
+                    os.path.abspath(filename),
+                )
 
             return media_response.status_code
         except requests.exceptions.RequestException as e:
@@ -6071,6 +6820,345 @@ def create_media(
         return file_result
 
 
+def get_input_dir_file_sizes(config: dict) -> dict:
+    """Scans the input directory once and returns the size of every file in it.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    Returns
+    -------
+    dict
+        File paths relative to config['input_dir'] (using "/" as the separator) mapped to
+        their sizes in bytes.
+    """
+    file_sizes = dict()
+    if not os.path.isdir(config["input_dir"]):
+        return file_sizes
+    for dir_path, dir_names, file_names in os.walk(config["input_dir"]):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+            relative_path = os.path.relpath(file_path, config["input_dir"])
+            try:
+                file_sizes[relative_path.replace(os.sep, "/")] = os.path.getsize(
+                    file_path
+                )
+            except OSError:
+                continue
+    return file_sizes
+
+
+def get_media_upload_file_size(
+    config: dict, filename: str, input_dir_file_sizes: dict
+) -> int:
+    """Gets the size of a file that is to be uploaded, for use in scheduling uploads.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    filename : str
+        The value of the CSV column containing the file (a relative path, an absolute path, or a URL).
+    input_dir_file_sizes : dict
+        The file sizes returned by get_input_dir_file_sizes().
+    Returns
+    -------
+    int
+        The size of the file in bytes, or 0 if the size is unknown (e.g., for remote files).
+    """
+    filename = filename.strip()
+    if filename.startswith("http"):
+        return 0
+    if os.path.isabs(filename):
+        file_path = filename
+    else:
+        normalized_filename = os.path.normpath(filename).replace(os.sep, "/")
+        if normalized_filename in input_dir_file_sizes:
+            return input_dir_file_sizes[normalized_filename]
+        file_path = os.path.join(config["input_dir"], filename)
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def schedule_media_uploads(config: dict, upload_jobs: list) -> list:
+    """Assigns media upload jobs to lanes (worker threads) using the file size of each job.
+
+    In "largest_first" mode, jobs are sorted by size, largest first, and each one is assigned
+    to the lane with the smallest total number of bytes so far (longest processing time first
+    scheduling). In "size_buckets" mode, jobs are grouped using the byte thresholds in
+    config['media_upload_size_buckets'], each non-empty bucket is given a number of lanes
+    proportional to its total bytes (at least one), and jobs within a bucket are then assigned
+    largest first. This keeps small files flowing while large files are being uploaded. If
+    there are more non-empty buckets than config['media_upload_lanes'], the buckets of the
+    smallest files are merged so that no more than that number of lanes are used.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    upload_jobs : list
+        List of dicts, each of which has a "size" key containing the file's size in bytes.
+    Returns
+    -------
+    list
+        A list of lanes, each of which is a list of upload jobs to be run in order.
+    """
+    num_lanes = max(1, int(config["media_upload_lanes"]))
+
+    def assign_largest_first(jobs, lane_count):
+        lanes = [[] for i in range(lane_count)]
+        lane_loads = [(0, i) for i in range(lane_count)]
+        for job in sorted(jobs, key=lambda job: job["size"], reverse=True):
+            load, lane_index = min(lane_loads)
+            lanes[lane_index].append(job)
+            lane_loads[lane_index] = (load + job["size"], lane_index)
+        return lanes
+
+    if config["media_upload_scheduling"] == "size_buckets":
+        thresholds = sorted(int(x) for x in config["media_upload_size_buckets"])
+        buckets = [[] for i in range(len(thresholds) + 1)]
+        for job in upload_jobs:
+            bucket_index = len([x for x in thresholds if job["size"] >= x])
+            buckets[bucket_index].append(job)
+        buckets = [bucket for bucket in buckets if len(bucket) > 0]
+        if len(buckets) == 0:
+            return []
+        while len(buckets) > num_lanes:
+            buckets[0:2] = [buckets[0] + buckets[1]]
+        total_bytes = sum(job["size"] for job in upload_jobs)
+        lanes_per_bucket = [1] * len(buckets)
+        spare_lanes = num_lanes - len(buckets)
+        if spare_lanes > 0 and total_bytes > 0:
+            shares = [
+                spare_lanes * sum(job["size"] for job in bucket) / total_bytes
+                for bucket in buckets
+            ]
+            for i, share in enumerate(shares):
+                lanes_per_bucket[i] += int(share)
+            # Distribute lanes lost to rounding to the buckets with the largest remainders.
+            remainders = sorted(
+                range(len(buckets)),
+                key=lambda i: shares[i] - int(shares[i]),
+                reverse=True,
+            )
+            for i in remainders[: num_lanes - sum(lanes_per_bucket)]:
+                lanes_per_bucket[i] += 1
+        lanes = []
+        for bucket, lane_count in zip(buckets, lanes_per_bucket):
+            lanes.extend(assign_largest_first(bucket, lane_count))
+    else:
+        lanes = assign_largest_first(upload_jobs, num_lanes)
+
+    return [lane for lane in lanes if len(lane) > 0]
+
+
+def get_projected_media_upload_makespan(config: dict, lanes: list) -> float:
+    """Estimates how long a media upload schedule will take to complete, i.e. the time it
+    takes the most heavily loaded lane to upload its files, using the throughput defined
+    in config['media_upload_estimated_bytes_per_second'].
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    lanes : list
+        The lanes returned by schedule_media_uploads().
+    Returns
+    -------
+    float
+        The projected makespan in seconds.
+    """
+    if len(lanes) == 0:
+        return 0.0
+    largest_lane_bytes = max(sum(job["size"] for job in lane) for lane in lanes)
+    return largest_lane_bytes / float(config["media_upload_estimated_bytes_per_second"])
+
+
+def media_upload_batch_is_full(config: dict, upload_jobs: list) -> bool:
+    """Whether the media upload jobs collected during a "create" task should be run now,
+    i.e. whether there are config['media_upload_batch_size'] of them or their files add
+    up to config['media_upload_batch_bytes'] bytes.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    upload_jobs : list
+        List of dicts, each of which has a "size" key containing the file's size in bytes.
+    Returns
+    -------
+    bool
+    """
+    if len(upload_jobs) >= int(config["media_upload_batch_size"]):
+        return True
+    return sum(job["size"] for job in upload_jobs) >= int(
+        config["media_upload_batch_bytes"]
+    )
+
+
+def get_media_upload_failures_csv_path(config: dict) -> str:
+    """Get the path to the CSV file that media uploads that failed are written to, which
+    is in the same directory as the rollback CSV file.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    Returns
+    -------
+    str
+        The absolute path to the CSV file.
+    """
+    now_string = EXECUTION_START_TIME.strftime("%Y_%m_%d_%H_%M_%S")
+    return os.path.join(
+        os.path.dirname(get_rollback_csv_filepath(config)),
+        f"media_upload_failures.{now_string}.csv",
+    )
+
+
+def write_media_upload_failures(config: dict, failed_jobs: list) -> None:
+    """Records media upload jobs whose media were not created. Each one is appended to the
+    CSV file at get_media_upload_failures_csv_path(), which can be used as the input CSV
+    of an "add_media" task once the problem has been fixed, and noted in a comment in the
+    rollback CSV file.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    failed_jobs : list
+        The upload jobs (see run_scheduled_media_uploads()) that failed, each with an
+        additional "status_code" key.
+    Returns
+    -------
+    None
+    """
+    if len(failed_jobs) == 0:
+        return
+    failures_csv_path = get_media_upload_failures_csv_path(config)
+    fieldnames = [
+        "node_id",
+        config["id_field"],
+        "file_fieldname",
+        "file",
+        "media_use_tid",
+        "status_code",
+    ]
+    write_header = not os.path.exists(failures_csv_path)
+    with open(failures_csv_path, "a+", newline="", encoding="utf-8") as failures_csv:
+        writer = csv.DictWriter(failures_csv, fieldnames=fieldnames)
+        if write_header is True:
+            writer.writeheader()
+        for job in failed_jobs:
+            writer.writerow(
+                {
+                    "node_id": job["node_id"],
+                    config["id_field"]: job["csv_row"].get(config["id_field"], ""),
+                    "file_fieldname": job["file_fieldname"],
+                    "file": job["filename"],
+                    "media_use_tid": job["media_use_tid"] or "",
+                    "status_code": job["status_code"],
+                }
+            )
+    with open(
+        get_rollback_csv_filepath(config), "a+", encoding="utf-8"
+    ) as rollback_csv_file:
+        for job in failed_jobs:
+            rollback_csv_file.write(
+                f'# Media for "{job["filename"]}" not created for node {job["node_id"]}, see {failures_csv_path}.\n'
+            )
+    message = f"{len(failed_jobs)} media not created; their files are listed in {failures_csv_path}."
+    print(message)
+    logging.warning(message)
+
+
+def run_scheduled_media_uploads(config: dict, upload_jobs: list) -> dict:
+    """Creates the media for the upload jobs collected during a "create" task, using the
+    schedule produced by schedule_media_uploads(). Each lane runs in its own thread. Jobs
+    whose media are not created are recorded using write_media_upload_failures().
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    upload_jobs : list
+        List of dicts with the keys "filename", "file_fieldname", "node_id", "node_uri",
+        "csv_row", "media_use_tid", and "size". Their values are passed to create_media().
+    Returns
+    -------
+    dict
+        Summary of the run, with the keys "files", "bytes", "lanes", "projected_makespan",
+        "actual_makespan", and "failed".
+    """
+    summary = {
+        "files": len(upload_jobs),
+        "bytes": sum(job["size"] for job in upload_jobs),
+        "lanes": 0,
+        "projected_makespan": 0.0,
+        "actual_makespan": 0.0,
+        "failed": 0,
+    }
+    if len(upload_jobs) == 0:
+        return summary
+
+    lanes = schedule_media_uploads(config, upload_jobs)
+    summary["lanes"] = len(lanes)
+    summary["projected_makespan"] = get_projected_media_upload_makespan(config, lanes)
+    message = (
+        f'Uploading {summary["files"]} files ({summary["bytes"]} bytes) using {summary["lanes"]} lane(s) and '
+        + f'"{config["media_upload_scheduling"]}" scheduling; projected makespan is {summary["projected_makespan"]:.2f} seconds.'
+    )
+    print(message)
+    logging.info(message)
+
+    allowed_media_response_codes = [201, 204]
+
+    def run_lane(lane):
+        failed = []
+        for job in lane:
+            media_response_status_code = create_media(
+                config,
+                job["filename"],
+                job["file_fieldname"],
+                job["node_id"],
+                job["csv_row"],
+                job["media_use_tid"],
+            )
+            if media_response_status_code in allowed_media_response_codes:
+                if config["progress_bar"] is False:
+                    print("+ Media for " + job["filename"] + " created.")
+                logging.info("Media for %s created.", job["filename"])
+            else:
+                failed.append(dict(job, status_code=media_response_status_code))
+                if config["progress_bar"] is False:
+                    print(
+                        "- ERROR: Media for "
+                        + job["filename"]
+                        + " not created. See log for more information."
+                    )
+                logging.error(
+                    "Media for %s (node %s) not created (HTTP respone code %s).",
+                    job["filename"],
+                    job["node_uri"],
+                    media_response_status_code,
+                )
+        return failed
+
+    failed_jobs = []
+    start_time = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+            for failed in executor.map(run_lane, lanes):
+                failed_jobs.extend(failed)
+    finally:
+        write_media_upload_failures(config, failed_jobs)
+    summary["failed"] = len(failed_jobs)
+    summary["actual_makespan"] = time.perf_counter() - start_time
+
+    message = (
+        f'Media upload schedule finished in {summary["actual_makespan"]:.2f} seconds (projected '
+        + f'{summary["projected_makespan"]:.2f} seconds); {summary["failed"]} of {summary["files"]} media not created.'
+    )
+    print(message)
+    logging.info(message)
+    return summary
+
+
 def patch_media_fields(
     config: dict, media_id: Union[int, str], media_type: str, node_csv_row: OrderedDict
 ) -> None:
@@ -6327,6 +7415,7 @@ def remove_media_and_file(config: dict, media_id: Union[int, str]) -> Union[int,
         media_response = issue_request(config, "DELETE", media_endpoint)
         if media_response.status_code == 204:
             logging.info("Media %s deleted.", media_id)
+            forget_deleted_entity(config, "media", media_id)
             return media_response.status_code
         else:
             logging.error(
@@ -6351,25 +7440,118 @@ def get_preprocessed_input_csv_file_path(config: dict) -> str:
     )
 
 
-def get_csv_data(
-    config: dict, csv_file_target: str = "node_fields", file_path: str = None
-) -> DictReader:
-    """Read the input CSV data and prepare it for use in all tasks that use an input CSV file.
-
-    This function reads the source CSV file (or the CSV dump from Google Sheets or Excel),
-    applies some prepocessing to each CSV record (specifically, it adds any CSV field
-    templates that are registered in the config file, and it filters out any CSV
-    records or lines in the CSV file that begine with a #), and finally, writes out
-    a version of the CSV data to a file that appends .preprocessed to the input
-    CSV file name. It is this .preprocessed file that is used in create, update, etc.
-    tasks.
+def get_csv_rows_to_process(config: dict) -> Optional[set]:
+    """Gets the IDs of the rows to process from the 'csv_rows_to_process' config setting, which
+    can be a list of IDs or the path to a file containing one ID per line.
     Parameters
-        ----------
-        config : dict
-            The configuration settings defined by workbench_config.get_config().
-        csv_file_target: string
-            Either 'node_fields' or 'taxonomy_fields'.
-        file_path: string
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    Returns
+    -------
+    set|None
+        The IDs, as strings, or None if all rows are to be processed.
+    """
+    csv_rows_to_process_allowed_tasks = [
+        "create",
+        "update",
+        "add_media",
+        "run_scripts",
+    ]
+    if (
+        "csv_rows_to_process" not in config
+        or config["task"] not in csv_rows_to_process_allowed_tasks
+        or len(config["csv_rows_to_process"]) == 0
+    ):
+        return None
+
+    if isinstance(config["csv_rows_to_process"], list):
+        return set(str(x) for x in config["csv_rows_to_process"])
+
+    path_to_ids_file = os.path.abspath(config["csv_rows_to_process"])
+    if not os.path.exists(path_to_ids_file):
+        message = f'File identified in the "csv_rows_to_process" config setting ({path_to_ids_file}) cannot be found.'
+        logging.error(message)
+        sys.exit("Error: " + message)
+    with open(path_to_ids_file) as fh:
+        return set(x for x in fh.read().splitlines() if x)
+
+
+def compile_csv_row_filters(config: dict):
+    """Compiles the 'csv_row_filters' config setting into a function that tests whether a
+    CSV row should be processed. Filters are "field:is:value" or "field:isnot:value"; a
+    value of '' or "" matches empty values. A field's values are split on the subdelimiter.
+    A row is skipped if all of its values in an "isnot" field are in that field's "isnot"
+    values, or if none of its values in an "is" field are in that field's "is" values. If
+    several fields have filters of the same kind, the last one present in the row decides.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    Returns
+    -------
+    function|None
+        A function that takes a CSV row and returns True if it should be processed, or
+        None if there are no filters.
+    """
+    if "csv_row_filters" not in config or len(config["csv_row_filters"]) == 0:
+        return None
+
+    row_filters_is = dict()
+    row_filters_isnot = dict()
+    for filter_config in config["csv_row_filters"]:
+        filter_field, filter_operator, filter_value = filter_config.split(":", 2)
+        if filter_value == "''" or filter_value == '""':
+            filter_value = ""
+        if filter_operator == "is":
+            row_filters_is.setdefault(filter_field, set()).add(filter_value.strip())
+        if filter_operator == "isnot":
+            row_filters_isnot.setdefault(filter_field, set()).add(filter_value.strip())
+    row_filters_is = list(row_filters_is.items())
+    row_filters_isnot = list(row_filters_isnot.items())
+    subdelimiter = config["subdelimiter"]
+
+    def row_passes_filters(row):
+        filter_out_this_csv_row = False
+        for filter_field, filter_values in row_filters_isnot:
+            if filter_field in row:
+                filter_out_this_csv_row = all(
+                    value.strip() in filter_values
+                    for value in row[filter_field].split(subdelimiter)
+                )
+        if filter_out_this_csv_row is True:
+            return False
+
+        for filter_field, filter_values in row_filters_is:
+            if filter_field in row:
+                filter_out_this_csv_row = not any(
+                    value.strip() in filter_values
+                    for value in row[filter_field].split(subdelimiter)
+                )
+        return filter_out_this_csv_row is False
+
+    return row_passes_filters
+
+
+def get_csv_data(
+    config: dict, csv_file_target: str = "node_fields", file_path: str = None
+) -> DictReader:
+    """Read the input CSV data and prepare it for use in all tasks that use an input CSV file.
+
+    This function reads the source CSV file (or the CSV dump from Google Sheets or Excel),
+    applies some prepocessing to each CSV record (specifically, it adds any CSV field
+    templates that are registered in the config file, and it filters out any CSV
+    records or lines in the CSV file that begine with a #), and finally, writes out
+    a version of the CSV data to a file that appends .preprocessed to the input
+    CSV file name. It is this .preprocessed file that is used in create, update, etc.
+    tasks.
+    Parameters
+        ----------
+        config : dict
+            The configuration settings defined by workbench_config.get_config().
+        csv_file_target: string
+            Either 'node_fields' or 'taxonomy_fields'.
+        file_path: string
             The path to the file to check (applies only to vocabulary CSVs).
         Returns
         -------
@@ -6381,6 +7563,18 @@ def get_csv_data(
     if csv_file_target == "node_fields":
         file_path = config["input_csv"]
 
+    # If the preprocessed file was already written from the same input CSV and config during
+    # this task, read it again instead of preprocessing the input CSV again.
+    preprocessed_csv_path = get_preprocessed_input_csv_file_path(config)
+    fingerprint = get_csv_data_fingerprint(config, csv_file_target, file_path)
+    preprocessed_csv_file = preprocessed_csv_files.get(preprocessed_csv_path)
+    if (
+        preprocessed_csv_file is not None
+        and preprocessed_csv_file["fingerprint"] == fingerprint
+        and preprocessed_csv_file["file_stat"] == get_file_stat(preprocessed_csv_path)
+    ):
+        return open_preprocessed_csv(config, preprocessed_csv_path)
+
     if os.path.isabs(file_path):
         input_csv_path = file_path
     elif file_path.startswith("http") is True:
@@ -6414,8 +7608,6 @@ def get_csv_data(
         logging.error(message)
         sys.exit(message)
 
-    preprocessed_csv_path = get_preprocessed_input_csv_file_path(config)
-
     csv_writer_file_handle = open(
         preprocessed_csv_path, "w+", newline="", encoding="utf-8"
     )
@@ -6470,6 +7662,32 @@ def get_csv_data(
             logging.error(message)
             sys.exit("Error: " + message)
 
+    # Resolve the node and media URLs in the CSV several at a time, before the rows that
+    # use them are processed one at a time.
+    if config["warm_url_alias_cache"] is True and csv_file_target == "node_fields":
+        url_aliases = {"node": [], "media": []}
+        with open(input_csv_path, "r", encoding="utf-8-sig", newline="") as csv_file:
+            warm_up_csv_reader = csv.DictReader(
+                csv_file,
+                fieldnames=csv_reader_fieldnames,
+                delimiter=config["delimiter"],
+                restval="",
+            )
+            next(warm_up_csv_reader, None)
+            for row in warm_up_csv_reader:
+                if str(next(iter(row.values()), "")).strip().startswith("#"):
+                    continue
+                if row.get("node_id"):
+                    url_aliases["node"].append(row["node_id"])
+                if row.get("field_member_of"):
+                    url_aliases["node"].extend(
+                        row["field_member_of"].split(config["subdelimiter"])
+                    )
+                if row.get("media_id"):
+                    url_aliases["media"].append(row["media_id"])
+        for entity_type, entity_url_aliases in url_aliases.items():
+            warm_url_alias_cache(config, entity_type, entity_url_aliases)
+
     if config["task"] == "run_scripts":
         run_scripts_entity_type = config["run_scripts_entity_type"]
         id_columns = {"node": "node_id", "media": "media_id", "term": "term_id"}
@@ -6504,6 +7722,32 @@ def get_csv_data(
         if "field_viewer_override" not in csv_reader_fieldnames:
             csv_reader_fieldnames.append("field_viewer_override")
 
+    # Seek straight to the row in config['csv_start_row'] using the input CSV's row index,
+    # instead of parsing all of the rows before it.
+    csv_rows_skipped_by_index = 0
+    if (
+        config["csv_row_index"] is True
+        and csv_file_target == "node_fields"
+        and config["csv_start_row"] > 1
+    ):
+        start_row_offset = get_csv_row_offset(
+            config, input_csv_path, config["csv_start_row"] - 1
+        )
+        if start_row_offset is not None:
+            csv_reader_file_handle.close()
+            input_csv_file = open(input_csv_path, "rb")
+            input_csv_file.seek(start_row_offset)
+            csv_reader_file_handle = io.TextIOWrapper(
+                input_csv_file, encoding="utf-8", newline=""
+            )
+            csv_reader = csv.DictReader(
+                csv_reader_file_handle,
+                fieldnames=csv_reader.fieldnames,
+                delimiter=config["delimiter"],
+                restval="stringtopopulateextrafields",
+            )
+            csv_rows_skipped_by_index = config["csv_start_row"] - 1
+
     # CSV field templates and CSV value templates currently apply only to node CSV files, not vocabulary CSV files.
     tasks = ["create", "update", "add_media"]
     if (
@@ -6529,44 +7773,20 @@ def get_csv_data(
         )
         csv_writer.writeheader()
         row_num = 0
+        row_count = 0
         unique_identifiers = []
 
-        # Prepare any "csv_row_filters", which we apply to each row, below.
-        if "csv_row_filters" in config and len(config["csv_row_filters"]) > 0:
-            row_filters_is = dict()
-            row_filters_isnot = dict()
-            # First define the field/operator pairs.
-            for filter_config in config["csv_row_filters"]:
-                filter_group = filter_config.split(":", 2)
-                if filter_group[1] == "is":
-                    filter_group_field = filter_group[0]
-                    # TODO: delete below unused variable or add it to row_filters_is[filter_group_field]?
-                    filter_group_value = filter_group[2]
-                    row_filters_is[filter_group_field] = []
-                if filter_group[1] == "isnot":
-                    filter_group_field = filter_group[0]
-                    # TODO: delete below unused variable or add it to row_filters_isnot[filter_group_field]?
-                    filter_group_value = filter_group[2]
-                    row_filters_isnot[filter_group_field] = []
-
-            # Then populate the lists of filter values.
-            for filter_config in config["csv_row_filters"]:
-                filter_group = filter_config.split(":", 2)
-                # Prepare the '' filter value.
-                if filter_group[2] == "''" or filter_group[2] == '""':
-                    filter_group[2] = ""
-                if filter_group[1] == "is":
-                    filter_group_field = filter_group[0]
-                    filter_group_value = filter_group[2]
-                    row_filters_is[filter_group_field].append(
-                        filter_group_value.strip()
-                    )
-                if filter_group[1] == "isnot":
-                    filter_group_field = filter_group[0]
-                    filter_group_value = filter_group[2]
-                    row_filters_isnot[filter_group_field].append(
-                        filter_group_value.strip()
-                    )
+        # Load the IDs in "csv_rows_to_process" and compile the "csv_row_filters" once,
+        # so selecting each row below is a set lookup and a single pass over its values.
+        rows_to_process = get_csv_rows_to_process(config)
+        row_passes_filters = compile_csv_row_filters(config)
+        if "csv_start_row_skip" in config and "csv_stop_row_skip" in config:
+            csv_rows_to_skip = range(
+                int(config["csv_start_row_skip"]),
+                int(config["csv_stop_row_skip"]) + 1,
+            )
+        else:
+            csv_rows_to_skip = range(0)
 
         if config["task"] == "run_scripts":
             if config["run_scripts_entity_type"] == "node":
@@ -6582,99 +7802,29 @@ def get_csv_data(
             csv_start_row = config["csv_start_row"] - 1
         else:
             csv_start_row = config["csv_start_row"]
+        csv_start_row, csv_stop_row = get_csv_row_slice(
+            config, csv_start_row, csv_rows_skipped_by_index
+        )
 
-        for row in itertools.islice(csv_reader, csv_start_row, config["csv_stop_row"]):
+        for row in itertools.islice(csv_reader, csv_start_row, csv_stop_row):
             row_num += 1
 
-            if (
-                "csv_start_row_skip" in config
-                and "csv_stop_row_skip" in config
-                and (
-                    int(config["csv_start_row_skip"])
-                    <= int(row_num)
-                    <= int(config["csv_stop_row_skip"])
-                )
-            ):
+            if row_num in csv_rows_to_skip:
                 continue
 
             if "node_id" in row and value_is_numeric(row["node_id"]) is False:
                 row["node_id"] = get_nid_from_url_alias(config, row["node_id"])
 
-            csv_rows_to_process_allowed_tasks = [
-                "create",
-                "update",
-                "add_media",
-                "run_scripts",
-            ]
-
-            # If the value in config['csv_rows_to_process'] is a path to a file, skip rows not identified in the file.
+            # Skip rows not identified in config['csv_rows_to_process'].
             if (
-                "csv_rows_to_process" in config
-                and config["task"] in csv_rows_to_process_allowed_tasks
-                and len(config["csv_rows_to_process"]) > 0
-                and isinstance(config["csv_rows_to_process"], str)
+                rows_to_process is not None
+                and row[config["id_field"]] not in rows_to_process
             ):
-                path_to_ids_file = os.path.abspath(config["csv_rows_to_process"])
-                if os.path.exists(path_to_ids_file):
-                    with open(path_to_ids_file) as fh:
-                        ids_to_process = fh.read().splitlines()
-                        ids_to_process = [x for x in ids_to_process if x]
-                else:
-                    message = f'File identified in the "csv_rows_to_process" config setting ({path_to_ids_file}) cannot be found.'
-                    logging.error(message)
-                    sys.exit("Error: " + message)
-                if row[config["id_field"]] not in ids_to_process:
-                    continue
-
-            # If the value of in config['csv_rows_to_process'] is a list, skip the rows not in the list.
-            if (
-                "csv_rows_to_process" in config
-                and config["task"] in csv_rows_to_process_allowed_tasks
-                and len(config["csv_rows_to_process"]) > 0
-                and isinstance(config["csv_rows_to_process"], list)
-            ):
-                config["csv_rows_to_process"] = [
-                    str(x) for x in config["csv_rows_to_process"]
-                ]
-                if row[config["id_field"]] not in config["csv_rows_to_process"]:
-                    continue
-
-            # Apply the "is" and "isnot" csv_row_filters defined above. If the field/value
-            # combo is in the 'isnot' list, skip this row.
-            filter_out_this_csv_row = False
-            if "csv_row_filters" in config and len(config["csv_row_filters"]) > 0:
-                if len(row_filters_isnot) > 0:
-                    for filter_field, filter_values in row_filters_isnot.items():
-                        if len(filter_values) > 0 and filter_field in row:
-                            # Split out multiple field values to test each one.
-                            values_in_row_field = row[filter_field].split(
-                                config["subdelimiter"]
-                            )
-                            for value_in_row_field in values_in_row_field:
-                                filter_out_this_csv_row = False
-                                if value_in_row_field.strip() in filter_values:
-                                    filter_out_this_csv_row = True
-                                else:
-                                    break
-                if filter_out_this_csv_row is True:
-                    continue
+                continue
 
-                # If the field/value combo is not in the 'is' list, skip this row.
-                if len(row_filters_is) > 0:
-                    for filter_field, filter_values in row_filters_is.items():
-                        if len(filter_values) > 0 and filter_field in row:
-                            # Split out multiple field values to test each one.
-                            values_in_row_field = row[filter_field].split(
-                                config["subdelimiter"]
-                            )
-                            for value_in_row_field in values_in_row_field:
-                                filter_out_this_csv_row = False
-                                if value_in_row_field.strip() not in filter_values:
-                                    filter_out_this_csv_row = True
-                                else:
-                                    break
-                if filter_out_this_csv_row is True:
-                    continue
+            # Apply the "is" and "isnot" csv_row_filters.
+            if row_passes_filters is not None and row_passes_filters(row) is False:
+                continue
 
             # Remove columns specified in config['ignore_csv_columns'].
             if len(config["ignore_csv_columns"]) > 0:
@@ -6738,6 +7888,7 @@ def get_csv_data(
 
                     row = clean_csv_values(config, row)
                     csv_writer.writerow(row)
+                    row_count += 1
                 except ValueError:
                     # Note: this message is also generated in check_input().
                     message = (
@@ -6782,13 +7933,17 @@ def get_csv_data(
         )
         csv_writer.writeheader()
         row_num = 0
+        row_count = 0
         # We subtract 1 from config['csv_start_row'] so user's expectation of the actual
         # start row match up with Python's 0-based counting.
         if config["csv_start_row"] > 0:
             csv_start_row = config["csv_start_row"] - 1
         else:
             csv_start_row = config["csv_start_row"]
-        for row in itertools.islice(csv_reader, csv_start_row, config["csv_stop_row"]):
+        csv_start_row, csv_stop_row = get_csv_row_slice(
+            config, csv_start_row, csv_rows_skipped_by_index
+        )
+        for row in itertools.islice(csv_reader, csv_start_row, csv_stop_row):
             row_num += 1
 
             if (
@@ -6843,6 +7998,7 @@ def get_csv_data(
 
                     row = clean_csv_values(config, row)
                     csv_writer.writerow(row)
+                    row_count += 1
                 except ValueError:
                     # Note: this message is also generated in check_input().
                     message = (
@@ -6863,6 +8019,27 @@ def get_csv_data(
                     sys.exit("Error: " + message)
 
     csv_writer_file_handle.close()
+    preprocessed_csv_files[preprocessed_csv_path] = {
+        "fingerprint": fingerprint,
+        "file_stat": get_file_stat(preprocessed_csv_path),
+        "row_count": row_count,
+    }
+    return open_preprocessed_csv(config, preprocessed_csv_path)
+
+
+def open_preprocessed_csv(config: dict, preprocessed_csv_path: str) -> DictReader:
+    """Opens a preprocessed CSV file written by get_csv_data().
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    preprocessed_csv_path : string
+        The path to the preprocessed CSV file.
+    Returns
+    -------
+    preprocessed_csv_reader
+        The CSV DictReader object.
+    """
     preprocessed_csv_reader_file_handle = open(
         preprocessed_csv_path, "r", encoding="utf-8"
     )
@@ -6874,13 +8051,298 @@ def get_csv_data(
     return preprocessed_csv_reader
 
 
+def get_file_stat(path: str) -> Union[list, None]:
+    """Gets the size and modification time of a file, or None if it doesn't exist.
+    Parameters
+    ----------
+    path : string
+        The path to the file.
+    Returns
+    -------
+    list|None
+        The file's size in bytes and its modification time in nanoseconds.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def get_csv_data_fingerprint(config: dict, csv_file_target: str, file_path: str) -> str:
+    """Gets a fingerprint of everything get_csv_data() writes a preprocessed CSV file from:
+    the input CSV file's path, size and modification time, and the configuration settings.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    csv_file_target: string
+        Either 'node_fields' or 'taxonomy_fields'.
+    file_path: string
+        The input CSV file's path, as passed to get_csv_data().
+    Returns
+    -------
+    string
+        The fingerprint.
+    """
+    if file_path.startswith("http"):
+        # A Google Sheet is only downloaded once per task.
+        file_stat = None
+    elif os.path.isabs(file_path):
+        file_stat = get_file_stat(file_path)
+    else:
+        file_stat = get_file_stat(os.path.join(config["input_dir"], file_path))
+    fingerprint = json.dumps(
+        [csv_file_target, file_path, file_stat, config], sort_keys=True, default=str
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def get_csv_row_count(
+    config: dict, csv_file_target: str = "node_fields", file_path: str = None
+) -> int:
+    """Gets the number of rows in the preprocessed CSV data, without reading it.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    csv_file_target: string
+        Either 'node_fields' or 'taxonomy_fields'.
+    file_path: string
+        The path to the file to check (applies only to vocabulary CSVs).
+    Returns
+    -------
+    int
+        The number of rows that get_csv_data() returns.
+    """
+    get_csv_data(config, csv_file_target, file_path)
+    return preprocessed_csv_files[get_preprocessed_input_csv_file_path(config)][
+        "row_count"
+    ]
+
+
+def get_csv_row_slice(config: dict, csv_start_row: int, csv_rows_skipped: int) -> tuple:
+    """Gets the start and stop arguments to itertools.islice() that select the rows from
+    config['csv_start_row'] to config['csv_stop_row'], from a CSV reader that has already
+    skipped some rows.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    csv_start_row : int
+        The 0-based index of the first row to select.
+    csv_rows_skipped : int
+        The number of rows the CSV reader has skipped by seeking.
+    Returns
+    -------
+    tuple
+        The start and stop arguments.
+    """
+    if config["csv_stop_row"] is None:
+        csv_stop_row = None
+    else:
+        csv_stop_row = max(0, int(config["csv_stop_row"]) - csv_rows_skipped)
+    return max(0, csv_start_row - csv_rows_skipped), csv_stop_row
+
+
+def get_csv_row_index_path(config: dict, input_csv_path: str) -> str:
+    """Get the path to the row index of an input CSV file.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param input_csv_path: str - The path to the input CSV file.
+    :return: str - The path to the row index file.
+    """
+    return os.path.join(config["temp_dir"], os.path.basename(input_csv_path)) + ".index"
+
+
+def write_csv_row_index(config: dict, input_csv_path: str) -> Union[str, None]:
+    """Writes an index of the byte offset of each row in an input CSV file, so that
+    get_csv_row_offset() can find a row without parsing the rows before it. The file is
+    parsed with the csv module, so values containing quoted newlines are handled the
+    same way as in get_csv_data().
+
+    The index file contains a line of JSON identifying the CSV file it was written from,
+    followed by the offsets, as 8-byte unsigned integers: one for each data row (skipping
+    empty rows, as DictReader does) and one for the end of the file.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    input_csv_path : string
+        The path to the input CSV file.
+    Returns
+    -------
+    string|None
+        The path to the index file, or None if the CSV file could not be indexed.
+    """
+    offsets = array.array("Q")
+    position = 0
+
+    def read_lines(csv_file):
+        nonlocal position
+        for line_num, line in enumerate(csv_file):
+            position += len(line)
+            # 'utf-8-sig' skips a Microsoft BOM at the start of the file.
+            yield line.decode("utf-8-sig" if line_num == 0 else "utf-8")
+
+    try:
+        with open(input_csv_path, "rb") as csv_file:
+            csv_reader = csv.reader(read_lines(csv_file), delimiter=config["delimiter"])
+            row_start = position
+            for row_num, row in enumerate(csv_reader):
+                # The first row is the header, even if it's empty.
+                if row_num > 0 and len(row) > 0:
+                    offsets.append(row_start)
+                row_start = position
+            offsets.append(position)
+    except (csv.Error, UnicodeDecodeError) as e:
+        logging.warning(f'Could not index the rows in CSV file "{input_csv_path}": {e}')
+        return None
+
+    source_stat = get_file_stat(input_csv_path)
+    index_path = get_csv_row_index_path(config, input_csv_path)
+    temp_index_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(temp_index_path, "wb") as index_file:
+        index_file.write(
+            (
+                json.dumps({"source": source_stat, "delimiter": config["delimiter"]})
+                + "\n"
+            ).encode("utf-8")
+        )
+        index_file.write(offsets.tobytes())
+    # Replace any existing index in one step, since parallel tasks may share it.
+    os.replace(temp_index_path, index_path)
+    logging.info(f'Indexed {len(offsets) - 1} rows in CSV file "{input_csv_path}".')
+    return index_path
+
+
+def get_csv_row_index(config: dict, input_csv_path: str) -> Union[tuple, None]:
+    """Gets the row index of an input CSV file, writing it if it doesn't exist or the CSV
+    file has changed since it was written.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    input_csv_path : string
+        The path to the input CSV file.
+    Returns
+    -------
+    tuple|None
+        The path to the index file and the length of its JSON line, or None if the CSV
+        file could not be indexed.
+    """
+    index_path = get_csv_row_index_path(config, input_csv_path)
+    for attempt in range(2):
+        try:
+            with open(index_path, "rb") as index_file:
+                index_header = index_file.readline()
+            index_info = json.loads(index_header)
+            if index_info == {
+                "source": get_file_stat(input_csv_path),
+                "delimiter": config["delimiter"],
+            }:
+                return index_path, len(index_header)
+        except (OSError, ValueError):
+            pass
+        if attempt == 0 and write_csv_row_index(config, input_csv_path) is None:
+            return None
+    return None
+
+
+def get_csv_row_offset(
+    config: dict, input_csv_path: str, row_index: int
+) -> Union[int, None]:
+    """Gets the byte offset in an input CSV file of a data row, from its row index.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    input_csv_path : string
+        The path to the input CSV file.
+    row_index : int
+        The 0-based number of the data row, not counting the header row. The number of
+        data rows gets the offset of the end of the file.
+    Returns
+    -------
+    int|None
+        The byte offset, or None if the CSV file could not be indexed or doesn't have
+        that many rows.
+    """
+    index = get_csv_row_index(config, input_csv_path)
+    if index is None:
+        return None
+    index_path, index_header_length = index
+    with open(index_path, "rb") as index_file:
+        index_file.seek(index_header_length + 8 * row_index)
+        offset = index_file.read(8)
+    if len(offset) < 8:
+        return None
+    return array.array("Q", offset)[0]
+
+
+def get_input_csv_row_count(config: dict, input_csv_path: str) -> Union[int, None]:
+    """Gets the number of data rows in an input CSV file from its row index, without
+    parsing it (once the index has been written). Unlike get_csv_row_count(), this
+    includes commented-out rows and rows filtered out by configuration settings.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    input_csv_path : string
+        The path to the input CSV file.
+    Returns
+    -------
+    int|None
+        The number of rows, or None if the CSV file could not be indexed.
+    """
+    index = get_csv_row_index(config, input_csv_path)
+    if index is None:
+        return None
+    index_path, index_header_length = index
+    return (os.path.getsize(index_path) - index_header_length) // 8 - 1
+
+
+def get_csv_shard_ranges(
+    config: dict, num_shards: int, input_csv_path: str = None
+) -> list:
+    """Splits an input CSV file's rows into contiguous ranges, for running the same task
+    on each range in parallel, e.g. with one config file per range.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    num_shards : int
+        The number of ranges to split the rows into.
+    input_csv_path : string
+        The path to the input CSV file. Defaults to config['input_csv'] in config['input_dir'].
+    Returns
+    -------
+    list
+        A list of (csv_start_row, csv_stop_row) tuples, in the form used by the
+        'csv_start_row' and 'csv_stop_row' config settings. Empty if the CSV file
+        could not be indexed.
+    """
+    if input_csv_path is None:
+        input_csv_path = os.path.join(config["input_dir"], config["input_csv"])
+    row_count = get_input_csv_row_count(config, input_csv_path)
+    if row_count is None or row_count == 0:
+        return []
+    num_shards = max(1, min(int(num_shards), row_count))
+    shard_ranges = []
+    for shard in range(num_shards):
+        csv_start_row = shard * row_count // num_shards + 1
+        csv_stop_row = (shard + 1) * row_count // num_shards
+        shard_ranges.append((csv_start_row, csv_stop_row))
+    return shard_ranges
+
+
 def find_term_in_vocab(
     config: dict, vocab_id: str, term_name_to_find: str
 ) -> Union[int, bool]:
     """Query the Term from term name View using the vocab_id to see if term_name_to_find is
     is found in that vocabulary. If so, returns the term ID; if not returns False. If
-    more than one term found, returns the term ID of the first one. Also populates global
-    lists of terms (checked_terms and newly_created_terms) to reduce queries to Drupal.
+    more than one term found, returns the term ID of the first one. Also uses the global
+    list checked_terms and the global term_ids_by_name index to reduce queries to Drupal.
     Parameters
     ----------
     config : dict
@@ -6937,13 +8399,19 @@ def find_term_in_vocab(
                 else:
                     return False
 
-    for newly_created_term in newly_created_terms:
-        if (
-            newly_created_term["vocab_id"] == vocab_id
-            and newly_created_term["name_for_matching"]
-            == term_name_to_find.lower().strip()
-        ):
-            return newly_created_term["tid"]
+    term_id = term_ids_by_name.get(
+        (vocab_id.strip(), term_name_to_find.lower().strip())
+    )
+    if term_id is not None:
+        return term_id
+    # All of the terms in a prefetched vocabulary are in term_ids_by_name.
+    if vocab_id.strip() in prefetched_vocabularies:
+        return False
+    term_id = get_cached_lookup(
+        config, "term_names", vocab_id.strip() + ":" + term_name_to_find.lower().strip()
+    )
+    if term_id is not None:
+        return term_id
 
     url = (
         config["host"]
@@ -6990,6 +8458,12 @@ def find_term_in_vocab(
                 }
                 if checked_term_to_add not in checked_terms:
                     checked_terms.append(checked_term_to_add)
+            cache_lookup(
+                config,
+                "term_names",
+                vocab_id.strip() + ":" + term_name_to_find.lower().strip(),
+                term_data[0]["tid"][0]["value"],
+            )
             return term_data[0]["tid"][0]["value"]
         # Term name is found.
         else:
@@ -7003,6 +8477,12 @@ def find_term_in_vocab(
                 }
                 if checked_term_to_add not in checked_terms:
                     checked_terms.append(checked_term_to_add)
+            cache_lookup(
+                config,
+                "term_names",
+                vocab_id.strip() + ":" + term_name_to_find.lower().strip(),
+                term_data[0]["tid"][0]["value"],
+            )
             return term_data[0]["tid"][0]["value"]
     else:
         logging.warning(
@@ -7014,26 +8494,215 @@ def find_term_in_vocab(
         return False
 
 
-def get_term_vocab(config: dict, term_id: Union[int, str]) -> Union[str, bool]:
-    """Get the term's parent vocabulary ID and return it. If the term doesn't
-    exist, return False.
+def get_term_cache_entry(term_data: dict) -> dict:
+    """Reduce a term's JSON representation to the values stored in term_data_cache.
+    Parameters
+    :param term_data: dict - The term's JSON representation, from /taxonomy/term/{tid}?_format=json.
+    :return: dict - The term's vocabulary ID ("vid"), name ("name"), and URI ("uri", None if it has none).
+    """
+    uri = None
+    for uri_field_name in ["field_external_uri", "field_authority_link"]:
+        if uri_field_name in term_data:
+            if len(term_data[uri_field_name]) > 0:
+                uri = term_data[uri_field_name][0]["uri"]
+            break
+    return {
+        "vid": term_data["vid"][0]["target_id"],
+        "name": term_data["name"][0]["value"],
+        "uri": uri,
+    }
+
+
+def cache_term_data(config: dict, term_id: Union[int, str], entry: Union[dict, bool]):
+    """Add a term to term_data_cache, evicting the least recently used terms if the
+    cache is larger than config['term_cache_size'].
     Parameters
     :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
     :param term_id: int|string - The term ID.
-    :return: str|bool - The vocabulary ID, or False if the term doesn't exist.
+    :param entry: dict|bool - The value returned by get_term_cache_entry(), or False if the term doesn't exist.
     """
-    url = config["host"] + "/taxonomy/term/" + str(term_id).strip() + "?_format=json"
+    if int(config["term_cache_size"]) < 1:
+        return
+    with term_data_cache_lock:
+        term_data_cache[str(term_id).strip()] = entry
+        term_data_cache.move_to_end(str(term_id).strip())
+        while len(term_data_cache) > int(config["term_cache_size"]):
+            term_data_cache.popitem(last=False)
+
+
+def forget_term_data(term_id: Union[int, str]):
+    """Remove a term from term_data_cache, e.g. after it has been updated, so the next
+    request for it queries Drupal.
+    Parameters
+    :param term_id: int|string - The term ID.
+    """
+    with term_data_cache_lock:
+        term_data_cache.pop(str(term_id).strip(), None)
+
+
+def get_cached_term_data(config: dict, term_id: Union[int, str]) -> Union[dict, bool]:
+    """Get a term's vocabulary ID, name, and URI, querying Drupal only the first time
+    a term ID is requested. Used by get_term_vocab(), get_term_name(), and get_term_uri()
+    so that serializing the same terms in many nodes (e.g. in export_csv tasks with
+    'export_csv_term_mode: name') costs one request per distinct term.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param term_id: int|string - The term ID.
+    :return: dict|bool - The value returned by get_term_cache_entry(), or False if the term doesn't exist.
+    """
+    term_id = str(term_id).strip()
+    with term_data_cache_lock:
+        if term_id in term_data_cache:
+            term_data_cache.move_to_end(term_id)
+            return term_data_cache[term_id]
+
+    url = config["host"] + "/taxonomy/term/" + term_id + "?_format=json"
     response = issue_request(config, "GET", url)
     if response.status_code == 200:
-        term_data = response.json()
-        return term_data["vid"][0]["target_id"]
+        entry = get_term_cache_entry(response.json())
     else:
         logging.warning(
             'Query for term ID "%s" returned a %s status code',
             term_id,
             response.status_code,
         )
+        # Only remember that a term doesn't exist if Drupal says so; other errors
+        # (e.g. a 503) may not happen the next time the term is requested.
+        if response.status_code not in [403, 404]:
+            return False
+        entry = False
+
+    cache_term_data(config, term_id, entry)
+    return entry
+
+
+def prefetch_vocabulary_terms(config: dict, vocab_id: str) -> int:
+    """Populate term_data_cache with all the terms in a vocabulary, using Drupal's
+    JSON:API (one request per 50 terms instead of one per term).
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param vocab_id: string - The vocabulary ID.
+    :return: int - The number of terms added to the cache.
+    """
+    url = config["host"] + "/jsonapi/taxonomy_term/" + vocab_id.strip()
+    num_terms = 0
+    while url:
+        response = issue_request(
+            config, "GET", url, headers={"Accept": "application/vnd.api+json"}
+        )
+        if response.status_code != 200:
+            logging.warning(
+                'Prefetching terms in vocabulary "%s" returned a %s status code; terms will be retrieved individually.',
+                vocab_id,
+                response.status_code,
+            )
+            break
+
+        body = response.json()
+        for term in body["data"]:
+            attributes = term["attributes"]
+            uri = None
+            for uri_field_name in ["field_external_uri", "field_authority_link"]:
+                if uri_field_name in attributes:
+                    if isinstance(attributes[uri_field_name], list):
+                        if len(attributes[uri_field_name]) > 0:
+                            uri = attributes[uri_field_name][0]["uri"]
+                    elif attributes[uri_field_name] is not None:
+                        uri = attributes[uri_field_name]["uri"]
+                    break
+            entry = {"vid": vocab_id.strip(), "name": attributes["name"], "uri": uri}
+            cache_term_data(config, attributes["drupal_internal__tid"], entry)
+            term_ids_by_name.setdefault(
+                (vocab_id.strip(), attributes["name"].lower().strip()),
+                attributes["drupal_internal__tid"],
+            )
+            num_terms += 1
+
+        if "next" in body.get("links", {}):
+            url = body["links"]["next"]["href"]
+        else:
+            url = None
+            prefetched_vocabularies.add(vocab_id.strip())
+
+    logging.info('Prefetched %s terms from vocabulary "%s".', num_terms, vocab_id)
+    return num_terms
+
+
+def get_term_creation_levels(config: dict, csv_data: DictReader) -> list:
+    """Group the rows in a vocabulary CSV file by their depth in the vocabulary's hierarchy,
+    so that each term can be created after its parent, and the terms at each depth can be
+    created at the same time. A row whose parent isn't in the CSV (or whose parent column
+    is empty) is at the first level, its children are at the second level, and so on.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    csv_data : DictReader
+        The vocabulary CSV data, as returned by get_csv_data().
+    Returns
+    -------
+    list
+        A list of lists of CSV rows, one per level, in CSV order within each level. Rows
+        repeating an earlier row's term name, and rows whose ancestors include themselves,
+        come last, each in a level of its own, so that rows with the same term name are not
+        created at the same time.
+    """
+    rows_by_name = dict()
+    last_level = []
+    for row in csv_data:
+        term_name_for_matching = row["term_name"].lower().strip()
+        if term_name_for_matching in rows_by_name:
+            last_level.append(row)
+        else:
+            rows_by_name[term_name_for_matching] = row
+
+    row_depths = dict()
+    for term_name_for_matching in rows_by_name:
+        # Walk up to the nearest ancestor whose depth is known, then assign depths back down.
+        ancestors = []
+        name = term_name_for_matching
+        while name in rows_by_name and name not in row_depths:
+            if name in ancestors:
+                # The remaining ancestors are in a cycle, or below one.
+                for ancestor in ancestors:
+                    row_depths[ancestor] = None
+                break
+            ancestors.append(name)
+            name = str(rows_by_name[name].get("parent") or "").lower().strip()
+        else:
+            depth = row_depths.get(name, -1) if name in rows_by_name else -1
+            for ancestor in reversed(ancestors):
+                depth = depth + 1 if depth is not None else None
+                row_depths[ancestor] = depth
+
+    levels = []
+    for term_name_for_matching, row in rows_by_name.items():
+        depth = row_depths[term_name_for_matching]
+        if depth is None:
+            logging.warning(
+                f'The "parent" column of the vocabulary CSV has a loop that includes term "{row["term_name"]}" or one of its ancestors.'
+            )
+            last_level.append(row)
+            continue
+        while len(levels) <= depth:
+            levels.append([])
+        levels[depth].append(row)
+    levels.extend([row] for row in last_level)
+    return levels
+
+
+def get_term_vocab(config: dict, term_id: Union[int, str]) -> Union[str, bool]:
+    """Get the term's parent vocabulary ID and return it. If the term doesn't
+    exist, return False.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param term_id: int|string - The term ID.
+    :return: str|bool - The vocabulary ID, or False if the term doesn't exist.
+    """
+    term_data = get_cached_term_data(config, term_id)
+    if term_data is False:
         return False
+    return term_data["vid"]
 
 
 def get_term_name(config: dict, term_id: Union[int, str]) -> Union[str, bool]:
@@ -7043,18 +8712,10 @@ def get_term_name(config: dict, term_id: Union[int, str]) -> Union[str, bool]:
     :param term_id: int|string - The term ID.
     :return: str|bool - The term name, or False if the term doesn't exist.
     """
-    url = config["host"] + "/taxonomy/term/" + str(term_id).strip() + "?_format=json"
-    response = issue_request(config, "GET", url)
-    if response.status_code == 200:
-        term_data = response.json()
-        return term_data["name"][0]["value"]
-    else:
-        logging.warning(
-            'Query for term ID "%s" returned a %s status code',
-            term_id,
-            response.status_code,
-        )
+    term_data = get_cached_term_data(config, term_id)
+    if term_data is False:
         return False
+    return term_data["name"]
 
 
 def get_term_uri(config: dict, term_id: Union[int, str]) -> Union[str, None, bool]:
@@ -7064,30 +8725,16 @@ def get_term_uri(config: dict, term_id: Union[int, str]) -> Union[str, None, boo
     :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
     :param term_id: int|string - The term ID.
     :return: str|bool|None - The term URI, or None if there isn't one or False if the term doesn't exist.
-    """
-    url = config["host"] + "/taxonomy/term/" + str(term_id).strip() + "?_format=json"
-    response = issue_request(config, "GET", url)
-    if response.status_code == 200:
-        term_data = response.json()
-        if "field_external_uri" in term_data:
-            uri = term_data["field_external_uri"][0]["uri"]
-            return uri
-        elif "field_authority_link" in term_data:
-            uri = term_data["field_authority_link"][0]["uri"]
-            return uri
-        else:
-            logging.warning(
-                'Query for term ID "%s" does not have either a field_authority_link or field_exteral_uri field.',
-                term_id,
-            )
-            return None
-    else:
+    """
+    term_data = get_cached_term_data(config, term_id)
+    if term_data is False:
+        return False
+    if term_data["uri"] is None:
         logging.warning(
-            'Query for term ID "%s" returned a %s status code',
+            'Query for term ID "%s" does not have either a field_authority_link or field_exteral_uri field.',
             term_id,
-            response.status_code,
         )
-        return False
+    return term_data["uri"]
 
 
 def get_term_id_from_uri(config: dict, uri: str) -> Union[int, bool]:
@@ -7100,6 +8747,10 @@ def get_term_id_from_uri(config: dict, uri: str) -> Union[int, bool]:
     :param uri: string - The term URI.
     :return: int|bool - The term ID, or False if the term doesn't exist.
     """
+    tid = get_cached_lookup(config, "term_uris", uri)
+    if tid is not None:
+        return tid
+
     # Some vocabularies use this View.
     terms_with_uri = []
     term_from_uri_url = (
@@ -7110,6 +8761,7 @@ def get_term_id_from_uri(config: dict, uri: str) -> Union[int, bool]:
         term_from_uri_response_body = term_from_uri_response.json()
         if len(term_from_uri_response_body) == 1:
             tid = term_from_uri_response_body[0]["tid"][0]["value"]
+            cache_lookup(config, "term_uris", uri, tid)
             return tid
         elif len(term_from_uri_response_body) > 1:
             for term in term_from_uri_response_body:
@@ -7125,6 +8777,7 @@ def get_term_id_from_uri(config: dict, uri: str) -> Union[int, bool]:
                 uri,
                 tid,
             )
+            cache_lookup(config, "term_uris", uri, tid)
             return tid
 
     # And some vocabuluaries use this View.
@@ -7142,6 +8795,7 @@ def get_term_id_from_uri(config: dict, uri: str) -> Union[int, bool]:
         )
         if len(term_from_authority_link_response_body) == 1:
             tid = term_from_authority_link_response_body[0]["tid"][0]["value"]
+            cache_lookup(config, "term_uris", uri, tid)
             return tid
         elif len(term_from_authority_link_response_body) > 1:
             for term in term_from_authority_link_response_body:
@@ -7157,6 +8811,7 @@ def get_term_id_from_uri(config: dict, uri: str) -> Union[int, bool]:
                 uri,
                 tid,
             )
+            cache_lookup(config, "term_uris", uri, tid)
             return tid
         else:
             # URI does not match any term.
@@ -7306,14 +8961,12 @@ def create_term(
             logging.info(
                 'Term %s ("%s") added to vocabulary "%s".', tid, term_name, vocab_id
             )
-        newly_created_term_name_for_matching = term_name.lower().strip()
-        newly_created_terms.append(
-            {
-                "tid": tid,
-                "vocab_id": vocab_id,
-                "name": term_name,
-                "name_for_matching": newly_created_term_name_for_matching,
-            }
+        term_ids_by_name[(vocab_id.strip(), term_name.lower().strip())] = tid
+        cache_lookup(
+            config,
+            "term_names",
+            vocab_id.strip() + ":" + term_name.lower().strip(),
+            tid,
         )
         return tid
     else:
@@ -7509,7 +9162,15 @@ def create_url_alias(config: dict, node_id: Union[int, str], url_alias: str) ->
         json,
         None,
     )
-    if response.status_code != 201:
+    if response.status_code == 201:
+        # A query for this alias earlier in the task would have been remembered as not found.
+        future = concurrent.futures.Future()
+        future.set_result(int(node_id))
+        with url_alias_cache_lock:
+            url_alias_cache[
+                ("node", f'{config["host"]}/{url_alias.lstrip("/")}?_format=json')
+            ] = future
+    else:
         logging.error(
             "URL alias '%s' not created for node %s, HTTP response code was %s (it might already exist).",
             url_alias,
@@ -7518,6 +9179,7 @@ def create_url_alias(config: dict, node_id: Union[int, str], url_alias: str) ->
         )
 
 
+@metrics.timed("term_resolution")
 def prepare_term_id(
     config: dict, vocab_ids: Union[list, bool], field_name: str, term: str
 ) -> Union[str, None]:
@@ -7655,6 +9317,139 @@ def prepare_term_id(
     return None
 
 
+def get_term_to_create(
+    config: dict, vocab_ids: Union[list, bool], field_name: str, term: str
+) -> Union[tuple, None]:
+    """Gets the vocabulary ID and term name that prepare_term_id() would pass to create_term()
+    for a CSV value, if it would. Used by bulk_create_terms().
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    vocab_ids: list|boolean
+        The vocabulary IDs associated with the field.
+    field_name: string
+        The field's machine name.
+    term: string
+        The term name from CSV.
+    Returns
+    -------
+    tuple|None
+        The vocabulary ID and term name, or None if the value is a term ID or URI, is in a
+        field that uses an entity reference view, or can't be assigned to a vocabulary.
+    """
+    term = str(term).strip()
+    if value_is_numeric(term) and field_name not in config["columns_with_term_names"]:
+        return None
+    if vocab_ids is False or len(term) == 0 or term.startswith("http"):
+        return None
+    if get_entity_reference_view_endpoints(config).get(field_name, False):
+        return None
+    if len(vocab_ids) == 1:
+        if ":" in term:
+            [vocab_id, term_name] = term.split(":", maxsplit=1)
+            if vocab_id == vocab_ids[0]:
+                return vocab_id.strip(), term_name.strip()
+        return vocab_ids[0].strip(), term
+    elif ":" in term:
+        [tentative_vocab_id, term_name] = term.split(":", maxsplit=1)
+        if tentative_vocab_id in vocab_ids:
+            return tentative_vocab_id.strip(), term_name.strip()
+    return None
+
+
+def bulk_create_terms(config: dict, field_definitions: dict) -> None:
+    """Creates the terms named in the input CSV's taxonomy and typed relation fields that don't
+    exist yet, before any nodes are created, on a pool of 'bulk_create_terms_threads' threads.
+    Each distinct term is looked up (and if necessary created) once, and its ID is added to
+    term_ids_by_name, so prepare_term_id() doesn't need to query Drupal for it while
+    processing rows. Fields that have preprocessors are skipped, since their values change
+    while rows are processed.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    field_definitions : dict
+        The node field definitions, as returned by get_field_definitions().
+    """
+    preprocessed_fields = set()
+    for preprocessor_script in config.get("preprocessors") or []:
+        preprocessed_fields.update(preprocessor_script.keys())
+
+    csv_data = get_csv_data(config)
+    term_fields = {}
+    for field_name in csv_data.fieldnames:
+        if (
+            field_name in field_definitions
+            and field_name not in preprocessed_fields
+            and field_definitions[field_name]["field_type"]
+            in ["entity_reference", "typed_relation"]
+            and field_definitions[field_name].get("target_type") == "taxonomy_term"
+        ):
+            term_fields[field_name] = get_field_vocabularies(
+                config, field_definitions, field_name
+            )
+
+    terms_to_create = dict()
+    for row in csv_data:
+        for field_name, vocab_ids in term_fields.items():
+            if not row[field_name]:
+                continue
+            if field_definitions[field_name]["field_type"] == "typed_relation":
+                try:
+                    values = [
+                        subvalue["target_id"]
+                        for subvalue in split_typed_relation_string(
+                            config, row[field_name], "taxonomy_term"
+                        )
+                    ]
+                except IndexError:
+                    # Invalid typed relation values are reported when the row is processed.
+                    continue
+            else:
+                values = str(row[field_name]).split(config["subdelimiter"])
+            for value in values:
+                term_to_create = get_term_to_create(
+                    config, vocab_ids, field_name, value
+                )
+                if (
+                    term_to_create is not None
+                    and term_to_create[0] not in config["protected_vocabularies"]
+                ):
+                    vocab_id, term_name = term_to_create
+                    terms_to_create.setdefault(
+                        (vocab_id, term_name.lower().strip()), term_to_create
+                    )
+    if len(terms_to_create) == 0:
+        return
+
+    def create_or_find_term(term_key):
+        if term_key in term_ids_by_name:
+            return "found"
+        vocab_id, term_name = terms_to_create[term_key]
+        tid = create_term(config, vocab_id, term_name)
+        # create_term() adds the terms it creates to term_ids_by_name.
+        if term_key in term_ids_by_name:
+            return "created"
+        if value_is_numeric(tid):
+            term_ids_by_name[term_key] = tid
+            return "found"
+        return "failed"
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, int(config["bulk_create_terms_threads"]))
+    ) as executor:
+        results = collections.Counter(
+            executor.map(create_or_find_term, terms_to_create)
+        )
+    message = (
+        f"Looked up {len(terms_to_create)} distinct terms named in the input CSV before creating nodes: "
+        f'{results["created"]} created, {results["found"]} already existed, {results["failed"]} could not be created.'
+    )
+    print(message)
+    logging.info(message)
+
+
 def get_field_vocabularies(
     config: dict, field_definitions: dict, field_name: str
 ) -> Union[list, bool]:
@@ -9476,8 +11271,8 @@ def write_to_output_csv(
             The JSON representation of the node just created, provided by Drupal.
         input_csv_row : dict
             The CSV Reader representation of the current input CSV row. Note that
-            this is copy.deepcopy() of the CSV row since passing the row in as is
-            modifies it in global scope.
+            this is a copy of the CSV row (e.g. a CsvRow's copy()) since passing the
+            row in as is modifies it in global scope.
         Returns
         -------
         None
@@ -9611,17 +11406,174 @@ def get_sequence_indicator_from_filename(config: dict, file_name: str) -> str:
     return str(weight)
 
 
+def get_paged_content_task_setup(config: dict) -> dict:
+    """Performs the setup needed by create_children_from_directory() once per task.
+
+    Everything that is the same for every page of every parent (the rollback file path,
+    the CSV ID to node ID map, required fields, field definitions, and the term IDs configured
+    for page models, viewer overrides, and additional page media) is looked up on the first
+    call and cached in the module-level paged_content_task_setup dict.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    Returns
+    -------
+    dict
+        The cached setup values.
+    """
+    if len(paged_content_task_setup) > 0:
+        return paged_content_task_setup
+
+    setup = dict()
+    setup["path_to_rollback_csv_file"] = get_rollback_csv_filepath(config)
+    prepare_csv_id_to_node_id_map(config)
+
+    # Identify any required fields that are in the parent CSV.
+    setup["required_fields"] = get_required_bundle_fields(
+        config, "node", config["content_type"]
+    )
+    if len(setup["required_fields"]) > 0 or (
+        "csv_value_templates_for_paged_content" in config
+        and len(config["csv_value_templates_for_paged_content"]) > 0
+    ):
+        setup["field_definitions"] = get_field_definitions(config, "node")
+    else:
+        setup["field_definitions"] = dict()
+
+    # Add field_model if that field exists in the child's content type.
+    entity_fields = get_entity_fields(
+        config, "node", config["paged_content_page_content_type"]
+    )
+    setup["paged_content_model_tid"] = None
+    if "field_model" in entity_fields:
+        if not value_is_numeric(
+            str(config["paged_content_page_model_tid"]).strip()
+        ) and str(config["paged_content_page_model_tid"]).strip().startswith("http"):
+            setup["paged_content_model_tid"] = get_term_id_from_uri(
+                config, str(config["paged_content_page_model_tid"]).strip()
+            )
+        else:
+            setup["paged_content_model_tid"] = str(
+                config["paged_content_page_model_tid"]
+            ).strip()
+
+    # Add viewer override if defined in CSV or config.
+    setup["page_viewer_override_tid"] = None
+    if "paged_content_page_viewer_override" in config:
+        if (
+            value_is_numeric(config["paged_content_page_viewer_override"]) is False
+            and config["paged_content_page_viewer_override"].startswith("http") is True
+        ):
+            page_viewer_override_tid_info = get_all_representations_of_term(
+                config,
+                vocab_id="islandora_display",
+                uri=config["paged_content_page_viewer_override"],
+            )
+            setup["page_viewer_override_tid"] = page_viewer_override_tid_info["term_id"]
+        elif value_is_numeric(config["paged_content_page_viewer_override"]) is False:
+            page_viewer_override_tid_info = get_all_representations_of_term(
+                config,
+                vocab_id="islandora_display",
+                name=config["paged_content_page_viewer_override"],
+            )
+            setup["page_viewer_override_tid"] = page_viewer_override_tid_info["term_id"]
+        else:
+            setup["page_viewer_override_tid"] = config[
+                "paged_content_page_viewer_override"
+            ]
+
+    # Media use term IDs and file extensions for additional page media.
+    setup["additional_page_media"] = list()
+    if "paged_content_additional_page_media" in config:
+        for extension_mapping in config["paged_content_additional_page_media"]:
+            for (
+                additional_page_media_use_term,
+                additional_page_media_extension,
+            ) in extension_mapping.items():
+                if str(additional_page_media_use_term).startswith("http"):
+                    additional_page_media_use_tid = get_term_id_from_uri(
+                        config, additional_page_media_use_term
+                    )
+                else:
+                    additional_page_media_use_tid = additional_page_media_use_term
+                setup["additional_page_media"].append(
+                    (additional_page_media_use_tid, additional_page_media_extension)
+                )
+
+    paged_content_task_setup.update(setup)
+    return paged_content_task_setup
+
+
+def get_recovery_mode_page_files_in_csv_id_to_node_id_map(
+    config: dict, parent_csv_id: str
+) -> dict:
+    """Query the CSV ID to node ID map once for all of the pages/children of a parent that have
+       already been created. Used only during recovery mode.
+
+    Params
+    ----------
+        config : dict
+            The configuration settings defined by workbench_config.get_config().
+        parent_csv_id: string
+            The parent's CSV ID.
+    Return
+    ------
+        dict
+            Page/child filenames mapped to the most recent corresponding node ID.
+    """
+    if config["csv_id_to_node_id_map_path"] is not False:
+        if not os.path.exists(config["csv_id_to_node_id_map_path"]):
+            message = f"Can't find CSV ID to node ID database at {config['csv_id_to_node_id_map_path']}."
+            logging.error(message)
+            sys.exit("Error: " + message)
+
+    csv_id_to_node_id_map_allowed_hosts_sql = (
+        get_csv_id_to_node_id_map_allowed_hosts_sql(config)
+    )
+    # Ordering by timestamp means later entries for a filename replace earlier ones.
+    query = (
+        "select csv_id, node_id from csv_id_to_node_id_map where "
+        + csv_id_to_node_id_map_allowed_hosts_sql
+        + " parent_csv_id = ? and node_id + 0 >= ? order by timestamp asc"
+    )
+    csv_id_map_result = sqlite_manager(
+        config,
+        operation="select",
+        query=query,
+        values=(parent_csv_id, int(config["recovery_mode_starting_from_node_id"])),
+        db_file_path=config["csv_id_to_node_id_map_path"],
+    )
+    page_files_in_map = dict()
+    for csv_id_map_row in csv_id_map_result:
+        page_files_in_map[csv_id_map_row[0]] = str(csv_id_map_row[1])
+    return page_files_in_map
+
+
+def get_page_file_sort_key(config: dict, page_file_name: str) -> tuple:
+    """Sort key that orders page files by their sequence indicator (i.e., their field_weight),
+    with files that don't have a numeric sequence indicator sorted by name at the end.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param page_file_name: str - The page filename.
+    :return: tuple - The sort key.
+    """
+    weight = get_sequence_indicator_from_filename(config, page_file_name)
+    if validate_weight_value(weight) is True:
+        return (0, int(weight), page_file_name)
+    return (1, 0, page_file_name)
+
+
 def create_children_from_directory(
     config: dict, parent_csv_record: dict, parent_node_id: str
 ):
-    path_to_rollback_csv_file = get_rollback_csv_filepath(config)
-    prepare_csv_id_to_node_id_map(config)
-
     # These objects will have a title (derived from the page filename), an ID based on the parent's id, and a config-defined
     # Islandora model. Content type and status are inherited as is from parent, as are other required fields. Fields
     # specified in the csv_value_templates_for_paged_content config setting are also applied to paged children. The
     # weight assigned to the page is the last segment in the filename, split from the rest of the filename using the
     # character defined in the 'paged_content_sequence_separator' config option.
+    setup = get_paged_content_task_setup(config)
+
     parent_id = parent_csv_record[config["id_field"]]
     page_dir_name = parent_csv_record[config["page_files_source_dir_field"]]
     page_dir_path = os.path.join(config["input_dir"], page_dir_name)
@@ -9640,10 +11592,21 @@ def create_children_from_directory(
     else:
         page_files = os.listdir(page_dir_path)
 
-    # Identify any required fields that are in the parent CSV.
-    required_fields = get_required_bundle_fields(config, "node", config["content_type"])
+    if (
+        config["recovery_mode_starting_from_node_id"] is not False
+        and value_is_numeric(config["recovery_mode_starting_from_node_id"]) is True
+        and parent_id is not None
+    ):
+        page_files_in_map = get_recovery_mode_page_files_in_csv_id_to_node_id_map(
+            config, parent_id
+        )
+    else:
+        page_files_in_map = dict()
 
-    for page_file_name in page_files:
+    page_files_to_create = list()
+    for page_file_name in sorted(
+        page_files, key=lambda f: get_page_file_sort_key(config, f)
+    ):
         if paged_content_ignore_file(config, page_file_name) is True:
             logging.info(
                 f'Ignoring file "{os.path.join(page_dir_path, page_file_name)}" since it matches an entry in the "paged_content_ignore_files" config setting.'
@@ -9654,246 +11617,261 @@ def create_children_from_directory(
         if os.path.isdir(os.path.join(page_dir_path, page_file_name)):
             continue
 
-        if (
-            config["recovery_mode_starting_from_node_id"] is not False
-            and value_is_numeric(config["recovery_mode_starting_from_node_id"]) is True
-            and parent_id is not None
-        ):
-            nid_in_map = recovery_mode_id_in_csv_id_to_node_id_map(
-                config, page_file_name, parent_id
-            )
-            if nid_in_map is not False:
-                message = f"Page/child file {page_file_name} has already been ingested at ({config['host']}/node/{nid_in_map}), skipping it."
-                logging.info(message)
-                continue
+        if page_file_name in page_files_in_map:
+            message = f"Page/child file {page_file_name} has already been ingested at ({config['host']}/node/{page_files_in_map[page_file_name]}), skipping it."
+            logging.info(message)
+            continue
+
+        page_files_to_create.append(page_file_name)
 
-        weight = get_sequence_indicator_from_filename(config, page_file_name)
-        filename_without_extension = os.path.splitext(page_file_name)[0]
+    # Pages are submitted in field_weight order. Each page's weight comes from its own
+    # filename, so the order in which concurrently created pages finish doesn't matter.
+    max_workers = max(1, int(config["paged_content_page_threads"]))
+    if max_workers == 1 or len(page_files_to_create) < 2:
+        for page_file_name in page_files_to_create:
+            create_child_from_file(
+                config, setup, parent_csv_record, parent_node_id, page_file_name
+            )
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            page_futures = [
+                executor.submit(
+                    create_child_from_file,
+                    config,
+                    setup,
+                    parent_csv_record,
+                    parent_node_id,
+                    page_file_name,
+                )
+                for page_file_name in page_files_to_create
+            ]
+            for page_future in page_futures:
+                page_future.result()
 
-        # This "identifier" is the CSV ID, not a Drupal field. It may be overwritten
-        # by a CSV value template below.
-        page_identifier = parent_id + "_" + filename_without_extension
 
-        page_title = get_page_title_from_template(
-            config, parent_csv_record["title"], weight
-        )
+def create_child_from_file(
+    config: dict,
+    setup: dict,
+    parent_csv_record: dict,
+    parent_node_id: str,
+    page_file_name: str,
+) -> Union[int, bool]:
+    """Creates a page/child node, and its media, from a file in the parent's page directory.
+    Called by create_children_from_directory(), possibly from a worker thread.
+    Parameters
+    ----------
+    config : dict
+        The configuration settings defined by workbench_config.get_config().
+    setup : dict
+        The per-task setup returned by get_paged_content_task_setup().
+    parent_csv_record : dict
+        The parent's CSV record.
+    parent_node_id : str
+        The parent's node ID.
+    page_file_name : str
+        The name of the page file, relative to the parent's page directory.
+    Returns
+    -------
+    int|bool
+        The page node's ID, or False if the node was not created.
+    """
+    parent_id = parent_csv_record[config["id_field"]]
+    page_dir_name = parent_csv_record[config["page_files_source_dir_field"]]
+    page_dir_path = os.path.join(config["input_dir"], page_dir_name)
 
-        inherited_fields = copy.copy(required_fields)
+    weight = get_sequence_indicator_from_filename(config, page_file_name)
+    filename_without_extension = os.path.splitext(page_file_name)[0]
 
-        csv_row_to_apply_to_paged_children = copy.deepcopy(parent_csv_record)
-        csv_row_to_apply_to_paged_children["file"] = page_file_name
-        if validate_weight_value(weight) is False:
-            if paged_content_ignore_file(config, page_file_name) is False:
-                logging.warning(
-                    f'Sequence indicator in page filename "{os.path.join(page_dir_path, page_file_name)}" is not a valid "field_weight" value; that field will not be populated on the page node.'
-                )
-                weight = ""
+    # This "identifier" is the CSV ID, not a Drupal field. It may be overwritten
+    # by a CSV value template below.
+    page_identifier = parent_id + "_" + filename_without_extension
 
-        # The page's field_weight is assigned below, but we also include the assigned value
-        # in the temporary CSV record in case any CSV value templates are applied.
-        csv_row_to_apply_to_paged_children["field_weight"] = int(weight) * int(
-            config["paged_content_page_weight_multiplier"]
-        )
+    page_title = get_page_title_from_template(
+        config, parent_csv_record["title"], weight
+    )
 
-        # Add any fields to the page's row that are defined in config["csv_value_templates_for_paged_content"].
-        if (
-            "csv_value_templates_for_paged_content" in config
-            and len(config["csv_value_templates_for_paged_content"]) > 0
-        ):
-            for paged_items_template in config["csv_value_templates_for_paged_content"]:
-                for (
-                    paged_items_template_field_name,
-                    paged_items_template_template,
-                ) in paged_items_template.items():
-                    if paged_items_template_field_name not in inherited_fields:
-                        if paged_items_template_field_name in parent_csv_record:
-                            inherited_fields.append(paged_items_template_field_name)
-                            csv_row_to_apply_to_paged_children[
-                                paged_items_template_field_name
-                            ] = parent_csv_record[paged_items_template_field_name]
+    inherited_fields = copy.copy(setup["required_fields"])
 
-        if (
-            "csv_value_templates_for_paged_content" in config
-            and len(config["csv_value_templates_for_paged_content"]) > 0
-        ):
-            csv_row_to_apply_to_paged_children = apply_csv_value_templates(
-                config,
-                "csv_value_templates_for_paged_content",
-                csv_row_to_apply_to_paged_children,
+    csv_row_to_apply_to_paged_children = CsvRow.copy_of(parent_csv_record)
+    csv_row_to_apply_to_paged_children["file"] = page_file_name
+    if validate_weight_value(weight) is False:
+        if paged_content_ignore_file(config, page_file_name) is False:
+            logging.warning(
+                f'Sequence indicator in page filename "{os.path.join(page_dir_path, page_file_name)}" is not a valid "field_weight" value; that field will not be populated on the page node.'
             )
+            weight = ""
 
-        # If a field is registered in the config to have a preprocessor applied to it
-        # (including empty fields), apply the processor.
-        if "preprocessors" in config and len(config["preprocessors"]) > 0:
-            for (
-                csv_field_to_apply_to_children
-            ) in csv_row_to_apply_to_paged_children.keys():
-                for preprocessor_script in config["preprocessors"]:
-                    for (
-                        processor_fieldname,
-                        processor_script_path,
-                    ) in preprocessor_script.items():
-                        if csv_field_to_apply_to_children == processor_fieldname:
-                            csv_row_to_apply_to_paged_children[
-                                csv_field_to_apply_to_children
-                            ] = preprocess_csv(
-                                config,
-                                csv_row_to_apply_to_paged_children,
-                                csv_field_to_apply_to_children,
-                                processor_script_path,
-                            )
+    # The page's field_weight is assigned below, but we also include the assigned value
+    # in the temporary CSV record in case any CSV value templates are applied.
+    csv_row_to_apply_to_paged_children["field_weight"] = int(weight) * int(
+        config["paged_content_page_weight_multiplier"]
+    )
 
-        node_json = {
-            "type": [
-                {
-                    "target_id": config["paged_content_page_content_type"],
-                    "target_type": "node_type",
-                }
-            ],
-            "title": [{"value": page_title}],
-            "field_member_of": [{"target_id": parent_node_id, "target_type": "node"}],
-            "field_weight": [
-                {
-                    "value": int(weight)
-                    * int(config["paged_content_page_weight_multiplier"])
-                }
-            ],
-        }
+    # Add any fields to the page's row that are defined in config["csv_value_templates_for_paged_content"].
+    if (
+        "csv_value_templates_for_paged_content" in config
+        and len(config["csv_value_templates_for_paged_content"]) > 0
+    ):
+        for paged_items_template in config["csv_value_templates_for_paged_content"]:
+            for (
+                paged_items_template_field_name,
+                paged_items_template_template,
+            ) in paged_items_template.items():
+                if paged_items_template_field_name not in inherited_fields:
+                    if paged_items_template_field_name in parent_csv_record:
+                        inherited_fields.append(paged_items_template_field_name)
+                        csv_row_to_apply_to_paged_children[
+                            paged_items_template_field_name
+                        ] = parent_csv_record[paged_items_template_field_name]
 
-        # Add field_model if that field exists in the child's content type.
-        entity_fields = get_entity_fields(
-            config, "node", config["paged_content_page_content_type"]
+    if (
+        "csv_value_templates_for_paged_content" in config
+        and len(config["csv_value_templates_for_paged_content"]) > 0
+    ):
+        csv_row_to_apply_to_paged_children = apply_csv_value_templates(
+            config,
+            "csv_value_templates_for_paged_content",
+            csv_row_to_apply_to_paged_children,
         )
-        if "field_model" in entity_fields:
-            if not value_is_numeric(
-                str(config["paged_content_page_model_tid"]).strip()
-            ) and str(config["paged_content_page_model_tid"]).strip().startswith(
-                "http"
-            ):
-                paged_content_model_tid = get_term_id_from_uri(
-                    config, str(config["paged_content_page_model_tid"]).strip()
-                )
-            else:
-                paged_content_model_tid = str(
-                    config["paged_content_page_model_tid"]
-                ).strip()
-            node_json["field_model"] = [
-                {"target_id": paged_content_model_tid, "target_type": "taxonomy_term"}
-            ]
 
-        # Add viewer override if defined in CSV or config.
-        if "paged_content_page_viewer_override" in config:
-            if (
-                value_is_numeric(config["paged_content_page_viewer_override"]) is False
-                and config["paged_content_page_viewer_override"].startswith("http")
-                is True
-            ):
-                page_viewer_override_tid_info = get_all_representations_of_term(
-                    config,
-                    vocab_id="islandora_display",
-                    uri=config["paged_content_page_viewer_override"],
-                )
-                page_viewer_override_tid = page_viewer_override_tid_info["term_id"]
-            elif (
-                value_is_numeric(config["paged_content_page_viewer_override"]) is False
-            ):
-                page_viewer_override_tid_info = get_all_representations_of_term(
-                    config,
-                    vocab_id="islandora_display",
-                    name=config["paged_content_page_viewer_override"],
-                )
-                page_viewer_override_tid = page_viewer_override_tid_info["term_id"]
-            else:
-                page_viewer_override_tid = config["paged_content_page_viewer_override"]
+    # If a field is registered in the config to have a preprocessor applied to it
+    # (including empty fields), apply the processor.
+    if "preprocessors" in config and len(config["preprocessors"]) > 0:
+        for csv_field_to_apply_to_children in csv_row_to_apply_to_paged_children.keys():
+            for preprocessor_script in config["preprocessors"]:
+                for (
+                    processor_fieldname,
+                    processor_script_path,
+                ) in preprocessor_script.items():
+                    if csv_field_to_apply_to_children == processor_fieldname:
+                        csv_row_to_apply_to_paged_children[
+                            csv_field_to_apply_to_children
+                        ] = preprocess_csv(
+                            config,
+                            csv_row_to_apply_to_paged_children,
+                            csv_field_to_apply_to_children,
+                            processor_script_path,
+                        )
 
-        viewer_override_fieldname = config["viewer_override_fieldname"]
-        if (
-            viewer_override_fieldname in parent_csv_record
-            and "paged_content_page_viewer_override" in config
-        ):
-            node_json[viewer_override_fieldname] = [
-                {
-                    "target_id": page_viewer_override_tid,
-                    "target_type": "taxonomy_term",
-                }
-            ]
-        elif viewer_override_fieldname in parent_csv_record:
-            node_json[viewer_override_fieldname] = [
-                {
-                    "target_id": parent_csv_record["field_viewer_override"],
-                    "target_type": "taxonomy_term",
-                }
-            ]
-        elif (
-            viewer_override_fieldname not in parent_csv_record
-            and "paged_content_page_viewer_override" in config
-        ):
-            node_json[viewer_override_fieldname] = [
-                {
-                    "target_id": page_viewer_override_tid,
-                    "target_type": "taxonomy_term",
-                }
-            ]
+    node_json = {
+        "type": [
+            {
+                "target_id": config["paged_content_page_content_type"],
+                "target_type": "node_type",
+            }
+        ],
+        "title": [{"value": page_title}],
+        "field_member_of": [{"target_id": parent_node_id, "target_type": "node"}],
+        "field_weight": [
+            {"value": int(weight) * int(config["paged_content_page_weight_multiplier"])}
+        ],
+    }
+
+    if setup["paged_content_model_tid"] is not None:
+        node_json["field_model"] = [
+            {
+                "target_id": setup["paged_content_model_tid"],
+                "target_type": "taxonomy_term",
+            }
+        ]
+
+    page_viewer_override_tid = setup["page_viewer_override_tid"]
+    viewer_override_fieldname = config["viewer_override_fieldname"]
+    if (
+        viewer_override_fieldname in parent_csv_record
+        and "paged_content_page_viewer_override" in config
+    ):
+        node_json[viewer_override_fieldname] = [
+            {
+                "target_id": page_viewer_override_tid,
+                "target_type": "taxonomy_term",
+            }
+        ]
+    elif viewer_override_fieldname in parent_csv_record:
+        node_json[viewer_override_fieldname] = [
+            {
+                "target_id": parent_csv_record["field_viewer_override"],
+                "target_type": "taxonomy_term",
+            }
+        ]
+    elif (
+        viewer_override_fieldname not in parent_csv_record
+        and "paged_content_page_viewer_override" in config
+    ):
+        node_json[viewer_override_fieldname] = [
+            {
+                "target_id": page_viewer_override_tid,
+                "target_type": "taxonomy_term",
+            }
+        ]
 
-        # Some optional base fields, inherited from the parent object.
-        if "uid" in parent_csv_record:
-            if len(parent_csv_record["uid"]) > 0:
-                node_json["uid"] = [{"target_id": parent_csv_record["uid"]}]
+    # Some optional base fields, inherited from the parent object.
+    if "uid" in parent_csv_record:
+        if len(parent_csv_record["uid"]) > 0:
+            node_json["uid"] = [{"target_id": parent_csv_record["uid"]}]
 
-        if "created" in parent_csv_record:
-            if len(parent_csv_record["created"]) > 0:
-                node_json["created"] = [{"value": parent_csv_record["created"]}]
+    if "created" in parent_csv_record:
+        if len(parent_csv_record["created"]) > 0:
+            node_json["created"] = [{"value": parent_csv_record["created"]}]
 
-        if len(inherited_fields) > 0:
-            field_definitions = get_field_definitions(config, "node")
-            # Importing the workbench_fields module at the top of this module with the
-            # rest of the imports causes a circular import exception, so we do it here.
-            import workbench_fields
+    if len(inherited_fields) > 0:
+        field_definitions = setup["field_definitions"]
+        # Importing the workbench_fields module at the top of this module with the
+        # rest of the imports causes a circular import exception, so we do it here.
+        import workbench_fields
 
-            for inherited_field in inherited_fields:
-                # These fields are populated above.
-                if inherited_field in [
-                    "title",
-                    "field_model",
-                    "uid",
-                    "created",
-                    config["viewer_override_fieldname"],
-                ]:
-                    continue
+        for inherited_field in inherited_fields:
+            # These fields are populated above.
+            if inherited_field in [
+                "title",
+                "field_model",
+                "uid",
+                "created",
+                config["viewer_override_fieldname"],
+            ]:
+                continue
 
-                # Assemble Drupal field structures from CSV data. If new field types are added to
-                # workbench_fields.py, they need to be registered in the following if/elif/else block.
+            # Assemble Drupal field structures from CSV data. If new field types are added to
+            # workbench_fields.py, they need to be registered in the following if/elif/else block.
 
-                field = workbench_fields.WorkbenchFieldFactory.get_field_handler(
-                    field_definitions[inherited_field]["field_type"]
-                )
-                node_json = field.create(
-                    config,
-                    field_definitions,
-                    node_json,
-                    csv_row_to_apply_to_paged_children,
-                    inherited_field,
-                )
+            field = workbench_fields.WorkbenchFieldFactory.get_field_handler(
+                field_definitions[inherited_field]["field_type"]
+            )
+            node_json = field.create(
+                config,
+                field_definitions,
+                node_json,
+                csv_row_to_apply_to_paged_children,
+                inherited_field,
+            )
 
-        node_headers = {"Content-Type": "application/json"}
-        node_endpoint = "/node?_format=json"
-        node_response = issue_request(
-            config, "POST", node_endpoint, node_headers, node_json, None
-        )
-        if node_response.status_code == 201:
-            node_uri = node_response.headers["location"]
-            print('+ Node for child "' + page_title + '" created at ' + node_uri + ".")
-            logging.info('Node for child "%s" created at %s.', page_title, node_uri)
-            if "output_csv" in config.keys():
-                write_to_output_csv(config, page_identifier, node_response.text)
+    node_nid = False
+    node_headers = {"Content-Type": "application/json"}
+    node_endpoint = "/node?_format=json"
+    node_response = issue_request(
+        config, "POST", node_endpoint, node_headers, node_json, None
+    )
+    if node_response.status_code == 201:
+        node_uri = node_response.headers["location"]
+        print('+ Node for child "' + page_title + '" created at ' + node_uri + ".")
+        logging.info('Node for child "%s" created at %s.', page_title, node_uri)
 
+        # The new node's ID is in the response body, so we don't need to look up its URL.
+        try:
+            node_nid = json.loads(node_response.text)["nid"][0]["value"]
+        except (ValueError, KeyError, IndexError):
             node_nid = get_nid_from_url_alias(config, node_uri)
 
+        page_file_path = os.path.join(page_dir_name, page_file_name)
+        # The rollback file, the CSV ID to node ID map, and the output CSV are shared by all worker threads.
+        with paged_content_lock:
+            if "output_csv" in config.keys():
+                write_to_output_csv(config, page_identifier, node_response.text)
+
             populate_csv_id_to_node_id_map(
                 config, parent_id, parent_node_id, page_file_name, node_nid
             )
 
-            page_file_path = os.path.join(page_dir_name, page_file_name)
             write_rollback_node_id(
                 config,
                 node_nid,
@@ -9901,137 +11879,92 @@ def create_children_from_directory(
                 page_title,
                 page_file_path,
                 parent_node_id,
-                path_to_rollback_csv_file,
-            )
-
-            fake_csv_record = collections.OrderedDict()
-            fake_csv_record["title"] = page_title
-            fake_csv_record["file"] = page_file_path
-            fake_csv_record[config["id_field"]] = parent_csv_record[config["id_field"]]
-            media_response_status_code = create_media(
-                config, page_file_path, "file", str(node_nid), fake_csv_record
+                setup["path_to_rollback_csv_file"],
             )
-            allowed_media_response_codes = [201, 204]
-            if media_response_status_code in allowed_media_response_codes:
-                if media_response_status_code is False:
-                    print(
-                        f"- ERROR: Media for {page_file_path} not created. See log for more information."
-                    )
-                    logging.error(
-                        "Media for %s not created. HTTP response code was %s.",
-                        page_file_path,
-                        media_response_status_code,
-                    )
-                    continue
-                else:
-                    logging.info("Media for %s created.", page_file_path)
-                    print(f"+ Media for {page_file_path} created.")
-
-            if (
-                config["paged_content_from_directories"] is True
-                or config["paged_content_from_directories_parents_exist"] is True
-            ):
-                if "paged_content_additional_page_media" in config:
-                    for extension_mapping in config[
-                        "paged_content_additional_page_media"
-                    ]:
-                        for (
-                            additional_page_media_use_term,
-                            additional_page_media_extension,
-                        ) in extension_mapping.items():
-                            if str(additional_page_media_use_term).startswith("http"):
-                                additional_page_media_use_tid = get_term_id_from_uri(
-                                    config, additional_page_media_use_term
-                                )
-                            else:
-                                additional_page_media_use_tid = (
-                                    additional_page_media_use_term
-                                )
-                            page_file_base_path = os.path.splitext(page_file_path)[0]
-                            additional_page_media_file_path = (
-                                page_file_base_path
-                                + "."
-                                + additional_page_media_extension.strip()
-                            )
-                            if check_file_exists(
-                                config, additional_page_media_file_path
-                            ):
-                                media_response_status_code = create_media(
-                                    config,
-                                    additional_page_media_file_path,
-                                    None,
-                                    str(node_nid),
-                                    fake_csv_record,
-                                    media_use_tid=additional_page_media_use_tid,
-                                )
-                                if (
-                                    media_response_status_code
-                                    in allowed_media_response_codes
-                                ):
-                                    if media_response_status_code is False:
-                                        print(
-                                            f"- ERROR: Media for {additional_page_media_file_path} not created. See log for more information."
-                                        )
-                                        logging.error(
-                                            "Media for %s not created. HTTP response code was %s.",
-                                            page_file_base_path
-                                            + "."
-                                            + additional_page_media_extension,
-                                            media_response_status_code,
-                                        )
-                                        continue
-                                    else:
-                                        logging.info(
-                                            "Media for %s created.",
-                                            additional_page_media_file_path,
-                                        )
-                                        print(
-                                            f"+ Media for {additional_page_media_file_path} created."
-                                        )
-                            else:
-                                logging.warning(
-                                    f"{additional_page_media_file_path} not found."
-                                )
 
+        fake_csv_record = collections.OrderedDict()
+        fake_csv_record["title"] = page_title
+        fake_csv_record["file"] = page_file_path
+        fake_csv_record[config["id_field"]] = parent_csv_record[config["id_field"]]
+        media_response_status_code = create_media(
+            config, page_file_path, "file", str(node_nid), fake_csv_record
+        )
+        allowed_media_response_codes = [201, 204]
+        if media_response_status_code in allowed_media_response_codes:
+            logging.info("Media for %s created.", page_file_path)
+            print(f"+ Media for {page_file_path} created.")
         else:
             print(
-                f"Error: Node for page {page_identifier} not created. See log for more information."
-            )
-            logging.error(
-                'Node for page "%s" not created, HTTP response code was %s, response body was %s',
-                page_identifier,
-                node_response.status_code,
-                node_response.text,
+                f"- ERROR: Media for {page_file_path} not created. See log for more information."
             )
             logging.error(
-                'JSON request body used in previous POST to "%s" was %s.',
-                node_endpoint,
-                node_json,
+                "Media for %s not created. HTTP response code was %s.",
+                page_file_path,
+                media_response_status_code,
             )
 
-        # Execute node-specific post-create scripts, if any are configured.
-        if "node_post_create" in config and len(config["node_post_create"]) > 0:
-            for command in config["node_post_create"]:
-                post_task_output, post_task_return_code = (
-                    execute_entity_post_task_script(
-                        command,
-                        config["config_file"],
-                        node_response.status_code,
-                        node_response.text,
-                    )
+        page_file_base_path = os.path.splitext(page_file_path)[0]
+        for (
+            additional_page_media_use_tid,
+            additional_page_media_extension,
+        ) in setup["additional_page_media"]:
+            additional_page_media_file_path = (
+                page_file_base_path + "." + additional_page_media_extension.strip()
+            )
+            if check_file_exists(config, additional_page_media_file_path):
+                media_response_status_code = create_media(
+                    config,
+                    additional_page_media_file_path,
+                    None,
+                    str(node_nid),
+                    fake_csv_record,
+                    media_use_tid=additional_page_media_use_tid,
                 )
-                if post_task_return_code == 0:
+                if media_response_status_code in allowed_media_response_codes:
                     logging.info(
-                        "Post node create script " + command + " executed successfully."
+                        "Media for %s created.",
+                        additional_page_media_file_path,
                     )
+                    print(f"+ Media for {additional_page_media_file_path} created.")
                 else:
+                    print(
+                        f"- ERROR: Media for {additional_page_media_file_path} not created. See log for more information."
+                    )
                     logging.error(
-                        "Post node create script "
-                        + command
-                        + " failed with exit code "
-                        + str(post_task_return_code)
-                        + "."
+                        "Media for %s not created. HTTP response code was %s.",
+                        additional_page_media_file_path,
+                        media_response_status_code,
                     )
+            else:
+                logging.warning(f"{additional_page_media_file_path} not found.")
+
+    else:
+        print(
+            f"Error: Node for page {page_identifier} not created. See log for more information."
+        )
+        logging.error(
+            'Node for page "%s" not created, HTTP response code was %s, response body was %s',
+            page_identifier,
+            node_response.status_code,
+            node_response.text,
+        )
+        logging.error(
+            'JSON request body used in previous POST to "%s" was %s.',
+            node_endpoint,
+            node_json,
+        )
+
+    # Execute node-specific post-create scripts, if any are configured.
+    if "node_post_create" in config and len(config["node_post_create"]) > 0:
+        execute_entity_post_task_scripts(
+            config,
+            "node_post_create",
+            config["config_file"],
+            node_response.status_code,
+            node_response.text,
+        )
+
+    return node_nid
 
 
 def get_rollback_csv_filepath(config: dict) -> str:
@@ -11179,16 +13112,16 @@ def resolve_media_use_term_id(
     return media_use_term_id
 
 
-def find_file_url_in_media(
+def find_file_in_media(
     config: dict, media_list: list, media_use_term_id: str, node_id: str
-) -> Union[None, str]:
-    """Find the file URL in media entries matching the use term.
+) -> Union[None, dict]:
+    """Find the file field value in media entries matching the use term.
     Parameters
     :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
     :param media_list: list - The list of media entries.
     :param media_use_term_id: str - The media use term ID to match.
     :param node_id: str - The node ID for logging purposes.
-    :return: str|None - The file URL, or None if not found.
+    :return: dict|None - The file field value (including its "url" and "target_uuid"), or None if not found.
     """
     for media in media_list:
         for file_field in file_fields:
@@ -11198,15 +13131,31 @@ def find_file_url_in_media(
                 if media_use_term_id in media_use_ids:
                     file_info = media[file_field]
                     if len(file_info) > 0:
-                        file_url = file_info[0].get("url")
-                        if file_url:
-                            return file_url
+                        if file_info[0].get("url"):
+                            return file_info[0]
     logging.warning(
         f"No valid media found for node {node_id} with use term {media_use_term_id}"
     )
     return None
 
 
+def find_file_url_in_media(
+    config: dict, media_list: list, media_use_term_id: str, node_id: str
+) -> Union[None, str]:
+    """Find the file URL in media entries matching the use term.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param media_list: list - The list of media entries.
+    :param media_use_term_id: str - The media use term ID to match.
+    :param node_id: str - The node ID for logging purposes.
+    :return: str|None - The file URL, or None if not found.
+    """
+    file_info = find_file_in_media(config, media_list, media_use_term_id, node_id)
+    if file_info is None:
+        return None
+    return file_info["url"]
+
+
 def get_media_file_url(
     config: dict,
     node_id: str,
@@ -11253,35 +13202,88 @@ def get_media_file_url(
     return file_url
 
 
-def download_file_from_drupal(
+def create_export_file_directory(config: dict):
+    """Create the directory named in config['export_file_directory'] if it doesn't exist.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    """
+    if not os.path.exists(config["export_file_directory"]):
+        try:
+            os.makedirs(config["export_file_directory"], exist_ok=True)
+        except Exception as e:
+            message = f'Path "export_file_directory" ("{config["export_file_directory"]}") is not writable: {str(e)}'
+            logging.error(message)
+            sys.exit("Error: " + message + " See log for more detail.")
+
+
+def get_remote_file_size(config: dict, file_url: str) -> Union[int, None]:
+    """Get the size of a file in Drupal from the Content-Length of a HEAD request.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param file_url: str - The file's URL.
+    :return: int|None - The file's size in bytes, or None if it can't be determined.
+    """
+    try:
+        response = requests.head(
+            file_url, allow_redirects=True, verify=config["secure_ssl_only"]
+        )
+    except requests.exceptions.RequestException as e:
+        logging.warning(f"Could not get size of {file_url}: {str(e)}")
+        return None
+    if response.status_code != 200 or "Content-Length" not in response.headers:
+        return None
+    return int(response.headers["Content-Length"])
+
+
+def local_file_matches_drupal_file(
+    config: dict, path: str, remote_size: Union[int, None], file_uuid: Union[str, None]
+) -> bool:
+    """Check whether a file already in export_file_directory is the same as the one in Drupal.
+    If config['export_file_skip_existing_algorithm'] is set, the files' hashes are compared,
+    otherwise their sizes are.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param path: str - The path to the local file.
+    :param remote_size: int|None - The size of the file in Drupal, from get_remote_file_size().
+    :param file_uuid: str|None - The UUID of the file in Drupal.
+    :return: bool - True if the local file matches the one in Drupal.
+    """
+    algorithm = config["export_file_skip_existing_algorithm"]
+    if algorithm is not None:
+        if file_uuid is None:
+            return False
+        remote_hash = get_file_hash_from_drupal(config, file_uuid, algorithm)
+        if not remote_hash:
+            return False
+        return get_file_hash_from_local(config, path, algorithm) == remote_hash
+
+    if remote_size is None:
+        return False
+    return os.path.getsize(path) == remote_size
+
+
+def prepare_file_download(
     config: dict,
     node_id: str,
     media_use_term_id: Optional[str] = None,
     media_list: Optional[list] = None,
-) -> Union[bool, str]:
-    """Download a media file from Drupal.
+) -> Union[bool, dict]:
+    """Find the media file to download for a node and choose the path in export_file_directory
+    to download it to. If config['export_file_skip_existing'] is True and a file already at
+    that path (or at one of its deduped variants) matches the file in Drupal, the download
+    is marked to be skipped, so that re-running an export doesn't download files again.
     Parameters
     :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
     :param node_id: str - The node ID to download the media file for.
     :param media_use_term_id: str|None - The media use term ID or URI
     :param media_list: list|None - An optional pre-fetched media list.
-    :return: str|bool - The path to the downloaded file, or False on failure
+    :return: dict|bool - A dict with the download's "node_id", "url", "path", and "skip"
+        values, for passing to transfer_file_from_drupal(), or False on failure.
     """
     if config.get("export_file_directory") is None:
         logging.error("export_file_directory is not configured")
         return False
-
-    if not os.path.exists(config["export_file_directory"]):
-        try:
-            os.mkdir(config["export_file_directory"])
-        except Exception as e:
-            message = f'Path "export_file_directory" ("{config["export_file_directory"]}") is not writable: {str(e)}'
-            logging.error(message)
-            sys.exit("Error: " + message + " See log for more detail.")
-    else:
-        logging.info(
-            f'Path "export_file_directory" ("{config["export_file_directory"]}") already exists.'
-        )
+    create_export_file_directory(config)
 
     media_list = get_media_list(config, node_id, media_list)
     if media_list is None:
@@ -11291,42 +13293,149 @@ def download_file_from_drupal(
     if resolved_term_id is None:
         return False
 
-    file_url = find_file_url_in_media(config, media_list, resolved_term_id, node_id)
-    if not file_url:
+    file_info = find_file_in_media(config, media_list, resolved_term_id, node_id)
+    if not file_info:
         return False
+    file_url = file_info["url"]
+
+    remote_size = None
+    if (
+        config["export_file_skip_existing"] is True
+        and config["export_file_skip_existing_algorithm"] is None
+    ):
+        remote_size = get_remote_file_size(config, file_url)
+
+    # Walk through the path and its deduped variants, reusing the first existing file that
+    # matches the one in Drupal, or taking the first path that is not in use.
+    downloaded_file_path = os.path.join(
+        config["export_file_directory"], os.path.basename(file_url)
+    )
+    with download_path_lock:
+        while True:
+            if downloaded_file_path in reserved_download_paths:
+                downloaded_file_path = get_deduped_file_path(downloaded_file_path)
+                continue
+            if not os.path.exists(downloaded_file_path):
+                skip = False
+                break
+            if config["export_file_skip_existing"] is True:
+                if local_file_matches_drupal_file(
+                    config,
+                    downloaded_file_path,
+                    remote_size,
+                    file_info.get("target_uuid"),
+                ):
+                    skip = True
+                    break
+            downloaded_file_path = get_deduped_file_path(downloaded_file_path)
+        reserved_download_paths.add(downloaded_file_path)
+
+    return {
+        "node_id": node_id,
+        "url": file_url,
+        "path": downloaded_file_path,
+        "skip": skip,
+    }
+
+
+def transfer_file_from_drupal(config: dict, download: dict) -> Union[bool, int]:
+    """Download a file prepared by prepare_file_download(). The file is streamed to a ".part"
+    file next to its final path and renamed once it is complete; if a ".part" file is left
+    over from an interrupted export, the download is resumed using an HTTP Range request.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param download: dict - The value returned by prepare_file_download().
+    :return: int|bool - The number of bytes transferred, or False on failure.
+    """
+    filename_for_logging = os.path.basename(download["path"])
+    if download["skip"] is True:
+        logging.info(
+            f'File "{filename_for_logging}" for node {download["node_id"]} is already in "export_file_directory", skipping download.'
+        )
+        return 0
 
-    url_filename = os.path.basename(file_url)
-    downloaded_file_path = os.path.join(config["export_file_directory"], url_filename)
-    if os.path.exists(downloaded_file_path):
-        downloaded_file_path = get_deduped_file_path(downloaded_file_path)
+    part_file_path = download["path"] + ".part"
+    headers = dict()
+    if os.path.exists(part_file_path):
+        headers["Range"] = f"bytes={os.path.getsize(part_file_path)}-"
 
     try:
-        with open(downloaded_file_path, "wb+") as f:
-            file_download_response = requests.get(
-                file_url,
-                allow_redirects=True,
-                verify=config["secure_ssl_only"],
-            )
-            if file_download_response.status_code == 200:
-                # TODO: Stream the download to avoid loading the entire file into memory.
-                f.write(file_download_response.content)
-                filename_for_logging = os.path.basename(downloaded_file_path)
+        with requests.get(
+            download["url"],
+            allow_redirects=True,
+            verify=config["secure_ssl_only"],
+            headers=headers,
+            stream=True,
+        ) as file_download_response:
+            if file_download_response.status_code == 206:
+                mode = "ab"
                 logging.info(
-                    f'File "{filename_for_logging}" downloaded for node {node_id}.'
-                )
-                return (
-                    downloaded_file_path
-                    if os.path.isabs(config["export_file_directory"])
-                    else filename_for_logging
+                    f'Resuming download of "{filename_for_logging}" for node {download["node_id"]} from byte {headers["Range"][6:-1]}.'
                 )
+            elif file_download_response.status_code == 200:
+                # Also the response if the server ignores the Range header.
+                mode = "wb"
+            elif file_download_response.status_code == 416:
+                # The .part file is not a prefix of the file in Drupal, so start over.
+                os.remove(part_file_path)
+                return transfer_file_from_drupal(config, download)
             else:
                 logging.error(
-                    f"File download failed for node {node_id}: {file_url} (HTTP {file_download_response.status_code})"
+                    f'File download failed for node {download["node_id"]}: {download["url"]} (HTTP {file_download_response.status_code})'
                 )
                 return False
+
+            num_bytes = 0
+            with open(part_file_path, mode) as f:
+                for chunk in file_download_response.iter_content(
+                    chunk_size=1024 * 1024
+                ):
+                    f.write(chunk)
+                    num_bytes += len(chunk)
+        os.replace(part_file_path, download["path"])
     except Exception as e:
-        logging.error(f"File download failed for node {node_id}: {str(e)}")
+        logging.error(f'File download failed for node {download["node_id"]}: {str(e)}')
+        return False
+
+    logging.info(
+        f'File "{filename_for_logging}" downloaded for node {download["node_id"]}.'
+    )
+    return num_bytes
+
+
+def get_exported_file_path_value(config: dict, path: str) -> str:
+    """Get the value to write to the "file" column of an export CSV for a downloaded file.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param path: str - The path to the downloaded file.
+    :return: str - The absolute path if export_file_directory is absolute, otherwise the filename.
+    """
+    if os.path.isabs(config["export_file_directory"]):
+        return path
+    return os.path.basename(path)
+
+
+def download_file_from_drupal(
+    config: dict,
+    node_id: str,
+    media_use_term_id: Optional[str] = None,
+    media_list: Optional[list] = None,
+) -> Union[bool, str]:
+    """Download a media file from Drupal.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param node_id: str - The node ID to download the media file for.
+    :param media_use_term_id: str|None - The media use term ID or URI
+    :param media_list: list|None - An optional pre-fetched media list.
+    :return: str|bool - The path to the downloaded file, or False on failure
+    """
+    download = prepare_file_download(config, node_id, media_use_term_id, media_list)
+    if download is False:
+        return False
+
+    if transfer_file_from_drupal(config, download) is False:
         return False
+    return get_exported_file_path_value(config, download["path"])
 
 
 def get_file_hash_from_drupal(
@@ -11975,10 +14084,7 @@ def calculate_response_time_trend(config: dict, response_time: int) -> Optional[
             The average response time of the most recent 20 requests.
     """
     http_response_times.append(response_time)
-    if len(http_response_times) > 20:
-        sample = http_response_times[-20:]
-    else:
-        sample = http_response_times
+    sample = list(http_response_times)
     if config["log_response_time_sample"] is True:
         logging.info("Response time trend sample: %s", sample)
     if len(sample) > 0:
@@ -12095,6 +14201,7 @@ def quick_delete_node(config: dict, args: Namespace):
                 )
                 node_response = issue_request(config, "DELETE", node_endpoint)
                 if node_response.status_code == 204:
+                    forget_deleted_entity(config, "node", node_id)
                     if config["progress_bar"] is False:
                         print("Node " + args.quick_delete_node + " deleted.")
                     logging.info("Node %s deleted.", args.quick_delete_node)
@@ -12756,6 +14863,7 @@ def prepare_csv_id_to_node_id_map(config: dict):
         )
 
 
+@metrics.timed("map_write")
 def populate_csv_id_to_node_id_map(
     config: dict,
     parent_csv_row_id: str,
@@ -12886,6 +14994,88 @@ def get_term_field_values(config: dict, term_id: str):
     return term_fields
 
 
+def get_preprocessor(
+    config: dict, path_to_script: str
+) -> Union[PersistentPreprocessor, PluginPreprocessor, None]:
+    """Gets the preprocessor that handles many values per process for a configured preprocessor,
+    starting it if necessary. Preprocessors registered as "python:/path/to/plugin.py" are
+    always plugins; scripts are run persistently if 'preprocessor_mode' is "persistent".
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param path_to_script: string - The preprocessor's path as configured in 'preprocessors'.
+    :return: PersistentPreprocessor|PluginPreprocessor|None - The preprocessor, or None if the
+        script should be run once per value.
+    """
+    if (
+        not path_to_script.startswith("python:")
+        and config["preprocessor_mode"] != "persistent"
+    ):
+        return None
+    with preprocessors_lock:
+        if path_to_script not in preprocessors:
+            if path_to_script.startswith("python:"):
+                preprocessors[path_to_script] = PluginPreprocessor(
+                    path_to_script[len("python:") :].strip(),
+                    config["subdelimiter"],
+                    config["config_file_path"],
+                    config["preprocessor_processes"],
+                )
+            else:
+                preprocessors[path_to_script] = PersistentPreprocessor(
+                    path_to_script.split(" "),
+                    config["subdelimiter"],
+                    config["config_file_path"],
+                    config["preprocessor_processes"],
+                )
+            logging.info(f'Started preprocessor "{path_to_script}".')
+        return preprocessors[path_to_script]
+
+
+def close_preprocessors() -> None:
+    """Stops the persistent and plugin preprocessors started during the task."""
+    with preprocessors_lock:
+        for preprocessor in preprocessors.values():
+            preprocessor.close()
+        preprocessors.clear()
+
+
+def preprocess_csv_rows(config: dict, csv_data: DictReader):
+    """Generator that yields the rows in csv_data, first preprocessing the values of fields that
+    have persistent or plugin preprocessors in batches of 'preprocessor_batch_size' rows.
+    preprocess_csv() then uses the batch's results instead of preprocessing values one at a time.
+    Parameters
+    :param config: dict - The configuration settings defined by WorkbenchConfig.get_config().
+    :param csv_data: DictReader - The CSV data, as returned by get_csv_data().
+    :return: Generator - The CSV rows.
+    """
+    batched_preprocessors = []
+    if "preprocessors" in config and len(config["preprocessors"]) > 0:
+        for preprocessor_script in config["preprocessors"]:
+            for field, path_to_script in preprocessor_script.items():
+                if get_preprocessor(config, path_to_script) is not None:
+                    batched_preprocessors.append((field, path_to_script))
+
+    if len(batched_preprocessors) == 0 or config["preprocessor_batch_size"] < 2:
+        yield from csv_data
+        return
+
+    while True:
+        batch = list(itertools.islice(csv_data, config["preprocessor_batch_size"]))
+        if len(batch) == 0:
+            break
+        preprocessed_values.clear()
+        for field, path_to_script in batched_preprocessors:
+            values = [row[field] for row in batch if field in row]
+            results = get_preprocessor(config, path_to_script).preprocess(values)
+            for value, result in zip(values, results):
+                if result is not None:
+                    preprocessed_values.setdefault(
+                        (path_to_script, value), collections.deque()
+                    ).append(result)
+        yield from batch
+    preprocessed_values.clear()
+
+
 def preprocess_csv(
     config: dict, row: OrderedDict, field: str, path_to_script: str
 ) -> str:
@@ -12902,6 +15092,20 @@ def preprocess_csv(
     :param path_to_script: string - The absolute path to the preprocessor script.
     :return: string - The preprocessed field data or the original field data if the preprocessor failed.
     """
+    if (path_to_script, row[field]) in preprocessed_values:
+        results = preprocessed_values[(path_to_script, row[field])]
+        output = results.popleft()
+        if len(results) == 0:
+            del preprocessed_values[(path_to_script, row[field])]
+        return output.strip()
+
+    preprocessor = get_preprocessor(config, path_to_script)
+    if preprocessor is not None:
+        output = preprocessor.preprocess([row[field]])[0]
+        if output is None:
+            return row[field]
+        return output.strip()
+
     output, return_code = preprocess_field_data(config, row[field], path_to_script)
     if return_code == 0:
         preprocessor_input = copy.deepcopy(row[field])